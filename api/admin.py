@@ -1,13 +1,251 @@
+import json
+import re
+import uuid
+
+from django.conf import settings
 from django.contrib import admin
+from django.contrib.admin.views.main import (
+    ALL_VAR,
+    IS_FACETS_VAR,
+    IS_POPUP_VAR,
+    ORDER_VAR,
+    PAGE_VAR,
+    SEARCH_VAR,
+    TO_FIELD_VAR,
+)
+from django.core.paginator import Paginator
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from django.utils.translation import gettext_lazy as _
+
+from api.models import VPS, SlowRequest, VPSStats
+
+UID_PREFIX_RE = re.compile(r"[0-9a-f]{1,32}")
+
+
+class VPSAdminPaginator(Paginator):
+    """
+    Пагинатор списка VPS в админке, не выполняющий полный COUNT(*).
+    Известное заранее количество (из сводки VPSStats) используется как есть,
+    иначе считается не больше ``VPS_ADMIN_SETTINGS["COUNT_LIMIT"]`` строк:
+    дальше этого предела список не листается, и его нужно сузить фильтром
+    или поиском.
+    """
+
+    def __init__(self, *args, known_count=None, **kwargs):
+        """
+        :param known_count: Точное количество объектов, если оно известно
+        """
+        super().__init__(*args, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        limit = settings.VPS_ADMIN_SETTINGS["COUNT_LIMIT"]
+        return self.object_list.order_by()[:limit].count()
+
+
+class ResourceRangeFilter(admin.SimpleListFilter):
+    """
+    Фильтр по диапазонам значения ресурса сервера. Условие ``BETWEEN``
+    по полю обслуживается составным индексом (поле, uid), а список
+    сортируется в порядке этого индекса (VPSAdmin.get_ordering), поэтому
+    страница читается без полного сканирования и сортировки таблицы.
+    Подклассы задают ``parameter_name`` (имя поля) и ``ranges`` -
+    границы диапазонов включительно; None - без верхней границы.
+    """
+
+    ranges = ()
+    unit = ""
+
+    def lookups(self, request, model_admin):
+        return [
+            (
+                f"{low}-{high or ''}",
+                f"{low}-{high} {self.unit}" if high else f"{low}+ {self.unit}",
+            )
+            for low, high in self.ranges
+        ]
+
+    def queryset(self, request, queryset):
+        value = self.value()
+        if not value:
+            return queryset
+        low, _sep, high = value.partition("-")
+        try:
+            if high:
+                return queryset.filter(
+                    **{f"{self.parameter_name}__range": (int(low), int(high))}
+                )
+            return queryset.filter(**{f"{self.parameter_name}__gte": int(low)})
+        except ValueError:
+            return queryset.none()
+
+
+class CPUFilter(ResourceRangeFilter):
+    title = _("CPU")
+    parameter_name = "cpu"
+    ranges = ((2, 4), (5, 16), (17, 32), (33, None))
+
+
+class RAMFilter(ResourceRangeFilter):
+    title = _("RAM")
+    parameter_name = "ram"
+    ranges = ((2, 8), (10, 32), (34, None))
+    unit = _("GB")
 
-from api.models import VPS
+
+class HDDFilter(ResourceRangeFilter):
+    title = _("HDD")
+    parameter_name = "hdd"
+    ranges = ((5, 100), (101, 500), (501, 1000), (1001, None))
+    unit = _("GB")
 
 
 @admin.register(VPS)
 class VPSAdmin(admin.ModelAdmin):
+    """
+    Список серверов рассчитан на таблицы в миллионы строк: количество
+    берётся из сводки VPSStats или ограничивается (VPSAdminPaginator),
+    поиск по UID выполняется по индексу первичного ключа, фильтры -
+    по составным индексам (статус, ресурс).
+    """
+
     list_display = ["uid", "ram", "hdd", "cpu", "status"]
     search_fields = ["uid"]
+    search_help_text = _("Full UID or its beginning, with or without dashes.")
     list_display_links = ["uid"]
+    list_filter = ["status", CPUFilter, RAMFilter, HDDFilter]
+    paginator = VPSAdminPaginator
+    show_full_result_count = False
+    show_facets = admin.ShowFacets.NEVER
+
+    changelist_params = {
+        ALL_VAR,
+        IS_FACETS_VAR,
+        IS_POPUP_VAR,
+        ORDER_VAR,
+        PAGE_VAR,
+        TO_FIELD_VAR,
+    }
+
+    def get_ordering(self, request):
+        """
+        Если выбран диапазон ресурса, а статус и сортировка не заданы,
+        сортирует список по этому ресурсу и UID - в порядке индекса
+        (ресурс, uid). С фильтром по статусу порядок UID и так даёт
+        индекс (статус, uid).
+        """
+        if not {ORDER_VAR, "status__exact"} & request.GET.keys():
+            for list_filter in (CPUFilter, RAMFilter, HDDFilter):
+                if request.GET.get(list_filter.parameter_name):
+                    return (list_filter.parameter_name, "uid")
+        return super().get_ordering(request)
+
+    def get_paginator(self, request, queryset, per_page, **kwargs):
+        """
+        Передаёт пагинатору точное количество серверов из сводки VPSStats,
+        если список не отфильтрован или отфильтрован только по статусу.
+        """
+        filters = {
+            name: value
+            for name, value in request.GET.items()
+            if name not in self.changelist_params
+            and (name != SEARCH_VAR or value.strip())
+        }
+        if not filters.keys() - {"status__exact"}:
+            summary = VPSStats.objects.get_summary()
+            status = filters.get("status__exact")
+            if status is None:
+                kwargs["known_count"] = summary["total"]["servers"]
+            elif status in summary["statuses"]:
+                kwargs["known_count"] = summary["statuses"][status]["servers"]
+        return self.paginator(queryset, per_page, **kwargs)
+
+    def get_search_results(self, request, queryset, search_term):
+        """
+        Ищет сервер по полному UID или по его началу. Начало UID
+        преобразуется в диапазон значений первичного ключа, поэтому поиск
+        выполняется по индексу, а не сканированием с ``icontains``.
+        """
+        term = search_term.strip().lower().replace("-", "")
+        if not term:
+            return queryset, False
+        if not UID_PREFIX_RE.fullmatch(term):
+            return queryset.none(), False
+        if len(term) == 32:
+            return queryset.filter(uid=uuid.UUID(term)), False
+        return (
+            queryset.filter(
+                uid__range=(
+                    uuid.UUID(term.ljust(32, "0")),
+                    uuid.UUID(term.ljust(32, "f")),
+                )
+            ),
+            False,
+        )
+
+
+@admin.register(SlowRequest)
+class SlowRequestAdmin(admin.ModelAdmin):
+    """
+    Журнал медленных запросов диагностического режима (только просмотр).
+    """
+
+    list_display = [
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "db_time_ms",
+    ]
+    list_filter = ["method", "status_code"]
+    search_fields = ["path", "slowest_sql"]
+    fields = [
+        "created_at",
+        "method",
+        "path",
+        "status_code",
+        "duration_ms",
+        "query_count",
+        "db_time_ms",
+        "slowest_sql_display",
+        "query_plan_display",
+        "queries_display",
+    ]
+    readonly_fields = fields
+
+    @admin.display(description=_("Duration (ms)"), ordering="duration")
+    def duration_ms(self, obj):
+        return f"{obj.duration * 1000:.1f}"
+
+    @admin.display(description=_("SQL time (ms)"), ordering="db_time")
+    def db_time_ms(self, obj):
+        return f"{obj.db_time * 1000:.1f}"
+
+    @admin.display(description=_("Slowest SQL"))
+    def slowest_sql_display(self, obj):
+        return format_html("<pre>{}</pre>", obj.slowest_sql)
+
+    @admin.display(description=_("Query plan"))
+    def query_plan_display(self, obj):
+        return format_html("<pre>{}</pre>", obj.query_plan)
+
+    @admin.display(description=_("SQL"))
+    def queries_display(self, obj):
+        return format_html(
+            "<pre>{}</pre>", json.dumps(obj.queries, indent=2, ensure_ascii=False)
+        )
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
 
 
 admin.site.site_header = "VPS Administration"
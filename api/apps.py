@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.backends.signals import connection_created
 
 
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "api"
+
+    def ready(self):
+        """
+        Подключает учёт SQL-запросов в метриках и запись SQL-запросов
+        диагностического режима к новым соединениям с БД.
+        """
+        from api.diagnostics import install_query_capture
+        from api.metrics import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
+        connection_created.connect(install_query_capture)
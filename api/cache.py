@@ -0,0 +1,244 @@
+import hashlib
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+
+from api.routers import reads_from_primary
+
+
+class VPSResponseCache:
+    """
+    Кэш ответов API VPS с инвалидацией по поколению.
+
+    Ключ ответа включает текущее поколение данных VPS. Любая запись в таблицу
+    VPS заменяет поколение новым случайным значением, после чего все ранее
+    сохранённые ответы становятся недостижимы и вытесняются самим бэкендом
+    кэша (размер ограничен настройками CACHES). Поколение меняется сразу при
+    записи и ещё раз после фиксации транзакции, поэтому ответ, прочитанный
+    до фиксации, не может попасть в кэш под новым поколением.
+
+    Поколение начинается со времени своего создания, поэтому по нему же
+    строятся валидаторы условного GET списка (см. get_validators): ETag
+    и Last-Modified меняются с каждой записью без обращения к БД.
+
+    Ответы, прочитанные из основной БД и из реплик, хранятся под разными
+    ключами: клиент, чтение которого закреплено за основной БД после
+    записи, не получает ответ, заполненный из отстающей реплики.
+
+    Для нескольких процессов-воркеров в CACHES должен быть указан общий
+    бэкенд (Redis, Memcached), иначе воркеры не увидят смену поколения
+    друг у друга.
+    """
+
+    generation_key = "vps:generation"
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @property
+    def cache(self):
+        """
+        Бэкенд кэша, указанный в ``VPS_CACHE_SETTINGS["ALIAS"]``.
+        """
+        return caches[settings.VPS_CACHE_SETTINGS["ALIAS"]]
+
+    @property
+    def is_local(self):
+        """
+        Хранится ли кэш в памяти процесса. Такой бэкенд не выполняет
+        ввода-вывода, поэтому асинхронные методы вызывают его синхронные
+        методы напрямую, без перехода в поток через sync_to_async.
+        """
+        return isinstance(self.cache, (LocMemCache, DummyCache))
+
+    def get_generation(self):
+        """
+        Возвращает текущее поколение данных VPS, создавая его при отсутствии.
+
+        :return: Строка поколения
+        """
+        generation = self.cache.get(self.generation_key)
+        if generation is None:
+            generation = self.bump_generation()
+        return generation
+
+    def bump_generation(self):
+        """
+        Заменяет поколение данных VPS новым значением.
+
+        :return: Новое поколение
+        """
+        generation = self.new_generation()
+        self.cache.set(self.generation_key, generation, None)
+        return generation
+
+    async def aget_generation(self):
+        """
+        Асинхронный вариант get_generation.
+
+        :return: Строка поколения
+        """
+        if self.is_local:
+            return self.get_generation()
+        generation = await self.cache.aget(self.generation_key)
+        if generation is None:
+            generation = self.new_generation()
+            await self.cache.aset(self.generation_key, generation, None)
+        return generation
+
+    @staticmethod
+    def new_generation():
+        """
+        Создаёт значение поколения: время создания в микросекундах
+        и случайная часть.
+
+        :return: Строка поколения
+        """
+        return f"{time.time_ns() // 1000}.{uuid.uuid4().hex}"
+
+    def invalidate(self, using=None):
+        """
+        Инвалидирует все закэшированные ответы после записи в таблицу VPS.
+
+        :param using: Алиас БД, в транзакции которой выполнена запись
+        """
+        self.bump_generation()
+        transaction.on_commit(self.bump_generation, using=using, robust=True)
+
+    def make_key(self, request, view_name):
+        """
+        Строит ключ ответа по имени представления, схеме, хосту, пути
+        и нормализованной строке запроса (параметры отсортированы по имени).
+        Схема и хост входят в ключ, так как ответы списка содержат абсолютные
+        ссылки на соседние страницы. Ответы из основной БД и из реплик
+        разделены (см. reads_from_primary).
+
+        :param request: Запрос
+        :param view_name: Имя представления (действия)
+        :return: Ключ кэша
+        """
+        return self.format_key(self.get_generation(), request, view_name)
+
+    async def amake_key(self, request, view_name):
+        """
+        Асинхронный вариант make_key.
+
+        :param request: Запрос
+        :param view_name: Имя представления (действия)
+        :return: Ключ кэша
+        """
+        return self.format_key(await self.aget_generation(), request, view_name)
+
+    def format_key(self, generation, request, view_name):
+        """
+        Строит ключ ответа для указанного поколения данных.
+
+        :param generation: Поколение данных VPS
+        :param request: Запрос
+        :param view_name: Имя представления (действия)
+        :return: Ключ кэша
+        """
+        query = "&".join(
+            f"{name}={value}"
+            for name, values in sorted(request.query_params.lists())
+            for value in values
+        )
+        url = f"{request.scheme}://{request.get_host()}{request.path}?{query}"
+        digest = hashlib.sha1(url.encode()).hexdigest()
+        source = "primary" if reads_from_primary() else "replica"
+        return f"vps:response:{generation}:{source}:{view_name}:{digest}"
+
+    def get_validators(self, key):
+        """
+        Возвращает валидаторы условного GET ответа без обращения к БД.
+        ETag - хеш ключа ответа, то есть поколения данных и параметров
+        запроса; Last-Modified - время создания поколения, не раньше
+        последней записи в таблицу VPS. Без общего бэкенда кэша (или с
+        DummyCache) поколения у процессов различаются, и условный GET
+        просто реже получает 304.
+
+        :param key: Ключ ответа, построенный make_key
+        :return: Кортеж (ETag, время последнего изменения)
+        """
+        generation = key.split(":")[2]
+        created = int(generation.partition(".")[0])
+        return (
+            f'"{hashlib.sha1(key.encode()).hexdigest()}"',
+            datetime.fromtimestamp(created / 1_000_000, tz=timezone.utc),
+        )
+
+    def get(self, key):
+        """
+        Возвращает закэшированные данные ответа и учитывает попадание/промах.
+
+        :param key: Ключ кэша
+        :return: Данные ответа или None
+        """
+        return self.count_lookup(self.cache.get(key))
+
+    async def aget(self, key):
+        """
+        Асинхронный вариант get.
+
+        :param key: Ключ кэша
+        :return: Данные ответа или None
+        """
+        if self.is_local:
+            return self.get(key)
+        return self.count_lookup(await self.cache.aget(key))
+
+    def count_lookup(self, value):
+        """
+        Учитывает результат чтения из кэша в счётчиках попаданий и промахов.
+
+        :param value: Прочитанные данные или None
+        :return: Те же данные
+        """
+        with self.lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        """
+        Сохраняет данные ответа на ``VPS_CACHE_SETTINGS["TIMEOUT"]`` секунд.
+
+        :param key: Ключ кэша
+        :param value: Данные ответа
+        """
+        self.cache.set(key, value, settings.VPS_CACHE_SETTINGS["TIMEOUT"])
+
+    async def aset(self, key, value):
+        """
+        Асинхронный вариант set.
+
+        :param key: Ключ кэша
+        :param value: Данные ответа
+        """
+        if self.is_local:
+            self.set(key, value)
+        else:
+            await self.cache.aset(key, value, settings.VPS_CACHE_SETTINGS["TIMEOUT"])
+
+    def get_stats(self):
+        """
+        Возвращает счётчики попаданий и промахов текущего процесса.
+
+        :return: Словарь со счётчиками
+        """
+        with self.lock:
+            return {"hits": self.hits, "misses": self.misses}
+
+
+response_cache = VPSResponseCache()
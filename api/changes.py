@@ -0,0 +1,155 @@
+import asyncio
+import threading
+import time
+
+from django.conf import settings
+
+
+class ChangeNotifier:
+    """
+    Оповещение ожидающих клиентов ленты изменений VPS о новых записях
+    журнала VPSChange.
+
+    Записи, зафиксированные в текущем процессе, будят ожидающих сразу после
+    фиксации транзакции. Записи других процессов-воркеров обнаруживаются
+    опросом БД не реже раза в ``VPS_CHANGES_SETTINGS["POLL_INTERVAL"]``
+    секунд, поэтому лента работает и без общего брокера сообщений.
+    """
+
+    def __init__(self):
+        self.last_seq = 0
+        self.condition = threading.Condition()
+        self.async_waiters = set()
+
+    def notify(self, seq):
+        """
+        Сообщает о зафиксированной записи журнала изменений.
+
+        :param seq: Номер записи
+        """
+        with self.condition:
+            self.last_seq = max(self.last_seq, seq)
+            self.condition.notify_all()
+            waiters = list(self.async_waiters)
+        for loop, event in waiters:
+            loop.call_soon_threadsafe(event.set)
+
+    def wait_notification(self, seq, timeout):
+        """
+        Ждёт оповещения о записи с номером больше ``seq``.
+
+        :param seq: Номер последней известной записи
+        :param timeout: Наибольшее время ожидания, секунды
+        :return: Номер последней записи, о которой известно процессу
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.last_seq > seq, timeout)
+            return self.last_seq
+
+    async def await_notification(self, seq, timeout):
+        """
+        Асинхронный вариант wait_notification: ожидает в цикле событий,
+        не занимая поток.
+
+        :param seq: Номер последней известной записи
+        :param timeout: Наибольшее время ожидания, секунды
+        :return: Номер последней записи, о которой известно процессу
+        """
+        waiter = (asyncio.get_running_loop(), asyncio.Event())
+        with self.condition:
+            if self.last_seq > seq:
+                return self.last_seq
+            self.async_waiters.add(waiter)
+        try:
+            await asyncio.wait_for(waiter[1].wait(), timeout)
+        except TimeoutError:
+            pass
+        finally:
+            with self.condition:
+                self.async_waiters.discard(waiter)
+        return self.last_seq
+
+    def poll(self, fetch, since, timeout):
+        """
+        Возвращает записи журнала после ``since``, ожидая их появления
+        не дольше ``timeout`` секунд (long-poll).
+
+        :param fetch: Функция, читающая записи после переданного номера
+        :param since: Номер последней полученной клиентом записи
+        :param timeout: Наибольшее время ожидания, секунды
+        :return: Список записей (пустой, если время ожидания истекло)
+        """
+        deadline = time.monotonic() + timeout
+        notified = since
+        while True:
+            changes = fetch(since)
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                return changes
+            notified = self.wait_notification(
+                notified,
+                min(remaining, settings.VPS_CHANGES_SETTINGS["POLL_INTERVAL"]),
+            )
+
+    async def apoll(self, fetch, since, timeout):
+        """
+        Асинхронный вариант poll.
+
+        :param fetch: Корутина, читающая записи после переданного номера
+        :param since: Номер последней полученной клиентом записи
+        :param timeout: Наибольшее время ожидания, секунды
+        :return: Список записей (пустой, если время ожидания истекло)
+        """
+        deadline = time.monotonic() + timeout
+        notified = since
+        while True:
+            changes = await fetch(since)
+            remaining = deadline - time.monotonic()
+            if changes or remaining <= 0:
+                return changes
+            notified = await self.await_notification(
+                notified,
+                min(remaining, settings.VPS_CHANGES_SETTINGS["POLL_INTERVAL"]),
+            )
+
+    def stream(self, fetch, since):
+        """
+        Порции записей журнала для потока Server-Sent Events.
+        Пустая порция означает, что за ``HEARTBEAT`` секунд изменений
+        не было. Поток завершается через ``STREAM_TIMEOUT`` секунд, после
+        чего клиент переподключается с заголовком Last-Event-ID.
+
+        :param fetch: Функция, читающая записи после переданного номера
+        :param since: Номер последней полученной клиентом записи
+        :return: Генератор списков записей
+        """
+        changes_settings = settings.VPS_CHANGES_SETTINGS
+        deadline = time.monotonic() + changes_settings["STREAM_TIMEOUT"]
+        while (remaining := deadline - time.monotonic()) > 0:
+            changes = self.poll(
+                fetch, since, min(remaining, changes_settings["HEARTBEAT"])
+            )
+            if changes:
+                since = changes[-1]["seq"]
+            yield changes
+
+    async def astream(self, fetch, since):
+        """
+        Асинхронный вариант stream.
+
+        :param fetch: Корутина, читающая записи после переданного номера
+        :param since: Номер последней полученной клиентом записи
+        :return: Асинхронный генератор списков записей
+        """
+        changes_settings = settings.VPS_CHANGES_SETTINGS
+        deadline = time.monotonic() + changes_settings["STREAM_TIMEOUT"]
+        while (remaining := deadline - time.monotonic()) > 0:
+            changes = await self.apoll(
+                fetch, since, min(remaining, changes_settings["HEARTBEAT"])
+            )
+            if changes:
+                since = changes[-1]["seq"]
+            yield changes
+
+
+change_notifier = ChangeNotifier()
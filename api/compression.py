@@ -0,0 +1,170 @@
+import gzip
+import zlib
+
+from django.conf import settings
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli необязателен
+    brotli = None
+
+
+class GzipCodec:
+    """
+    Сжатие ответов gzip (``Content-Encoding: gzip``).
+    """
+
+    encoding = "gzip"
+
+    def compress(self, data):
+        """
+        Сжимает тело ответа целиком.
+
+        :param data: Байтовая строка
+        :return: Сжатая байтовая строка
+        """
+        return gzip.compress(
+            data, compresslevel=settings.VPS_COMPRESSION_SETTINGS["GZIP_LEVEL"], mtime=0
+        )
+
+    def compressor(self):
+        """
+        Возвращает потоковый компрессор: функции сжатия порции данных
+        (со сбросом буфера, чтобы клиент получал порцию сразу)
+        и завершения потока.
+        """
+        compressor = zlib.compressobj(
+            settings.VPS_COMPRESSION_SETTINGS["GZIP_LEVEL"],
+            zlib.DEFLATED,
+            16 + zlib.MAX_WBITS,  # Заголовок и контрольная сумма gzip
+        )
+        return (
+            lambda chunk: compressor.compress(chunk)
+            + compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class BrotliCodec:
+    """
+    Сжатие ответов brotli (``Content-Encoding: br``); доступно, если
+    установлен пакет brotli.
+    """
+
+    encoding = "br"
+
+    def compress(self, data):
+        """
+        Сжимает тело ответа целиком.
+
+        :param data: Байтовая строка
+        :return: Сжатая байтовая строка
+        """
+        return brotli.compress(
+            data, quality=settings.VPS_COMPRESSION_SETTINGS["BROTLI_QUALITY"]
+        )
+
+    def compressor(self):
+        """
+        Возвращает потоковый компрессор: функции сжатия порции данных
+        (со сбросом буфера) и завершения потока.
+        """
+        compressor = brotli.Compressor(
+            quality=settings.VPS_COMPRESSION_SETTINGS["BROTLI_QUALITY"]
+        )
+        return (
+            lambda chunk: compressor.process(chunk) + compressor.flush(),
+            compressor.finish,
+        )
+
+
+CODECS = {"gzip": GzipCodec(), "br": BrotliCodec()}
+
+
+def get_available_encodings():
+    """
+    Возвращает поддерживаемые кодировки в порядке предпочтения
+    ``VPS_COMPRESSION_SETTINGS["ENCODINGS"]``, без brotli, если пакет
+    не установлен.
+    """
+    return [
+        encoding
+        for encoding in settings.VPS_COMPRESSION_SETTINGS["ENCODINGS"]
+        if encoding != "br" or brotli is not None
+    ]
+
+
+def parse_accept_encoding(header):
+    """
+    Разбирает заголовок Accept-Encoding.
+
+    :param header: Значение заголовка
+    :return: Словарь {кодировка: q}
+    """
+    weights = {}
+    for item in header.split(","):
+        encoding, _, params = item.partition(";")
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        weights[encoding] = q
+    return weights
+
+
+def select_codec(header):
+    """
+    Выбирает кодировку ответа по заголовку Accept-Encoding: с наибольшим
+    весом q, при равных весах - по порядку предпочтения сервера.
+
+    :param header: Значение заголовка Accept-Encoding
+    :return: Кодек или None, если клиент не принимает ни одну из кодировок
+    """
+    weights = parse_accept_encoding(header)
+    candidates = [
+        (weights.get(encoding, weights.get("*", 0.0)), -index, encoding)
+        for index, encoding in enumerate(get_available_encodings())
+    ]
+    candidates = [candidate for candidate in candidates if candidate[0] > 0]
+    if not candidates:
+        return None
+    return CODECS[max(candidates)[2]]
+
+
+def compress_stream(codec, chunks):
+    """
+    Сжимает поток порций тела ответа.
+
+    :param codec: Кодек
+    :param chunks: Итератор байтовых строк
+    :return: Генератор сжатых байтовых строк
+    """
+    compress, finish = codec.compressor()
+    for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
+
+
+async def acompress_stream(codec, chunks):
+    """
+    Асинхронный вариант compress_stream.
+
+    :param codec: Кодек
+    :param chunks: Асинхронный итератор байтовых строк
+    :return: Асинхронный генератор сжатых байтовых строк
+    """
+    compress, finish = codec.compressor()
+    async for chunk in chunks:
+        data = compress(chunk)
+        if data:
+            yield data
+    yield finish()
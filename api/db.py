@@ -0,0 +1,66 @@
+import functools
+import random
+import time
+
+from django.conf import settings
+from django.db import OperationalError, connections
+
+
+def is_locked_error(exc):
+    """
+    Проверяет, вызвана ли ошибка блокировкой БД другим пишущим соединением
+    (SQLITE_BUSY / SQLITE_LOCKED).
+
+    :param exc: Исключение OperationalError
+    :return: True, если запись можно повторить
+    """
+    message = str(exc).lower()
+    return "database is locked" in message or "database table is locked" in message
+
+
+def in_transaction():
+    """
+    Проверяет, выполняется ли код внутри atomic-блока какого-либо соединения.
+
+    :return: True, если открыта внешняя транзакция
+    """
+    return any(
+        connection.in_atomic_block
+        for connection in connections.all(initialized_only=True)
+    )
+
+
+def retry_on_locked(func):
+    """
+    Повторяет запись, если она не удалась из-за блокировки БД.
+    Перед каждой повторной попыткой выжидает паузу, которая удваивается
+    после каждой попытки (со случайным разбросом, чтобы конкурирующие
+    писатели не повторяли запись одновременно). Параметры задаются
+    в ``VPS_DB_RETRY_SETTINGS``.
+
+    Внутри внешней транзакции запись не повторяется: откат затрагивает
+    всю транзакцию, поэтому повторять её должен код, который её открыл.
+
+    :param func: Функция, выполняющая запись в собственной транзакции
+    :return: Обёрнутая функция
+    """
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        retry_settings = settings.VPS_DB_RETRY_SETTINGS
+        for attempt in range(retry_settings["ATTEMPTS"]):
+            try:
+                return func(*args, **kwargs)
+            except OperationalError as exc:
+                if (
+                    attempt + 1 == retry_settings["ATTEMPTS"]
+                    or not is_locked_error(exc)
+                    or in_transaction()
+                ):
+                    raise
+            backoff = min(
+                retry_settings["BACKOFF"] * 2**attempt, retry_settings["MAX_BACKOFF"]
+            )
+            time.sleep(random.uniform(backoff / 2, backoff))
+
+    return wrapper
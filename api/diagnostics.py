@@ -0,0 +1,167 @@
+import logging
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+
+from api.models import SlowRequest
+
+logger = logging.getLogger(__name__)
+
+# Операторы, план которых можно получить через EXPLAIN
+EXPLAINABLE_STATEMENTS = ("SELECT", "WITH", "INSERT", "UPDATE", "DELETE")
+
+
+class CapturedQueries:
+    """
+    SQL-запросы одного запроса к API, записанные в диагностическом режиме.
+    Хранятся первые ``VPS_SLOW_REQUEST_SETTINGS["MAX_QUERIES"]`` запросов
+    и самый медленный запрос, а число и суммарное время - по всем.
+    """
+
+    __slots__ = ("statements", "slowest", "count", "time", "limit")
+
+    def __init__(self, limit):
+        self.statements = []
+        self.slowest = None
+        self.count = 0
+        self.time = 0.0
+        self.limit = limit
+
+    def add(self, database, sql, params, many, duration):
+        """
+        Добавляет выполненный SQL-запрос.
+
+        :param database: Псевдоним БД
+        :param sql: Текст запроса
+        :param params: Параметры запроса
+        :param many: Выполнен ли запрос через executemany
+        :param duration: Время выполнения, секунды
+        """
+        statement = {
+            "database": database,
+            "sql": sql,
+            "params": None if many or params is None else [str(p) for p in params],
+            "duration": round(duration, 6),
+        }
+        self.count += 1
+        self.time += duration
+        if len(self.statements) < self.limit:
+            self.statements.append(statement)
+        if self.slowest is None or duration > self.slowest[0]["duration"]:
+            self.slowest = (statement, params if not many else None)
+
+
+# SQL-запросы, записываемые в текущем контексте, или None
+captured_queries = ContextVar("captured_queries", default=None)
+
+
+def capture_query(execute, sql, params, many, context):
+    """
+    Обёртка выполнения SQL (``connection.execute_wrappers``): записывает
+    запросы с временем выполнения, пока в контексте включена запись.
+    """
+    captured = captured_queries.get()
+    if captured is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        captured.add(
+            context["connection"].alias,
+            sql,
+            params,
+            many,
+            time.perf_counter() - start,
+        )
+
+
+def install_query_capture(sender, connection, **kwargs):
+    """
+    Обработчик сигнала connection_created: добавляет capture_query
+    в обёртки выполнения SQL нового соединения.
+    """
+    if capture_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(capture_query)
+
+
+def explain(database, sql, params):
+    """
+    Возвращает план выполнения SQL-запроса (EXPLAIN QUERY PLAN в SQLite).
+
+    :param database: Псевдоним БД, в которой выполнялся запрос
+    :param sql: Текст запроса
+    :param params: Параметры запроса
+    :return: План, по строке на шаг, или пустая строка
+    """
+    if not sql.lstrip().upper().startswith(EXPLAINABLE_STATEMENTS):
+        return ""
+    connection = connections[database]
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(f"{connection.ops.explain_query_prefix()} {sql}", params)
+            return "\n".join(str(row[-1]) for row in cursor.fetchall())
+    except DatabaseError as exc:
+        return f"EXPLAIN failed: {exc}"
+
+
+def record_slow_request(request, response, captured, duration):
+    """
+    Сохраняет образец медленного запроса с планом самого медленного
+    SQL-запроса и пишет его в журнал ``api.diagnostics``.
+
+    :param request: Запрос
+    :param response: Ответ
+    :param captured: CapturedQueries запроса
+    :param duration: Время обработки запроса, секунды
+    """
+    slowest_sql = query_plan = ""
+    if captured.slowest is not None:
+        statement, params = captured.slowest
+        slowest_sql = statement["sql"]
+        query_plan = explain(statement["database"], slowest_sql, params)
+    SlowRequest.objects.using(DEFAULT_DB_ALIAS).record(
+        method=request.method,
+        path=request.get_full_path(),
+        status_code=response.status_code,
+        duration=duration,
+        query_count=captured.count,
+        db_time=captured.time,
+        queries=captured.statements,
+        slowest_sql=slowest_sql,
+        query_plan=query_plan,
+    )
+    logger.warning(
+        "Slow request %s %s: %.0f ms, %d queries (%.0f ms)\n%s\n%s",
+        request.method,
+        request.get_full_path(),
+        duration * 1000,
+        captured.count,
+        captured.time * 1000,
+        slowest_sql,
+        query_plan,
+    )
+
+
+def start_capture():
+    """
+    Включает запись SQL-запросов в текущем контексте, если включён
+    диагностический режим (``VPS_SLOW_REQUEST_SETTINGS["ENABLED"]``).
+
+    :return: Кортеж (CapturedQueries, токен ContextVar) или (None, None)
+    """
+    slow_settings = settings.VPS_SLOW_REQUEST_SETTINGS
+    if not slow_settings["ENABLED"]:
+        return None, None
+    captured = CapturedQueries(slow_settings["MAX_QUERIES"])
+    return captured, captured_queries.set(captured)
+
+
+def is_slow(duration):
+    """
+    Проверяет, превышает ли время обработки запроса порог
+    ``VPS_SLOW_REQUEST_SETTINGS["THRESHOLD"]``.
+    """
+    return duration >= settings.VPS_SLOW_REQUEST_SETTINGS["THRESHOLD"]
@@ -0,0 +1,299 @@
+import csv
+import json
+import uuid
+from itertools import islice
+
+from django.conf import settings
+from django.utils.translation import gettext_lazy as _
+
+from api.models import VPS, VPSImport
+
+RESOURCE_FIELDS = ("cpu", "ram", "hdd")
+
+
+def read_csv(stream):
+    """
+    Читает записи CSV с заголовком из имён полей.
+
+    :param stream: Текстовый поток
+    :return: Генератор словарей
+    """
+    yield from csv.DictReader(stream)
+
+
+def read_ndjson(stream):
+    """
+    Читает записи NDJSON; пустые строки пропускаются. Строка, которая
+    не разбирается как JSON, возвращается как есть и отклоняется
+    при проверке.
+
+    :param stream: Текстовый поток
+    :return: Генератор словарей (или строк с ошибкой)
+    """
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            yield line
+
+
+READERS = {
+    "csv": read_csv,
+    "ndjson": read_ndjson,
+}
+
+
+def iter_batches(records, size):
+    """
+    Делит поток записей на порции, не читая его целиком.
+
+    :param records: Итератор записей
+    :param size: Размер порции
+    :return: Генератор списков записей
+    """
+    records = iter(records)
+    while batch := list(islice(records, size)):
+        yield batch
+
+
+class VPSBatchValidator:
+    """
+    Проверка порции импортируемых записей VPS по тем же правилам, что
+    и VPSSerializer: ресурсы - целые числа в пределах ``VPS_SETTINGS``,
+    нечётный RAM округляется вниз до чётного (как VPSSerializer.validate_ram),
+    статус - из STATUS_CHOICES или по умолчанию, UID - необязательный UUID,
+    не повторяющийся в порции и не занятый в БД.
+
+    Поля проверяются по столбцам всей порции, а занятые UID - одним
+    запросом на порцию, без сериализатора на каждую запись.
+    """
+
+    default_error_messages = {
+        "not_an_object": _("Expected an object with VPS fields."),
+        "required": _("This field is required."),
+        "invalid_integer": _("A valid integer is required."),
+        "min_value": _(
+            "Ensure this value is greater than or equal to %(limit_value)s."
+        ),
+        "max_value": _("Ensure this value is less than or equal to %(limit_value)s."),
+        "invalid_uid": _("Must be a valid UUID."),
+        "duplicate_uid": _("Duplicate UID in batch."),
+        "existing_uid": _("VPS with this UUID already exists."),
+        "invalid_status": _(
+            f"Invalid status. Please select a valid option from ({VPS.get_status_choices()})."
+        ),
+    }
+
+    def __init__(self, using=None):
+        """
+        :param using: Псевдоним БД для проверки занятых UID
+        """
+        self.using = using
+        self.limits = {
+            field: settings.VPS_SETTINGS[field.upper()] for field in RESOURCE_FIELDS
+        }
+        self.statuses = {status for status, _label in VPS.STATUS_CHOICES}
+        self.default_status = VPS._meta.get_field("status").get_default()
+
+    def validate(self, records):
+        """
+        Проверяет порцию записей.
+
+        :param records: Список записей (словарей полей)
+        :return: Кортеж (словарь {индекс записи: проверенные поля} валидных
+            записей, словарь {индекс записи: {поле: [ошибки]}})
+        """
+        errors = {
+            index: {"non_field_errors": [self.default_error_messages["not_an_object"]]}
+            for index, record in enumerate(records)
+            if not isinstance(record, dict)
+        }
+        records = [record if isinstance(record, dict) else {} for record in records]
+        not_objects = set(errors)
+
+        def fail(index, field, message, **params):
+            if index in not_objects:
+                return
+            message = self.default_error_messages[message]
+            errors.setdefault(index, {}).setdefault(field, []).append(
+                message % params if params else message
+            )
+
+        columns = {
+            field: self.validate_resource(field, records, fail)
+            for field in RESOURCE_FIELDS
+        }
+        # Нечётный RAM округляется вниз, как в VPSSerializer.validate_ram
+        columns["ram"] = [
+            value - value % 2 if value is not None else None for value in columns["ram"]
+        ]
+        columns["status"] = self.validate_status(records, fail)
+        columns["uid"] = self.validate_uid(records, fail)
+
+        validated = {
+            index: {field: column[index] for field, column in columns.items()}
+            for index in range(len(records))
+            if index not in errors
+        }
+        for attrs in validated.values():
+            if attrs["uid"] is None:
+                del attrs["uid"]
+        return validated, errors
+
+    def validate_resource(self, field, records, fail):
+        """
+        Проверяет столбец ресурса сервера.
+
+        :return: Список значений (None для записей с ошибкой)
+        """
+        low, high = self.limits[field]["MIN"], self.limits[field]["MAX"]
+        values = []
+        for index, record in enumerate(records):
+            value = self.to_integer(record.get(field))
+            if is_empty(record.get(field)):
+                fail(index, field, "required")
+            elif value is None:
+                fail(index, field, "invalid_integer")
+            elif value < low:
+                fail(index, field, "min_value", limit_value=low)
+                value = None
+            elif value > high:
+                fail(index, field, "max_value", limit_value=high)
+                value = None
+            values.append(value)
+        return values
+
+    def validate_status(self, records, fail):
+        """
+        Проверяет столбец статуса; пустой статус заменяется значением
+        по умолчанию.
+
+        :return: Список значений
+        """
+        values = [record.get("status") for record in records]
+        for index, value in enumerate(values):
+            if is_empty(value):
+                values[index] = self.default_status
+            elif value not in self.statuses:
+                fail(index, "status", "invalid_status")
+        return values
+
+    def validate_uid(self, records, fail):
+        """
+        Проверяет столбец UID: формат, повторы в порции и занятые в БД UID.
+
+        :return: Список значений (None, если UID не передан или неверен)
+        """
+        values = []
+        seen = set()
+        for index, record in enumerate(records):
+            value = record.get("uid")
+            if is_empty(value):
+                values.append(None)
+                continue
+            try:
+                value = uuid.UUID(str(value))
+            except ValueError:
+                fail(index, "uid", "invalid_uid")
+                value = None
+            else:
+                if value in seen:
+                    fail(index, "uid", "duplicate_uid")
+                seen.add(value)
+            values.append(value)
+
+        existing = (
+            VPS.objects.using(self.using).values_by_uid(list(seen), ("uid",))
+            if seen
+            else {}
+        )
+        for index, value in enumerate(values):
+            if value in existing:
+                fail(index, "uid", "existing_uid")
+        return values
+
+    @staticmethod
+    def to_integer(value):
+        """
+        Преобразует значение в целое число, как IntegerField DRF:
+        принимает числа без дробной части и строки с ними.
+
+        :return: Число или None, если значение не целое
+        """
+        if isinstance(value, bool):
+            return None
+        if isinstance(value, str):
+            try:
+                value = float(value)
+            except ValueError:
+                return None
+        if isinstance(value, float):
+            return int(value) if value.is_integer() else None
+        return value if isinstance(value, int) else None
+
+
+def is_empty(value):
+    """
+    Проверяет, что значение поля не передано (в CSV - пустая ячейка).
+    """
+    return value is None or value == ""
+
+
+class ImportCheckpoint:
+    """
+    Контрольная точка импорта в таблице VPSImport: сколько записей
+    источника обработано (сохранены или отклонены). save вызывается в той
+    же транзакции, что и вставка порции, поэтому контрольная точка
+    не расходится с сохранёнными серверами, и при повторном запуске импорт
+    продолжается со следующей порции. Без имени состояние только
+    считается и никуда не записывается.
+    """
+
+    def __init__(self, name=None, using=None):
+        """
+        :param name: Имя контрольной точки или None
+        :param using: Псевдоним БД, в которую импортируются серверы
+        """
+        self.name = name
+        self.using = using
+
+    def load(self, source):
+        """
+        Читает состояние импорта.
+
+        :param source: Источник записей (путь к файлу или "-")
+        :return: Словарь со счётчиками records, imported и invalid
+        :raises ValueError: Если контрольная точка записана для другого
+            источника
+        """
+        state = {"source": source, "records": 0, "imported": 0, "invalid": 0}
+        if self.name is None:
+            return state
+        saved = (
+            VPSImport.objects.using(self.using)
+            .filter(name=self.name)
+            .values(*state)
+            .first()
+        )
+        if saved is None:
+            return state
+        if saved["source"] != source:
+            raise ValueError(
+                f"Checkpoint {self.name} belongs to {saved['source']}, not {source}."
+            )
+        return saved
+
+    def save(self, state):
+        """
+        Записывает состояние импорта; вызывается в транзакции порции.
+
+        :param state: Словарь, возвращённый load, с обновлёнными счётчиками
+        """
+        if self.name is None:
+            return
+        VPSImport.objects.using(self.using).update_or_create(
+            name=self.name, defaults=state
+        )
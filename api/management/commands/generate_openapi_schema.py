@@ -0,0 +1,42 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from api.v1.docs import schema_documents
+
+
+class Command(BaseCommand):
+    """
+    Генерирует документы схемы OpenAPI для всех языков из ``LANGUAGES``
+    и записывает их в каталог, из которого схема отдаётся без генерации.
+    С флагом ``--check`` только проверяет, что записанные файлы совпадают
+    с текущей схемой, и завершается с ошибкой, если они устарели.
+    """
+
+    help = "Generates the OpenAPI schema files for every configured language."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            default=settings.VPS_SCHEMA_SETTINGS["DIRECTORY"],
+            help='Output directory, VPS_SCHEMA_SETTINGS["DIRECTORY"] by default.',
+        )
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify the schema files, exit with an error if outdated.",
+        )
+
+    def handle(self, *args, **options):
+        directory = options["output"]
+        if not directory:
+            raise CommandError('Pass --output or set VPS_SCHEMA_SETTINGS["DIRECTORY"].')
+        documents = schema_documents.generate()
+        if options["check"]:
+            if schema_documents.load(directory) != documents:
+                raise CommandError("OpenAPI schema files are out of date.")
+            self.stdout.write(self.style.SUCCESS("OpenAPI schema files are valid."))
+            return
+        for path in schema_documents.save(directory, documents):
+            self.stdout.write(str(path))
+        schema_documents.reset()
+        self.stdout.write(self.style.SUCCESS("OpenAPI schema files generated."))
@@ -0,0 +1,172 @@
+import sys
+import time
+from contextlib import nullcontext
+from itertools import islice
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, reset_queries, transaction
+
+from api.db import retry_on_locked
+from api.imports import READERS, ImportCheckpoint, VPSBatchValidator, iter_batches
+from api.models import VPS
+
+FORMAT_SUFFIXES = {
+    ".csv": "csv",
+    ".ndjson": "ndjson",
+    ".jsonl": "ndjson",
+}
+
+
+class Command(BaseCommand):
+    """
+    Потоковый импорт серверов VPS из CSV или NDJSON (файл или stdin).
+
+    Записи читаются порциями по ``--batch-size``, каждая порция проверяется
+    VPSBatchValidator и сохраняется пакетными INSERT в одной транзакции,
+    поэтому память не зависит от размера источника. После каждой порции
+    выводится прогресс, а с ``--checkpoint`` в той же транзакции в таблицу
+    VPSImport записывается контрольная точка: повторный запуск с ней
+    продолжает импорт после последней сохранённой порции, и сбой между
+    вставкой и записью контрольной точки невозможен. Без ``--skip-invalid``
+    импорт останавливается на порции с ошибками, не сохраняя её.
+    """
+
+    help = "Imports VPS servers from a CSV or NDJSON file or stdin."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "path",
+            nargs="?",
+            default="-",
+            help='Input file, "-" (default) to read stdin.',
+        )
+        parser.add_argument(
+            "--format",
+            choices=sorted(READERS),
+            help="Input format, detected from the file extension by default.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.VPS_IMPORT_SETTINGS["BATCH_SIZE"],
+            help="Records validated and saved per transaction.",
+        )
+        parser.add_argument(
+            "--checkpoint",
+            help=(
+                "Name of the progress record kept in the database; "
+                "rerun with it to resume the import."
+            ),
+        )
+        parser.add_argument(
+            "--skip-invalid",
+            action="store_true",
+            help="Report and skip invalid records instead of stopping.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to use.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        source = path if path == "-" else str(Path(path).resolve())
+        input_format = options["format"] or FORMAT_SUFFIXES.get(Path(path).suffix)
+        if input_format is None:
+            raise CommandError("Pass --format for stdin or unknown file extensions.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive.")
+
+        checkpoint = ImportCheckpoint(options["checkpoint"], using=options["database"])
+        try:
+            state = checkpoint.load(source)
+        except ValueError as exc:
+            raise CommandError(str(exc))
+        if state["records"]:
+            self.stdout.write(f"Resuming after record {state['records']}.")
+
+        validator = VPSBatchValidator(using=options["database"])
+        queryset = VPS.objects.using(options["database"])
+        started, resumed_at = time.monotonic(), state["records"]
+
+        with self.open_source(path) as stream:
+            records = islice(READERS[input_format](stream), state["records"], None)
+            for batch in iter_batches(records, options["batch_size"]):
+                validated, errors = validator.validate(batch)
+                for index, record_errors in sorted(errors.items()):
+                    for field, messages in record_errors.items():
+                        for message in messages:
+                            self.stderr.write(
+                                f"Record {state['records'] + index + 1}: "
+                                f"{field}: {message}"
+                            )
+                if errors and not options["skip_invalid"]:
+                    raise CommandError(
+                        f"Invalid records, import stopped after record "
+                        f"{state['records']}. Fix them and rerun"
+                        + (" with the same --checkpoint." if checkpoint.name else ".")
+                    )
+                state = self.save_batch(
+                    queryset,
+                    checkpoint,
+                    [VPS(**attrs) for attrs in validated.values()],
+                    state
+                    | {
+                        "records": state["records"] + len(batch),
+                        "imported": state["imported"] + len(validated),
+                        "invalid": state["invalid"] + len(errors),
+                    },
+                )
+                # С DEBUG = True журнал запросов соединения хранит SQL
+                # тысяч последних пакетных INSERT
+                reset_queries()
+                # Порция может сохраниться быстрее разрешения таймера
+                elapsed = time.monotonic() - started
+                rate = (state["records"] - resumed_at) / elapsed if elapsed else 0
+                self.stdout.write(
+                    f"Records {state['records']}: imported {state['imported']}, "
+                    f"invalid {state['invalid']} ({rate:.0f} records/s)"
+                )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Imported {state['imported']} servers, "
+                f"skipped {state['invalid']} invalid records."
+            )
+        )
+
+    @staticmethod
+    @retry_on_locked
+    def save_batch(queryset, checkpoint, servers, state):
+        """
+        Сохраняет порцию серверов и контрольную точку в одной транзакции.
+
+        :param queryset: Выборка VPS в БД импорта
+        :param checkpoint: ImportCheckpoint
+        :param servers: Объекты VPS порции
+        :param state: Состояние импорта после порции
+        :return: То же состояние
+        """
+        with transaction.atomic(using=queryset.db):
+            queryset.bulk_create(
+                servers, batch_size=settings.VPS_BATCH_SETTINGS["INSERT_SIZE"]
+            )
+            checkpoint.save(state)
+        return state
+
+    def open_source(self, path):
+        """
+        Открывает источник записей.
+
+        :param path: Путь к файлу или "-" для stdin
+        :return: Контекстный менеджер текстового потока
+        """
+        if path == "-":
+            return nullcontext(sys.stdin)
+        try:
+            return open(path, encoding="utf-8", newline="")
+        except OSError as exc:
+            raise CommandError(f"Cannot open {path}: {exc.strerror}.")
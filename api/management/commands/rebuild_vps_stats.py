@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS
+
+from api.models import VPSStats
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает сводку VPSStats по таблице VPS и выводит найденные
+    расхождения. С флагом ``--check`` только проверяет сводку и завершается
+    с ошибкой, если она не совпадает с фактическими данными.
+    """
+
+    help = "Rebuilds the VPS statistics summary from the VPS table."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Only verify the summary, exit with an error on mismatch.",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to use.",
+        )
+
+    def handle(self, *args, **options):
+        stats = VPSStats.objects.using(options["database"])
+        if options["check"]:
+            differences = stats.get_differences()
+        else:
+            differences = stats.rebuild()
+        for status, (stored, actual) in differences.items():
+            self.stdout.write(f"{status}: {stored} -> {actual}")
+        if options["check"] and differences:
+            raise CommandError("VPS statistics summary is out of date.")
+        if not differences:
+            self.stdout.write(self.style.SUCCESS("VPS statistics summary is valid."))
+        else:
+            self.stdout.write(self.style.SUCCESS("VPS statistics summary rebuilt."))
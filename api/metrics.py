@@ -0,0 +1,412 @@
+import bisect
+import json
+import os
+import threading
+import time
+import weakref
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+
+# Границы корзин гистограмм
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+SIZE_BUCKETS = (100, 1000, 10000, 100000, 1000000, 10000000)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 25, 50, 100)
+
+ROUTE_LABELS = ("route", "action")
+REQUEST_LABELS = ("route", "action", "method", "status")
+
+
+class Metric:
+    """
+    Описание метрики: имя, тип, подписи значений и границы корзин
+    (для гистограмм).
+    """
+
+    def __init__(self, name, documentation, labels, buckets=None):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = buckets
+
+    @property
+    def type(self):
+        """
+        Тип метрики в формате Prometheus.
+        """
+        return "counter" if self.buckets is None else "histogram"
+
+    @property
+    def size(self):
+        """
+        Длина вектора значений: счётчики корзин, сумма и количество
+        наблюдений для гистограммы, одно значение для счётчика.
+        """
+        return 1 if self.buckets is None else len(self.buckets) + 2
+
+
+REQUESTS = Metric("vps_http_requests_total", "Total HTTP requests.", REQUEST_LABELS)
+REQUEST_DURATION = Metric(
+    "vps_http_request_duration_seconds",
+    "HTTP request latency.",
+    ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+REQUEST_SIZE = Metric(
+    "vps_http_request_size_bytes", "HTTP request body size.", ROUTE_LABELS, SIZE_BUCKETS
+)
+RESPONSE_SIZE = Metric(
+    "vps_http_response_size_bytes",
+    "HTTP response body size (streaming responses are not observed).",
+    ROUTE_LABELS,
+    SIZE_BUCKETS,
+)
+DB_QUERIES = Metric(
+    "vps_db_queries_per_request",
+    "Number of SQL queries per request.",
+    ROUTE_LABELS,
+    QUERY_COUNT_BUCKETS,
+)
+DB_DURATION = Metric(
+    "vps_db_query_duration_seconds",
+    "Total SQL execution time per request.",
+    ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+SERIALIZER_DURATION = Metric(
+    "vps_serializer_duration_seconds",
+    "Total serializer validation and representation time per request.",
+    ROUTE_LABELS,
+    DURATION_BUCKETS,
+)
+METRICS = (
+    REQUESTS,
+    REQUEST_DURATION,
+    REQUEST_SIZE,
+    RESPONSE_SIZE,
+    DB_QUERIES,
+    DB_DURATION,
+    SERIALIZER_DURATION,
+)
+
+
+class RequestMetrics:
+    """
+    Показатели одного запроса, которые накапливаются по ходу его обработки.
+    """
+
+    __slots__ = ("queries", "db_time", "serializer_time", "serializer_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.serializer_time = 0.0
+        self.serializer_depth = 0
+
+
+# Показатели запроса, который обрабатывается в текущем контексте, или None
+request_metrics = ContextVar("request_metrics", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Обёртка выполнения SQL (``connection.execute_wrappers``): учитывает
+    число и время запросов в показателях текущего запроса.
+    """
+    metrics = request_metrics.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.queries += 1
+        metrics.db_time += time.perf_counter() - start
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    """
+    Обработчик сигнала connection_created: добавляет record_query
+    в обёртки выполнения SQL нового соединения.
+    """
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+@contextmanager
+def measure_serializer():
+    """
+    Учитывает время работы сериализатора в показателях текущего запроса.
+    Вложенные вызовы (например, элементы ListSerializer) не учитываются
+    повторно.
+    """
+    metrics = request_metrics.get()
+    if metrics is None:
+        yield
+        return
+    metrics.serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.serializer_depth -= 1
+        if not metrics.serializer_depth:
+            metrics.serializer_time += time.perf_counter() - start
+
+
+class MetricsRegistry:
+    """
+    Реестр метрик процесса.
+
+    Наблюдения записываются без блокировок: у каждого потока собственный
+    набор значений, и только при первом обращении потока его набор
+    регистрируется под блокировкой. При экспорте наборы всех потоков
+    суммируются. Набор завершившегося потока переносится в общие итоги,
+    поэтому серверы с потоком на запрос не накапливают наборы.
+
+    Несколько процессов-воркеров складывают свои значения через каталог
+    ``VPS_METRICS_SETTINGS["DIRECTORY"]``: каждый процесс не чаще раза
+    в ``DUMP_INTERVAL`` секунд записывает туда снимок своих значений,
+    а /metrics суммирует снимки всех процессов. Снимки завершившихся
+    процессов остаются, поэтому счётчики не уменьшаются; каталог
+    очищается при развёртывании. Без каталога /metrics отдаёт значения
+    только обслужившего запрос процесса.
+    """
+
+    def __init__(self):
+        self.local = threading.local()
+        self.shards = []
+        self.retired = {}
+        self.lock = threading.RLock()
+        self.dumped_at = 0.0
+
+    def get_shard(self):
+        """
+        Возвращает набор значений текущего потока.
+        """
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard = self.local.shard = {}
+            # Объект-маркер удаляется вместе с данными потока при его
+            # завершении, после чего набор переносится в общие итоги
+            self.local.marker = marker = ThreadMarker()
+            weakref.finalize(marker, self.retire, shard)
+            with self.lock:
+                self.shards.append(shard)
+            return shard
+
+    def retire(self, shard):
+        """
+        Переносит набор значений завершившегося потока в общие итоги.
+
+        :param shard: Набор значений потока
+        """
+        with self.lock:
+            for key, values in shard.items():
+                merge_values(self.retired, key, values)
+            # Наборы сравниваются по идентичности: пустые наборы разных
+            # потоков равны между собой
+            self.shards = [item for item in self.shards if item is not shard]
+
+    def inc(self, metric, labels, amount=1):
+        """
+        Увеличивает счётчик.
+
+        :param metric: Metric
+        :param labels: Кортеж значений подписей
+        :param amount: Приращение
+        """
+        shard = self.get_shard()
+        key = (metric.name, labels)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * metric.size
+        values[0] += amount
+
+    def observe(self, metric, labels, value):
+        """
+        Добавляет наблюдение в гистограмму.
+
+        :param metric: Metric
+        :param labels: Кортеж значений подписей
+        :param value: Наблюдаемое значение
+        """
+        shard = self.get_shard()
+        key = (metric.name, labels)
+        values = shard.get(key)
+        if values is None:
+            values = shard[key] = [0] * metric.size
+        index = bisect.bisect_left(metric.buckets, value)
+        if index < len(metric.buckets):
+            values[index] += 1
+        values[-2] += value
+        values[-1] += 1
+
+    def collect(self):
+        """
+        Суммирует значения всех потоков процесса.
+
+        :return: Словарь {(имя метрики, подписи): значения}
+        """
+        totals = {}
+        with self.lock:
+            shards = list(self.shards)
+            for key, values in self.retired.items():
+                merge_values(totals, key, values)
+        for shard in shards:
+            for key, values in list(shard.items()):
+                merge_values(totals, key, values)
+        return totals
+
+    def get_snapshot_path(self, directory, pid=None):
+        """
+        Возвращает путь снимка значений процесса в каталоге метрик.
+        """
+        return Path(directory) / f"metrics.{pid or os.getpid()}.json"
+
+    def dump(self, directory):
+        """
+        Записывает снимок значений процесса в каталог метрик.
+
+        :param directory: Каталог метрик
+        """
+        path = self.get_snapshot_path(directory)
+        temporary = path.with_suffix(".tmp")
+        temporary.write_text(
+            json.dumps(
+                [
+                    [name, list(labels), values]
+                    for (name, labels), values in self.collect().items()
+                ]
+            )
+        )
+        os.replace(temporary, path)
+        self.dumped_at = time.monotonic()
+
+    def maybe_dump(self):
+        """
+        Записывает снимок, если задан каталог метрик и с прошлой записи
+        прошло больше ``DUMP_INTERVAL`` секунд.
+        """
+        metrics_settings = settings.VPS_METRICS_SETTINGS
+        directory = metrics_settings["DIRECTORY"]
+        if directory and (
+            time.monotonic() - self.dumped_at > metrics_settings["DUMP_INTERVAL"]
+        ):
+            self.dump(directory)
+
+    def collect_all(self):
+        """
+        Суммирует значения всех процессов: текущего - из памяти, остальных -
+        из их снимков в каталоге метрик.
+
+        :return: Словарь {(имя метрики, подписи): значения}
+        """
+        totals = self.collect()
+        directory = settings.VPS_METRICS_SETTINGS["DIRECTORY"]
+        if not directory:
+            return totals
+        own_path = self.get_snapshot_path(directory)
+        for path in Path(directory).glob("metrics.*.json"):
+            if path == own_path:
+                continue
+            try:
+                snapshot = json.loads(path.read_text())
+            except (OSError, ValueError):
+                continue  # Снимок удалён или записывается
+            for name, labels, values in snapshot:
+                merge_values(totals, (name, tuple(labels)), values)
+        return totals
+
+    def reset(self):
+        """
+        Сбрасывает значения всех потоков процесса.
+        """
+        with self.lock:
+            self.retired.clear()
+            for shard in self.shards:
+                shard.clear()
+
+
+class ThreadMarker:
+    """
+    Маркер данных потока в MetricsRegistry.
+    """
+
+
+def merge_values(totals, key, values):
+    """
+    Прибавляет вектор значений метрики к итогам.
+    """
+    total = totals.get(key)
+    if total is None:
+        totals[key] = list(values)
+    else:
+        for index, value in enumerate(values):
+            total[index] += value
+
+
+def format_labels(names, values, **extra):
+    """
+    Форматирует подписи значения в формате Prometheus.
+    """
+    pairs = list(zip(names, values)) + list(extra.items())
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in pairs
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def format_number(value):
+    """
+    Форматирует значение в формате Prometheus.
+    """
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def render_metrics(totals):
+    """
+    Формирует текст экспорта метрик в формате Prometheus (text format 0.0.4).
+
+    :param totals: Словарь {(имя метрики, подписи): значения}
+    :return: Текст экспорта
+    """
+    lines = []
+    for metric in METRICS:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        series = sorted(
+            (labels, values)
+            for (name, labels), values in totals.items()
+            if name == metric.name
+        )
+        for labels, values in series:
+            if metric.buckets is None:
+                lines.append(
+                    f"{metric.name}{format_labels(metric.labels, labels)} "
+                    f"{format_number(values[0])}"
+                )
+                continue
+            cumulative = 0
+            for bound, count in zip(metric.buckets, values):
+                cumulative += count
+                bucket_labels = format_labels(
+                    metric.labels, labels, le=format_number(float(bound))
+                )
+                lines.append(f"{metric.name}_bucket{bucket_labels} {cumulative}")
+            bucket_labels = format_labels(metric.labels, labels, le="+Inf")
+            lines.append(f"{metric.name}_bucket{bucket_labels} {values[-1]}")
+            label_text = format_labels(metric.labels, labels)
+            lines.append(f"{metric.name}_sum{label_text} {format_number(values[-2])}")
+            lines.append(f"{metric.name}_count{label_text} {values[-1]}")
+    return "\n".join(lines) + "\n"
+
+
+metrics_registry = MetricsRegistry()
@@ -0,0 +1,305 @@
+import logging
+import time
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
+from django.conf import settings
+from django.db import DatabaseError
+from django.utils.cache import patch_vary_headers
+from django.utils.decorators import sync_and_async_middleware
+
+from api.compression import acompress_stream, compress_stream, select_codec
+from api.diagnostics import (
+    captured_queries,
+    is_slow,
+    record_slow_request,
+    start_capture,
+)
+from api.metrics import (
+    DB_DURATION,
+    DB_QUERIES,
+    REQUEST_DURATION,
+    REQUEST_SIZE,
+    REQUESTS,
+    RESPONSE_SIZE,
+    SERIALIZER_DURATION,
+    RequestMetrics,
+    metrics_registry,
+    request_metrics,
+)
+from api.routers import PINNED_BY_CLIENT, PINNED_BY_WRITE, primary_pinned
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+@sync_and_async_middleware
+def async_urlconf_middleware(get_response):
+    """
+    Направляет запросы, обрабатываемые асинхронно (под ASGI), в URLconf
+    ``VPS_ASYNC_SETTINGS["URLCONF"]`` с асинхронными представлениями VPS.
+    Под WSGI запросы обрабатываются URLconf проекта без изменений.
+
+    :param get_response: Следующий обработчик цепочки middleware
+    :return: Middleware
+    """
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            urlconf = settings.VPS_ASYNC_SETTINGS["URLCONF"]
+            if urlconf is not None:
+                request.urlconf = urlconf
+            return await get_response(request)
+
+    else:
+
+        def middleware(request):
+            return get_response(request)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def primary_pinning_middleware(get_response):
+    """
+    Обеспечивает чтение собственных записей при маршрутизации на реплики
+    (см. PrimaryReplicaRouter).
+
+    Запросы с небезопасными методами читают из основной БД целиком.
+    Если запрос выполнил запись, клиенту выставляется cookie
+    ``VPS_DB_ROUTING_SETTINGS["COOKIE_NAME"]`` на ``STICKY_SECONDS`` секунд,
+    и пока она есть, его запросы тоже читают из основной БД, не получая
+    с реплики данные до собственной записи.
+
+    :param get_response: Следующий обработчик цепочки middleware
+    :return: Middleware
+    """
+
+    def start(request):
+        if request.method not in SAFE_METHODS:
+            reason = PINNED_BY_WRITE
+        elif settings.VPS_DB_ROUTING_SETTINGS["COOKIE_NAME"] in request.COOKIES:
+            reason = PINNED_BY_CLIENT
+        else:
+            reason = None
+        return primary_pinned.set(reason)
+
+    def finish(response, token):
+        if primary_pinned.get() == PINNED_BY_WRITE:
+            routing_settings = settings.VPS_DB_ROUTING_SETTINGS
+            response.set_cookie(
+                routing_settings["COOKIE_NAME"],
+                "1",
+                max_age=routing_settings["STICKY_SECONDS"],
+                httponly=True,
+                samesite="Lax",
+            )
+        primary_pinned.reset(token)
+        return response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            token = start(request)
+            return finish(await get_response(request), token)
+
+    else:
+
+        def middleware(request):
+            token = start(request)
+            return finish(get_response(request), token)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def metrics_middleware(get_response):
+    """
+    Собирает метрики запросов (см. api.metrics): задержку, размеры запроса
+    и ответа, число и время SQL-запросов и время работы сериализаторов
+    с подписями маршрута (имя URL) и действия ViewSet.
+
+    :param get_response: Следующий обработчик цепочки middleware
+    :return: Middleware
+    """
+
+    def start():
+        if not settings.VPS_METRICS_SETTINGS["ENABLED"]:
+            return None, None
+        metrics = RequestMetrics()
+        return metrics, request_metrics.set(metrics)
+
+    def finish(request, response, metrics, token, started):
+        request_metrics.reset(token)
+        match = request.resolver_match
+        if match is None:
+            labels = ("unmatched", "")
+        else:
+            actions = getattr(match.func, "actions", None) or getattr(
+                getattr(match.func, "view_class", None), "actions", {}
+            )
+            labels = (match.view_name, actions.get(request.method.lower(), ""))
+        registry = metrics_registry
+        registry.inc(REQUESTS, (*labels, request.method, str(response.status_code)))
+        registry.observe(REQUEST_DURATION, labels, time.perf_counter() - started)
+        registry.observe(
+            REQUEST_SIZE, labels, int(request.META.get("CONTENT_LENGTH") or 0)
+        )
+        if not response.streaming:
+            registry.observe(RESPONSE_SIZE, labels, len(response.content))
+        registry.observe(DB_QUERIES, labels, metrics.queries)
+        registry.observe(DB_DURATION, labels, metrics.db_time)
+        registry.observe(SERIALIZER_DURATION, labels, metrics.serializer_time)
+        registry.maybe_dump()
+        return response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started = time.perf_counter()
+            metrics, token = start()
+            if metrics is None:
+                return await get_response(request)
+            response = await get_response(request)
+            return finish(request, response, metrics, token, started)
+
+    else:
+
+        def middleware(request):
+            started = time.perf_counter()
+            metrics, token = start()
+            if metrics is None:
+                return get_response(request)
+            response = get_response(request)
+            return finish(request, response, metrics, token, started)
+
+    return middleware
+
+
+@sync_and_async_middleware
+def slow_request_middleware(get_response):
+    """
+    Диагностический режим (``VPS_SLOW_REQUEST_SETTINGS["ENABLED"]``):
+    записывает SQL-запросы каждого запроса с временем выполнения и для
+    запросов дольше ``THRESHOLD`` секунд сохраняет образец с планом
+    самого медленного SQL-запроса в журнал SlowRequest (см. админку).
+    Ошибка записи образца в БД только пишется в журнал: клиент получает
+    исходный ответ.
+
+    :param get_response: Следующий обработчик цепочки middleware
+    :return: Middleware
+    """
+
+    def record(request, response, captured, duration):
+        try:
+            record_slow_request(request, response, captured, duration)
+        except DatabaseError:
+            logger.exception(
+                "Failed to record slow request %s %s",
+                request.method,
+                request.get_full_path(),
+            )
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            started = time.perf_counter()
+            captured, token = start_capture()
+            if captured is None:
+                return await get_response(request)
+            try:
+                response = await get_response(request)
+            finally:
+                captured_queries.reset(token)
+            duration = time.perf_counter() - started
+            if is_slow(duration):
+                await sync_to_async(record)(request, response, captured, duration)
+            return response
+
+    else:
+
+        def middleware(request):
+            started = time.perf_counter()
+            captured, token = start_capture()
+            if captured is None:
+                return get_response(request)
+            try:
+                response = get_response(request)
+            finally:
+                captured_queries.reset(token)
+            duration = time.perf_counter() - started
+            if is_slow(duration):
+                record(request, response, captured, duration)
+            return response
+
+    return middleware
+
+
+@sync_and_async_middleware
+def compression_middleware(get_response):
+    """
+    Сжимает ответы brotli или gzip (см. api.compression), выбирая кодировку
+    по заголовку Accept-Encoding. Сжимаются только ответы API с типами
+    из ``VPS_COMPRESSION_SETTINGS["MEDIA_TYPES"]``: HTML-страницы (админка,
+    документация) содержат CSRF-токены, и их сжатие открывает атаку BREACH.
+    Потоки Server-Sent Events тоже не сжимаются: события должны доходить
+    до клиента без буферизации. Не сжимаются ответы меньше ``MIN_SIZE``
+    байт и уже сжатые ответы. Потоковые ответы сжимаются по порциям.
+    ETag сжатого ответа становится слабым, как в GZipMiddleware Django:
+    условный GET (If-None-Match) сравнивает ETag без учёта этого.
+
+    :param get_response: Следующий обработчик цепочки middleware
+    :return: Middleware
+    """
+
+    def process(request, response):
+        media_type = response.get("Content-Type", "").partition(";")[0].strip()
+        if (
+            response.has_header("Content-Encoding")
+            or media_type not in settings.VPS_COMPRESSION_SETTINGS["MEDIA_TYPES"]
+        ):
+            return response
+        if (
+            not response.streaming
+            and len(response.content) < settings.VPS_COMPRESSION_SETTINGS["MIN_SIZE"]
+        ):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+        codec = select_codec(request.headers.get("Accept-Encoding", ""))
+        if codec is None:
+            return response
+
+        if response.streaming:
+            if response.is_async:
+                response.streaming_content = acompress_stream(
+                    codec, response.streaming_content
+                )
+            else:
+                response.streaming_content = compress_stream(
+                    codec, response.streaming_content
+                )
+            response.headers.pop("Content-Length", None)
+        else:
+            compressed = codec.compress(response.content)
+            if len(compressed) >= len(response.content):
+                return response
+            response.content = compressed
+            response.headers["Content-Length"] = str(len(compressed))
+
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = f"W/{etag}"
+        response.headers["Content-Encoding"] = codec.encoding
+        return response
+
+    if iscoroutinefunction(get_response):
+
+        async def middleware(request):
+            return process(request, await get_response(request))
+
+    else:
+
+        def middleware(request):
+            return process(request, get_response(request))
+
+    return middleware
@@ -0,0 +1,78 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:21
+
+import uuid
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name='VPS',
+            fields=[
+                (
+                    'uid',
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='UUID',
+                    ),
+                ),
+                (
+                    'cpu',
+                    models.PositiveIntegerField(
+                        validators=[
+                            django.core.validators.MinValueValidator(2),
+                            django.core.validators.MaxValueValidator(80),
+                        ],
+                        verbose_name='CPU',
+                    ),
+                ),
+                (
+                    'ram',
+                    models.PositiveIntegerField(
+                        validators=[
+                            django.core.validators.MinValueValidator(2),
+                            django.core.validators.MaxValueValidator(64),
+                        ],
+                        verbose_name='RAM (Gb)',
+                    ),
+                ),
+                (
+                    'hdd',
+                    models.PositiveIntegerField(
+                        validators=[
+                            django.core.validators.MinValueValidator(5),
+                            django.core.validators.MaxValueValidator(4096),
+                        ],
+                        verbose_name='HDD (Gb)',
+                    ),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('started', 'Started'),
+                            ('stopped', 'Stopped'),
+                            ('blocked', 'Blocked'),
+                        ],
+                        default='blocked',
+                        max_length=10,
+                        verbose_name='Status',
+                    ),
+                ),
+            ],
+            options={
+                'verbose_name': 'VPS',
+                'verbose_name_plural': 'VPSs',
+                'ordering': ('-status',),
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name='vps',
+            options={
+                'ordering': ('uid',),
+                'verbose_name': 'VPS',
+                'verbose_name_plural': 'VPSs',
+            },
+        ),
+        migrations.AddIndex(
+            model_name='vps',
+            index=models.Index(fields=['status', 'uid'], name='vps_status_uid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vps',
+            index=models.Index(fields=['cpu', 'uid'], name='vps_cpu_uid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vps',
+            index=models.Index(fields=['ram', 'uid'], name='vps_ram_uid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vps',
+            index=models.Index(fields=['hdd', 'uid'], name='vps_hdd_uid_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0002_vps_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vps',
+            name='version',
+            field=models.PositiveIntegerField(
+                default=1, editable=False, verbose_name='Version'
+            ),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:40
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_vps_version'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='vps',
+            name='updated_at',
+            field=models.DateTimeField(
+                auto_now=True,
+                db_index=True,
+                default=django.utils.timezone.now,
+                verbose_name='Updated at',
+            ),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,72 @@
+# Generated by Django 5.1.5 on 2026-10-18 08:33
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def fill_vps_stats(apps, schema_editor):
+    VPS = apps.get_model('api', 'VPS')
+    VPSStats = apps.get_model('api', 'VPSStats')
+    db_alias = schema_editor.connection.alias
+    rows = {
+        row['status']: row
+        for row in VPS.objects.using(db_alias)
+        .order_by()
+        .values('status')
+        .annotate(
+            total_servers=Count('pk'),
+            total_cpu=Sum('cpu'),
+            total_ram=Sum('ram'),
+            total_hdd=Sum('hdd'),
+        )
+    }
+    empty = dict.fromkeys(('total_servers', 'total_cpu', 'total_ram', 'total_hdd'), 0)
+    VPSStats.objects.using(db_alias).bulk_create(
+        VPSStats(
+            status=status,
+            servers=rows.get(status, empty)['total_servers'],
+            cpu=rows.get(status, empty)['total_cpu'],
+            ram=rows.get(status, empty)['total_ram'],
+            hdd=rows.get(status, empty)['total_hdd'],
+        )
+        for status in ('started', 'stopped', 'blocked')
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_vps_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VPSStats',
+            fields=[
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('started', 'Started'),
+                            ('stopped', 'Stopped'),
+                            ('blocked', 'Blocked'),
+                        ],
+                        max_length=10,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='Status',
+                    ),
+                ),
+                ('servers', models.BigIntegerField(default=0, verbose_name='Servers')),
+                ('cpu', models.BigIntegerField(default=0, verbose_name='CPU')),
+                ('ram', models.BigIntegerField(default=0, verbose_name='RAM (Gb)')),
+                ('hdd', models.BigIntegerField(default=0, verbose_name='HDD (Gb)')),
+            ],
+            options={
+                'verbose_name': 'VPS statistics',
+                'verbose_name_plural': 'VPS statistics',
+                'ordering': ('status',),
+            },
+        ),
+        migrations.RunPython(fill_vps_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0005_vps_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SlowRequest',
+            fields=[
+                (
+                    'id',
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='ID',
+                    ),
+                ),
+                (
+                    'created_at',
+                    models.DateTimeField(auto_now_add=True, verbose_name='Created at'),
+                ),
+                ('method', models.CharField(max_length=10, verbose_name='Method')),
+                ('path', models.TextField(verbose_name='Path')),
+                (
+                    'status_code',
+                    models.PositiveSmallIntegerField(verbose_name='Status code'),
+                ),
+                ('duration', models.FloatField(verbose_name='Duration (s)')),
+                ('query_count', models.PositiveIntegerField(verbose_name='Queries')),
+                ('db_time', models.FloatField(verbose_name='SQL time (s)')),
+                ('queries', models.JSONField(default=list, verbose_name='SQL')),
+                (
+                    'slowest_sql',
+                    models.TextField(blank=True, verbose_name='Slowest SQL'),
+                ),
+                ('query_plan', models.TextField(blank=True, verbose_name='Query plan')),
+            ],
+            options={
+                'verbose_name': 'Slow request',
+                'verbose_name_plural': 'Slow requests',
+                'ordering': ('-pk',),
+            },
+        ),
+    ]
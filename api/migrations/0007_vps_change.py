@@ -0,0 +1,56 @@
+# Generated by Django 5.1.5 on 2026-10-18 09:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0006_slow_request'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VPSChange',
+            fields=[
+                (
+                    'seq',
+                    models.BigAutoField(
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='Sequence number',
+                    ),
+                ),
+                ('uid', models.UUIDField(db_index=True, verbose_name='UUID')),
+                (
+                    'action',
+                    models.CharField(
+                        choices=[('create', 'Created'), ('status', 'Status changed')],
+                        max_length=10,
+                        verbose_name='Action',
+                    ),
+                ),
+                (
+                    'status',
+                    models.CharField(
+                        choices=[
+                            ('started', 'Started'),
+                            ('stopped', 'Stopped'),
+                            ('blocked', 'Blocked'),
+                        ],
+                        max_length=10,
+                        verbose_name='Status',
+                    ),
+                ),
+                (
+                    'changed_at',
+                    models.DateTimeField(auto_now_add=True, verbose_name='Changed at'),
+                ),
+            ],
+            options={
+                'verbose_name': 'VPS change',
+                'verbose_name_plural': 'VPS changes',
+                'ordering': ('seq',),
+            },
+        ),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:11
+
+from django.db import migrations, models
+
+import api.uids
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_vps_change'),
+    ]
+
+    operations = [
+        # Значение по умолчанию вычисляется в Python, схема БД не меняется;
+        # без SeparateDatabaseAndState SQLite пересоздал бы таблицу VPS.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name='vps',
+                    name='uid',
+                    field=models.UUIDField(
+                        default=api.uids.generate_uid,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='UUID',
+                    ),
+                ),
+            ],
+        ),
+    ]
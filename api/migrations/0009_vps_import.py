@@ -0,0 +1,43 @@
+# Generated by Django 5.1.5 on 2026-10-18 10:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0008_vps_uid_default'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VPSImport',
+            fields=[
+                (
+                    'name',
+                    models.CharField(
+                        max_length=255,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name='Name',
+                    ),
+                ),
+                ('source', models.TextField(verbose_name='Source')),
+                ('records', models.BigIntegerField(default=0, verbose_name='Records')),
+                (
+                    'imported',
+                    models.BigIntegerField(default=0, verbose_name='Imported'),
+                ),
+                ('invalid', models.BigIntegerField(default=0, verbose_name='Invalid')),
+                (
+                    'updated_at',
+                    models.DateTimeField(auto_now=True, verbose_name='Updated at'),
+                ),
+            ],
+            options={
+                'verbose_name': 'VPS import',
+                'verbose_name_plural': 'VPS imports',
+                'ordering': ('name',),
+            },
+        ),
+    ]
@@ -1,10 +1,244 @@
 import uuid
 
+from asgiref.sync import sync_to_async
 from django.conf import settings
+from django.core.exceptions import EmptyResultSet
 from django.core.validators import MaxValueValidator, MinValueValidator
-from django.db import models
+from django.db import DatabaseError, connections, models, router, transaction
+from django.db.models import Case, Count, F, Max, Sum, Value, When
+from django.db.models.sql import UpdateQuery
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from api.cache import response_cache
+from api.changes import change_notifier
+from api.db import retry_on_locked
+from api.uids import generate_uid
+
+
+class VPSQuerySet(models.QuerySet):
+    """
+    QuerySet модели VPS с массовыми операциями над выборкой серверов.
+    Все массовые записи в той же транзакции обновляют сводку VPSStats
+    и инвалидируют кэш ответов API; создание серверов (bulk_create) и смена
+    статуса (set_status, set_status_returning, set_status_versions) в той же
+    транзакции записываются в журнал VPSChange. Записи, не выполненные
+    из-за блокировки БД, повторяются (см. retry_on_locked).
+    """
+
+    def bulk_create(self, objs, *args, **kwargs):
+        """
+        Создаёт объекты пакетными INSERT, обновляет сводку, записывает
+        создание серверов в журнал VPSChange и инвалидирует кэш ответов.
+        """
+        self._for_write = True  # Итоги и транзакция - в БД для записи
+        objs = list(objs)  # Генератор нельзя перечитать при повторной попытке
+
+        @retry_on_locked
+        def create():
+            with transaction.atomic(using=self.db, savepoint=False):
+                created = super(VPSQuerySet, self).bulk_create(objs, *args, **kwargs)
+                VPSStats.objects.using(self.db).apply_changes(
+                    added=VPSStats.get_totals(created)
+                )
+                VPSChange.objects.using(self.db).record_many(
+                    (obj.uid, VPSChange.CREATE, obj.status) for obj in created
+                )
+            return created
+
+        objs = create()
+        if objs:
+            response_cache.invalidate(using=self.db)
+        return objs
+
+    @retry_on_locked
+    def update(self, **kwargs):
+        """
+        Обновляет объекты выборки одним UPDATE, обновляет сводку
+        и инвалидирует кэш ответов.
+        Если время изменения не передано явно, записывает текущее.
+
+        Для обновления сводки итоги выборки по статусам считаются до UPDATE.
+        Если меняется только статус (на конкретное значение), итоги после
+        UPDATE известны без повторного чтения; при изменении ресурсов
+        они пересчитываются по первичным ключам изменённых серверов.
+        """
+        self._for_write = True  # Итоги и транзакция - в БД для записи
+        kwargs.setdefault("updated_at", timezone.now())
+        tracked = VPSStats.TRACKED_FIELDS & kwargs.keys()
+        with transaction.atomic(using=self.db, savepoint=False):
+            if not tracked:
+                rows = super().update(**kwargs)
+            elif tracked == {"status"} and not hasattr(
+                kwargs["status"], "resolve_expression"
+            ):
+                removed = self.get_totals()
+                rows = super().update(**kwargs)
+                VPSStats.objects.using(self.db).apply_changes(
+                    removed, VPSStats.merge_totals(removed, kwargs["status"])
+                )
+            else:
+                pks = list(self.values_list("pk", flat=True))
+                queryset = self.model.objects.using(self.db).filter(pk__in=pks)
+                removed = queryset.get_totals()
+                rows = super(VPSQuerySet, queryset).update(**kwargs)
+                VPSStats.objects.using(self.db).apply_changes(
+                    removed, queryset.get_totals()
+                )
+        if rows:
+            response_cache.invalidate(using=self.db)
+        return rows
+
+    @retry_on_locked
+    def delete(self):
+        """
+        Удаляет объекты выборки, обновляет сводку и инвалидирует кэш ответов.
+        """
+        self._for_write = True  # Итоги и транзакция - в БД для записи
+        with transaction.atomic(using=self.db, savepoint=False):
+            removed = self.get_totals()
+            deleted = super().delete()
+            VPSStats.objects.using(self.db).apply_changes(removed=removed)
+        if deleted[0]:
+            response_cache.invalidate(using=self.db)
+        return deleted
+
+    def get_totals(self):
+        """
+        Считает итоги выборки по статусам одним GROUP BY.
+
+        :return: Словарь {статус: {"servers": ..., "cpu": ..., "ram": ..., "hdd": ...}}
+        """
+        rows = (
+            self.order_by()
+            .values("status")
+            .annotate(
+                total_servers=Count("pk"),
+                total_cpu=Sum("cpu"),
+                total_ram=Sum("ram"),
+                total_hdd=Sum("hdd"),
+            )
+        )
+        return {
+            row["status"]: {
+                field: row[f"total_{field}"] for field in VPSStats.TOTAL_FIELDS
+            }
+            for row in rows
+        }
+
+    def iter_chunks(self, fields, chunk_size):
+        """
+        Читает выборку порциями по ``chunk_size`` строк.
+        Каждая порция выбирается отдельным запросом по индексу первичного
+        ключа (``WHERE uid > <последний UID> ORDER BY uid LIMIT n``),
+        поэтому в памяти одновременно находится не больше одной порции.
+
+        :param fields: Имена полей; первым должен быть первичный ключ
+        :param chunk_size: Количество строк в порции
+        :return: Генератор списков кортежей значений полей
+        """
+        queryset = self.order_by("pk").values_list(*fields)
+        chunk = list(queryset[:chunk_size])
+        while chunk:
+            yield chunk
+            if len(chunk) < chunk_size:
+                return
+            chunk = list(queryset.filter(pk__gt=chunk[-1][0])[:chunk_size])
+
+    def values_by_uid(self, uids, fields):
+        """
+        Выбирает серверы с указанными UID словарями полей.
+        UID выбираются запросами ``WHERE uid IN (...)`` по индексу первичного
+        ключа, порциями не больше предела числа параметров запроса СУБД.
+
+        :param uids: Список UID без повторов
+        :param fields: Имена полей; должны включать uid
+        :return: Словарь {UID: словарь полей} найденных серверов
+        """
+        batch_size = connections[self.db].features.max_query_params or len(uids)
+        queryset = self.order_by().values(*fields)
+        rows = {}
+        for start in range(0, len(uids), batch_size):
+            end = start + batch_size
+            rows.update(
+                (row["uid"], row) for row in queryset.filter(uid__in=uids[start:end])
+            )
+        return rows
+
+    def set_status(self, status):
+        """
+        Переводит все серверы выборки в указанный статус одним UPDATE.
+        Серверы, уже находящиеся в этом статусе, не изменяются,
+        у изменённых увеличивается версия. UID изменённых серверов нужны
+        для журнала VPSChange, поэтому используется set_status_returning.
+
+        :param status: Новый статус
+        :return: Количество изменённых серверов
+        """
+        return len(self.set_status_returning(status))
+
+    def set_status_returning(self, status):
+        """
+        Переводит все серверы выборки в указанный статус одним
+        ``UPDATE ... RETURNING`` и возвращает UID изменённых серверов
+        (см. set_status_versions).
+
+        :param status: Новый статус
+        :return: Список UID изменённых серверов
+        """
+        return list(self.set_status_versions(status))
+
+    @retry_on_locked
+    def set_status_versions(self, status, updated_at=None):
+        """
+        Переводит все серверы выборки в указанный статус одним
+        ``UPDATE ... RETURNING`` и возвращает новые версии изменённых
+        серверов, прочитанные из БД тем же запросом.
+        Смена статуса каждого сервера записывается в журнал VPSChange
+        в той же транзакции.
+        Требует поддержки RETURNING в СУБД (SQLite 3.35+, PostgreSQL).
+
+        :param status: Новый статус
+        :param updated_at: Время изменения; по умолчанию текущее
+        :return: Словарь {UID: новая версия} изменённых серверов
+        """
+        self._for_write = True  # Итоги и транзакция - в БД для записи
+        queryset = self.exclude(status=status)
+        query = queryset.query.chain(UpdateQuery)
+        query.add_update_values(
+            {
+                "status": status,
+                "version": F("version") + 1,
+                "updated_at": updated_at or timezone.now(),
+            }
+        )
+        connection = connections[queryset.db]
+        try:
+            sql, params = query.get_compiler(queryset.db).as_sql()
+        except EmptyResultSet:
+            return {}
+
+        pk_column = connection.ops.quote_name(self.model._meta.pk.column)
+        version_column = connection.ops.quote_name(
+            self.model._meta.get_field("version").column
+        )
+        with transaction.atomic(using=queryset.db, savepoint=False):
+            removed = queryset.get_totals()
+            with connection.cursor() as cursor:
+                cursor.execute(f"{sql} RETURNING {pk_column}, {version_column}", params)
+                versions = {
+                    uuid.UUID(str(uid)): version for uid, version in cursor.fetchall()
+                }
+            VPSStats.objects.using(queryset.db).apply_changes(
+                removed, VPSStats.merge_totals(removed, status)
+            )
+            VPSChange.objects.using(queryset.db).record_many(
+                (uid, VPSChange.STATUS, status) for uid in versions
+            )
+        if versions:
+            response_cache.invalidate(using=queryset.db)
+        return versions
+
 
 class VPS(models.Model):
     """
@@ -22,7 +256,7 @@ class VPS(models.Model):
     uid = models.UUIDField(
         verbose_name=_("UUID"),
         primary_key=True,
-        default=uuid.uuid4,
+        default=generate_uid,
     )
     cpu = models.PositiveIntegerField(
         verbose_name=_("CPU"),
@@ -51,6 +285,18 @@ class VPS(models.Model):
         choices=STATUS_CHOICES,
         default=STATUS_CHOICES[2][0],  # По умолчанию статус "Blocked"
     )
+    version = models.PositiveIntegerField(
+        verbose_name=_("Version"),
+        default=1,
+        editable=False,
+    )  # Увеличивается при каждом изменении, используется как ETag
+    updated_at = models.DateTimeField(
+        verbose_name=_("Updated at"),
+        auto_now=True,
+        db_index=True,
+    )
+
+    objects = VPSQuerySet.as_manager()
 
     @classmethod
     def get_status_choices(cls):
@@ -61,6 +307,116 @@ class VPS(models.Model):
         """
         return ", ".join(choice[0] for choice in cls.STATUS_CHOICES)
 
+    @retry_on_locked
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет объект, обновляет сводку VPSStats в той же транзакции
+        и инвалидирует кэш ответов API.
+        При изменении существующего объекта увеличивает его версию.
+        Создание сервера и смена его статуса записываются в журнал VPSChange.
+        """
+        using = kwargs.get("using") or router.db_for_write(VPS, instance=self)
+        adding, version = self._state.adding, self.version
+        try:
+            with transaction.atomic(using=using, savepoint=False):
+                removed = {}
+                if not self._state.adding:
+                    self.version += 1
+                    removed = VPS.objects.using(using).filter(pk=self.pk).get_totals()
+                super().save(*args, **kwargs)
+                VPSStats.objects.using(using).apply_changes(
+                    removed, VPSStats.get_totals([self])
+                )
+                previous_status = next(iter(removed), None)
+                if previous_status is None:
+                    VPSChange.objects.using(using).record(
+                        self.uid, VPSChange.CREATE, self.status
+                    )
+                elif previous_status != self.status:
+                    VPSChange.objects.using(using).record(
+                        self.uid, VPSChange.STATUS, self.status
+                    )
+        except DatabaseError:
+            # Транзакция откачена: состояние объекта возвращается к исходному,
+            # чтобы повторное сохранение выполнило те же изменения
+            self._state.adding, self.version = adding, version
+            raise
+        response_cache.invalidate(using=self._state.db)
+
+    @retry_on_locked
+    def delete(self, *args, **kwargs):
+        """
+        Удаляет объект, обновляет сводку VPSStats в той же транзакции
+        и инвалидирует кэш ответов API.
+        """
+        using = kwargs.get("using") or router.db_for_write(VPS, instance=self)
+        pk = self.pk
+        try:
+            with transaction.atomic(using=using, savepoint=False):
+                removed = VPS.objects.using(using).filter(pk=pk).get_totals()
+                deleted = super().delete(*args, **kwargs)
+                VPSStats.objects.using(using).apply_changes(removed=removed)
+        except DatabaseError:
+            # Транзакция откачена: объекту возвращается первичный ключ,
+            # сброшенный при удалении
+            self.pk = pk
+            raise
+        response_cache.invalidate(using=using)
+        return deleted
+
+    @retry_on_locked
+    def update_status(self, status, version=None):
+        """
+        Записывает в БД только новый статус и увеличивает версию объекта
+        (см. VPSQuerySet.set_status_versions); новая версия объекта
+        читается из БД тем же UPDATE. Если передана версия, изменение выполняется только при её совпадении
+        с текущей версией в БД (оптимистичная блокировка).
+        Запись статуса в той же транзакции добавляется в журнал VPSChange.
+        Если сервер уже в этом статусе, ни версия, ни журнал не меняются.
+
+        :param status: Новый статус
+        :param version: Ожидаемая версия объекта или None
+        :return: True, если статус записан или уже был таким, иначе False
+        """
+        using = router.db_for_write(VPS, instance=self)
+        queryset = VPS.objects.using(using).filter(uid=self.uid)
+        if version is not None:
+            queryset = queryset.filter(version=version)
+        updated_at = timezone.now()
+        # Новая версия читается из БД: объект мог устареть после чужой записи
+        versions = queryset.set_status_versions(status, updated_at=updated_at)
+        if not versions:
+            # Статус не изменился или версия не совпала
+            current = queryset.filter(status=status).values("version", "updated_at")
+            current = current.first()
+            if current is None:
+                return False
+            updated_at = current["updated_at"]
+            versions = {self.uid: current["version"]}
+        self.status = status
+        self.updated_at = updated_at
+        self.version = versions[self.uid]
+        return True
+
+    async def aupdate_status(self, status, version=None):
+        """
+        Асинхронный вариант update_status.
+
+        :param status: Новый статус
+        :param version: Ожидаемая версия объекта или None
+        :return: True, если объект изменён, иначе False
+        """
+        return await sync_to_async(self.update_status)(status, version=version)
+
+    @property
+    def etag(self):
+        """
+        Возвращает ETag текущей версии объекта.
+
+        :return: Строка вида '"<version>"'
+        """
+        return f'"{self.version}"'
+
     def __str__(self):
         """
         Возвращает строковое представление объекта VPS.
@@ -72,4 +428,402 @@ class VPS(models.Model):
     class Meta:
         verbose_name = _("VPS")
         verbose_name_plural = _("VPSs")
-        ordering = ("-status",)
+        # Сортировка по первичному ключу обслуживается его индексом,
+        # а составные индексы ниже добавляют UID как уникальный разделитель,
+        # чтобы отфильтрованные выборки тоже не требовали сортировки.
+        ordering = ("uid",)
+        indexes = [
+            models.Index(fields=["status", "uid"], name="vps_status_uid_idx"),
+            models.Index(fields=["cpu", "uid"], name="vps_cpu_uid_idx"),
+            models.Index(fields=["ram", "uid"], name="vps_ram_uid_idx"),
+            models.Index(fields=["hdd", "uid"], name="vps_hdd_uid_idx"),
+        ]
+
+
+class VPSStatsQuerySet(models.QuerySet):
+    """
+    QuerySet сводки VPSStats.
+    """
+
+    def apply_changes(self, removed=None, added=None):
+        """
+        Вычитает из сводки итоги удалённых серверов и прибавляет итоги
+        добавленных одним UPDATE. Недостающие строки сводки создаются.
+
+        :param removed: Итоги по статусам до изменения
+        :param added: Итоги по статусам после изменения
+        """
+        deltas = {}
+        for totals, sign in ((removed or {}, -1), (added or {}, 1)):
+            for status, values in totals.items():
+                delta = deltas.setdefault(
+                    status, dict.fromkeys(VPSStats.TOTAL_FIELDS, 0)
+                )
+                for field in VPSStats.TOTAL_FIELDS:
+                    delta[field] += sign * values[field]
+        deltas = {
+            status: delta for status, delta in deltas.items() if any(delta.values())
+        }
+        if not deltas:
+            return
+
+        updated = self.filter(status__in=deltas).update(
+            **{
+                field: F(field)
+                + Case(
+                    *(
+                        When(status=status, then=Value(delta[field]))
+                        for status, delta in deltas.items()
+                    ),
+                    default=Value(0),
+                )
+                for field in VPSStats.TOTAL_FIELDS
+            }
+        )
+        if updated < len(deltas):
+            existing = set(
+                self.filter(status__in=deltas).values_list("status", flat=True)
+            )
+            self.bulk_create(
+                VPSStats(status=status, **delta)
+                for status, delta in deltas.items()
+                if status not in existing
+            )
+
+    def get_summary(self):
+        """
+        Возвращает сводку по всем статусам и общий итог.
+
+        :return: Словарь {"statuses": {статус: итоги}, "total": итоги}
+        """
+        stored = self.get_stored_totals()
+        statuses = {
+            status: stored.get(status, dict.fromkeys(VPSStats.TOTAL_FIELDS, 0))
+            for status, _label in VPS.STATUS_CHOICES
+        }
+        return {
+            "statuses": statuses,
+            "total": VPSStats.merge_totals(statuses, "total")["total"],
+        }
+
+    def get_stored_totals(self):
+        """
+        Возвращает итоги, записанные в сводке.
+
+        :return: Словарь {статус: итоги}
+        """
+        return {
+            row["status"]: {field: row[field] for field in VPSStats.TOTAL_FIELDS}
+            for row in self.values("status", *VPSStats.TOTAL_FIELDS)
+        }
+
+    def rebuild(self):
+        """
+        Пересчитывает сводку по таблице VPS одним GROUP BY.
+
+        :return: Словарь расхождений {статус: (было, стало)} до пересчёта
+        """
+        with transaction.atomic(using=self.db):
+            differences = self.get_differences()
+            actual = VPS.objects.using(self.db).get_totals()
+            empty = dict.fromkeys(VPSStats.TOTAL_FIELDS, 0)
+            self.all().delete()
+            self.bulk_create(
+                VPSStats(status=status, **actual.get(status, empty))
+                for status, _label in VPS.STATUS_CHOICES
+            )
+        return differences
+
+    def get_differences(self):
+        """
+        Сравнивает сводку с итогами, посчитанными по таблице VPS.
+
+        :return: Словарь расхождений {статус: (в сводке, фактически)}
+        """
+        actual = VPS.objects.using(self.db).get_totals()
+        stored = self.get_stored_totals()
+        empty = dict.fromkeys(VPSStats.TOTAL_FIELDS, 0)
+        return {
+            status: (stored.get(status, empty), actual.get(status, empty))
+            for status in sorted(set(stored) | set(actual))
+            if stored.get(status, empty) != actual.get(status, empty)
+        }
+
+
+class VPSStats(models.Model):
+    """
+    Сводка по серверам VPS в разрезе статусов: количество серверов
+    и суммарные CPU, RAM и HDD. Обновляется в той же транзакции, что и
+    каждая запись в таблицу VPS, поэтому чтение сводки не зависит
+    от размера парка серверов.
+    """
+
+    TOTAL_FIELDS = ("servers", "cpu", "ram", "hdd")
+    TRACKED_FIELDS = {"status", "cpu", "ram", "hdd"}  # Поля VPS, влияющие на сводку
+
+    status = models.CharField(
+        verbose_name=_("Status"),
+        max_length=10,
+        primary_key=True,
+        choices=VPS.STATUS_CHOICES,
+    )
+    servers = models.BigIntegerField(verbose_name=_("Servers"), default=0)
+    cpu = models.BigIntegerField(verbose_name=_("CPU"), default=0)
+    ram = models.BigIntegerField(verbose_name=_("RAM (Gb)"), default=0)
+    hdd = models.BigIntegerField(verbose_name=_("HDD (Gb)"), default=0)
+
+    objects = VPSStatsQuerySet.as_manager()
+
+    @classmethod
+    def get_totals(cls, instances):
+        """
+        Считает итоги по статусам для объектов VPS в памяти.
+
+        :param instances: Объекты VPS
+        :return: Словарь {статус: {"servers": ..., "cpu": ..., "ram": ..., "hdd": ...}}
+        """
+        totals = {}
+        for instance in instances:
+            values = totals.setdefault(
+                instance.status, dict.fromkeys(cls.TOTAL_FIELDS, 0)
+            )
+            values["servers"] += 1
+            values["cpu"] += instance.cpu
+            values["ram"] += instance.ram
+            values["hdd"] += instance.hdd
+        return totals
+
+    @classmethod
+    def merge_totals(cls, totals, status):
+        """
+        Складывает итоги всех статусов в итог одного статуса.
+
+        :param totals: Итоги по статусам
+        :param status: Статус, к которому относится сумма
+        :return: Словарь {статус: суммарные итоги}
+        """
+        if not totals:
+            return {}
+        return {
+            status: {
+                field: sum(values[field] for values in totals.values())
+                for field in cls.TOTAL_FIELDS
+            }
+        }
+
+    def __str__(self):
+        """
+        Возвращает строковое представление строки сводки.
+
+        :return: Строка вида "<status>: <servers> servers"
+        """
+        return f"{self.status}: {self.servers} servers"
+
+    class Meta:
+        verbose_name = _("VPS statistics")
+        verbose_name_plural = _("VPS statistics")
+        ordering = ("status",)
+
+
+class VPSChangeQuerySet(models.QuerySet):
+    """
+    QuerySet журнала изменений VPS.
+    """
+
+    def record(self, uid, action, status):
+        """
+        Добавляет запись в журнал. Ожидающие клиенты ленты изменений
+        текущего процесса оповещаются после фиксации транзакции.
+
+        :param uid: UID сервера
+        :param action: Вид изменения (VPSChange.CREATE или VPSChange.STATUS)
+        :param status: Статус сервера после изменения
+        :return: Созданная запись
+        """
+        change = self.create(uid=uid, action=action, status=status)
+        transaction.on_commit(lambda: change_notifier.notify(change.seq), using=self.db)
+        return change
+
+    def record_many(self, changes):
+        """
+        Добавляет записи в журнал пакетными INSERT (для массовых операций
+        VPSQuerySet). Ожидающие клиенты оповещаются один раз после фиксации
+        транзакции.
+
+        :param changes: Итерируемое кортежей (UID, вид изменения, статус)
+        :return: Список созданных записей
+        """
+        created = self.bulk_create(
+            VPSChange(uid=uid, action=action, status=status)
+            for uid, action, status in changes
+        )
+        if created:
+            # Без RETURNING в INSERT номера записей не известны
+            seq = created[-1].seq or self.get_last_seq()
+            transaction.on_commit(lambda: change_notifier.notify(seq), using=self.db)
+        return created
+
+    def since(self, seq, limit):
+        """
+        Выбирает записи с номерами больше ``seq`` по индексу первичного ключа.
+
+        :param seq: Номер последней полученной клиентом записи
+        :param limit: Наибольшее количество записей
+        :return: Выборка словарей полей записей в порядке номеров
+        """
+        return (
+            self.filter(seq__gt=seq)
+            .order_by("seq")
+            .values(*VPSChange.FEED_FIELDS)[:limit]
+        )
+
+    def get_last_seq(self):
+        """
+        Возвращает номер последней записи журнала.
+
+        :return: Номер записи или 0, если журнал пуст
+        """
+        return self.aggregate(last=Max("seq"))["last"] or 0
+
+    async def aget_last_seq(self):
+        """
+        Асинхронный вариант get_last_seq.
+
+        :return: Номер записи или 0, если журнал пуст
+        """
+        return (await self.aaggregate(last=Max("seq")))["last"] or 0
+
+
+class VPSChange(models.Model):
+    """
+    Журнал изменений VPS, только для добавления: создание сервера и запись
+    его статуса с монотонно возрастающим номером. Записывается в той же
+    транзакции, что и само изменение, при сохранении объекта (create,
+    VPSAdmin), в VPS.update_status (partial_update) и в массовых операциях
+    VPSQuerySet: bulk_create (batch_create, import_vps), set_status
+    и set_status_returning (bulk_status).
+
+    Номер записи - первичный ключ с AUTOINCREMENT, поэтому номера
+    не переиспользуются. SQLite выполняет пишущие транзакции по очереди,
+    и записи фиксируются в порядке номеров: клиент, получивший запись
+    с номером N, уже не получит записей с меньшими номерами.
+    """
+
+    CREATE = "create"
+    STATUS = "status"
+    ACTION_CHOICES = (
+        (CREATE, _("Created")),
+        (STATUS, _("Status changed")),
+    )
+    FEED_FIELDS = ("seq", "uid", "action", "status", "changed_at")
+
+    seq = models.BigAutoField(verbose_name=_("Sequence number"), primary_key=True)
+    uid = models.UUIDField(verbose_name=_("UUID"), db_index=True)
+    action = models.CharField(
+        verbose_name=_("Action"), max_length=10, choices=ACTION_CHOICES
+    )
+    status = models.CharField(
+        verbose_name=_("Status"), max_length=10, choices=VPS.STATUS_CHOICES
+    )
+    changed_at = models.DateTimeField(verbose_name=_("Changed at"), auto_now_add=True)
+
+    objects = VPSChangeQuerySet.as_manager()
+
+    def __str__(self):
+        """
+        Возвращает строковое представление записи журнала.
+
+        :return: Строка вида "#<seq> <action> <UUID>: <status>"
+        """
+        return f"#{self.seq} {self.action} {self.uid}: {self.status}"
+
+    class Meta:
+        verbose_name = _("VPS change")
+        verbose_name_plural = _("VPS changes")
+        ordering = ("seq",)
+
+
+class SlowRequestQuerySet(models.QuerySet):
+    """
+    QuerySet журнала медленных запросов.
+    """
+
+    def record(self, **fields):
+        """
+        Сохраняет образец медленного запроса и удаляет самые старые образцы
+        сверх ``VPS_SLOW_REQUEST_SETTINGS["MAX_SAMPLES"]``, поэтому журнал
+        работает как кольцевой буфер ограниченного размера.
+
+        :param fields: Значения полей SlowRequest
+        :return: Созданный образец
+        """
+        sample = self.create(**fields)
+        self.filter(
+            pk__lte=sample.pk - settings.VPS_SLOW_REQUEST_SETTINGS["MAX_SAMPLES"]
+        ).delete()
+        return sample
+
+
+class SlowRequest(models.Model):
+    """
+    Образец медленного запроса к API: выполненные SQL-запросы с временем
+    выполнения и план самого медленного из них (EXPLAIN QUERY PLAN).
+    Записывается slow_request_middleware в диагностическом режиме.
+    """
+
+    created_at = models.DateTimeField(verbose_name=_("Created at"), auto_now_add=True)
+    method = models.CharField(verbose_name=_("Method"), max_length=10)
+    path = models.TextField(verbose_name=_("Path"))
+    status_code = models.PositiveSmallIntegerField(verbose_name=_("Status code"))
+    duration = models.FloatField(verbose_name=_("Duration (s)"))
+    query_count = models.PositiveIntegerField(verbose_name=_("Queries"))
+    db_time = models.FloatField(verbose_name=_("SQL time (s)"))
+    queries = models.JSONField(
+        verbose_name=_("SQL"), default=list
+    )  # [{"database", "sql", "params", "duration"}, ...]
+    slowest_sql = models.TextField(verbose_name=_("Slowest SQL"), blank=True)
+    query_plan = models.TextField(verbose_name=_("Query plan"), blank=True)
+
+    objects = SlowRequestQuerySet.as_manager()
+
+    def __str__(self):
+        """
+        Возвращает строковое представление образца.
+
+        :return: Строка вида "<method> <path> (<duration> ms)"
+        """
+        return f"{self.method} {self.path} ({self.duration * 1000:.0f} ms)"
+
+    class Meta:
+        verbose_name = _("Slow request")
+        verbose_name_plural = _("Slow requests")
+        ordering = ("-pk",)
+
+
+class VPSImport(models.Model):
+    """
+    Контрольная точка импорта VPS (manage.py import_vps ``--checkpoint``):
+    сколько записей источника обработано. Записывается в той же транзакции,
+    что и порция серверов, поэтому после сбоя импорт продолжается ровно
+    с первой несохранённой записи, без повторной вставки.
+    """
+
+    name = models.CharField(verbose_name=_("Name"), max_length=255, primary_key=True)
+    source = models.TextField(verbose_name=_("Source"))
+    records = models.BigIntegerField(verbose_name=_("Records"), default=0)
+    imported = models.BigIntegerField(verbose_name=_("Imported"), default=0)
+    invalid = models.BigIntegerField(verbose_name=_("Invalid"), default=0)
+    updated_at = models.DateTimeField(verbose_name=_("Updated at"), auto_now=True)
+
+    def __str__(self):
+        """
+        Возвращает строковое представление контрольной точки.
+
+        :return: Строка вида "<name>: <records> records"
+        """
+        return f"{self.name}: {self.records} records"
+
+    class Meta:
+        verbose_name = _("VPS import")
+        verbose_name_plural = _("VPS imports")
+        ordering = ("name",)
@@ -0,0 +1,69 @@
+import random
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+PINNED_BY_CLIENT = "client"  # Клиент недавно выполнял запись (cookie)
+PINNED_BY_WRITE = "write"  # В текущем запросе выполнена запись
+
+# Причина, по которой чтение в текущем запросе (контексте) закреплено
+# за основной БД, или None
+primary_pinned = ContextVar("primary_pinned", default=None)
+
+
+def pin_to_primary(reason=PINNED_BY_WRITE):
+    """
+    Закрепляет чтение в текущем контексте за основной БД.
+
+    :param reason: Причина закрепления
+    """
+    primary_pinned.set(reason)
+
+
+def reads_from_primary():
+    """
+    Проверяет, читает ли текущий контекст из основной БД: реплики
+    не настроены или чтение закреплено за основной БД.
+    """
+    return not settings.VPS_DB_ROUTING_SETTINGS["REPLICAS"] or bool(
+        primary_pinned.get()
+    )
+
+
+class PrimaryReplicaRouter:
+    """
+    Маршрутизатор БД: запись - в основную БД (``default``), чтение -
+    в случайную реплику из ``VPS_DB_ROUTING_SETTINGS["REPLICAS"]``.
+
+    Чтение собственных записей: после первой записи (и в запросах
+    с небезопасными методами) чтение до конца запроса выполняется
+    из основной БД; ещё ``STICKY_SECONDS`` секунд клиента закрепляет за
+    основной БД cookie, которую выставляет primary_pinning_middleware.
+    Без настроенных реплик все запросы идут в основную БД.
+    """
+
+    def db_for_read(self, model, **hints):
+        """
+        Возвращает БД для чтения: основную, если чтение закреплено за ней,
+        иначе случайную реплику.
+        """
+        if reads_from_primary():
+            return DEFAULT_DB_ALIAS
+        return random.choice(settings.VPS_DB_ROUTING_SETTINGS["REPLICAS"])
+
+    def db_for_write(self, model, **hints):
+        """
+        Возвращает основную БД и закрепляет за ней последующее чтение.
+        """
+        pin_to_primary()
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """
+        Разрешает связи между объектами из основной БД и её реплик.
+        """
+        databases = {DEFAULT_DB_ALIAS, *settings.VPS_DB_ROUTING_SETTINGS["REPLICAS"]}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
@@ -0,0 +1,119 @@
+import uuid
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from api.models import VPS
+
+
+class VPSAdminTestCase(TestCase):
+    """
+    Тесты списка серверов в админке.
+    """
+
+    def setUp(self):
+        """
+        Создаёт серверы и входит суперпользователем.
+        """
+        self.client.force_login(User.objects.create_superuser("admin"))
+        self.changelist = reverse("admin:api_vps_changelist")
+        self.servers = VPS.objects.bulk_create(
+            VPS(
+                uid=uuid.UUID(uid),
+                cpu=cpu,
+                ram=ram,
+                hdd=100,
+                status=status,
+            )
+            for uid, cpu, ram, status in (
+                ("1a2b0000-0000-4000-8000-000000000001", 8, 16, "started"),
+                ("1a2c0000-0000-4000-8000-000000000002", 4, 4, "started"),
+                ("ff000000-0000-4000-8000-000000000003", 40, 64, "stopped"),
+            )
+        )
+
+    def get_changelist(self, params=None):
+        """
+        Запрашивает список серверов.
+
+        :return: ChangeList ответа и SQL-запросы к таблице VPS
+        """
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(self.changelist, params or {})
+        self.assertEqual(response.status_code, 200)
+        queries = [
+            query["sql"]
+            for query in context.captured_queries
+            if '"api_vps"' in query["sql"]
+        ]
+        return response.context["cl"], queries
+
+    def get_uids(self, params):
+        """
+        Возвращает UID серверов списка в порядке вывода.
+        """
+        cl, _queries = self.get_changelist(params)
+        return [str(vps.uid) for vps in cl.result_list]
+
+    def test_count_from_stats(self):
+        """
+        Без фильтров и с фильтром по статусу количество берётся из сводки
+        VPSStats: к таблице VPS выполняется только запрос страницы.
+        """
+        for params, expected in (({}, 3), ({"status__exact": "started"}, 2)):
+            with self.subTest(params=params):
+                cl, queries = self.get_changelist(params)
+                self.assertEqual(cl.result_count, expected)
+                self.assertEqual(len(cl.result_list), expected)
+                self.assertEqual(len(queries), 1)
+                self.assertNotIn("COUNT(", queries[0])
+
+    @override_settings(VPS_ADMIN_SETTINGS={"COUNT_LIMIT": 2})
+    def test_count_limit(self):
+        """
+        С прочими фильтрами считается не больше COUNT_LIMIT строк.
+        """
+        cl, queries = self.get_changelist({"ram": "2-8", "q": ""})
+        self.assertEqual(cl.result_count, 1)
+        cl, queries = self.get_changelist({"hdd": "5-100"})
+        self.assertEqual(cl.result_count, 2)
+        self.assertIn("LIMIT 2", queries[0])
+
+    def test_search(self):
+        """
+        Поиск по полному UID и по его началу в любом регистре, с дефисами
+        и без них; строка, которая не может быть началом UID, ничего
+        не находит.
+        """
+        first, second, _third = (str(vps.uid) for vps in self.servers)
+        for term, expected in (
+            (first, [first]),
+            (first.replace("-", "").upper(), [first]),
+            ("1A2", [first, second]),
+            ("1a2b-00", [first]),
+            ("1a2g", []),
+            ("0", []),
+        ):
+            with self.subTest(term=term):
+                self.assertEqual(self.get_uids({"q": term}), expected)
+        cl, queries = self.get_changelist({"q": "1a2"})
+        self.assertNotIn("LIKE", queries[0])
+        self.assertIn("BETWEEN", queries[0])
+
+    def test_resource_filters(self):
+        """
+        Фильтры по диапазонам ресурсов; без фильтра по статусу список
+        сортируется по ресурсу в порядке индекса (ресурс, uid).
+        """
+        first, second, third = (str(vps.uid) for vps in self.servers)
+        self.assertEqual(self.get_uids({"cpu": "2-4"}), [second])
+        self.assertEqual(self.get_uids({"cpu": "33-"}), [third])
+        self.assertEqual(self.get_uids({"ram": "2-32"}), [second, first])
+        self.assertEqual(
+            self.get_uids({"ram": "2-32", "status__exact": "started"}),
+            [first, second],
+        )
+        self.assertEqual(self.get_uids({"hdd": "x-"}), [])
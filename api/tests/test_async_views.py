@@ -0,0 +1,293 @@
+import io
+import json
+import uuid
+from unittest import mock, skipIf
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+
+from api.cache import response_cache
+from api.models import VPS, VPSStats
+from api.v1 import async_views
+from api.v1.async_views import VPSAsyncDetailView, VPSAsyncListView
+from api.v1.parsers import MessagePackParser
+from api.v1.renderers import MessagePackRenderer, msgpack
+
+
+class VPSAsyncViewsTestCase(TestCase):
+    """
+    Тесты асинхронных представлений VPS, обслуживающих запросы под ASGI.
+    """
+
+    def setUp(self):
+        """
+        Очищает кэш и создаёт тестовые серверы.
+        """
+        cache.clear()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        VPS.objects.create(cpu=4, ram=16, hdd=200, status="stopped")
+        self.list_vps = reverse("vps-list")
+        self.detail_vps = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+
+    async def test_routed_to_async_views(self):
+        """
+        Запросы ASGI-обработчика попадают в асинхронные представления.
+        """
+        response = await self.async_client.get(self.list_vps)
+        self.assertIs(response.resolver_match.func.view_class, VPSAsyncListView)
+        response = await self.async_client.get(self.detail_vps)
+        self.assertIs(response.resolver_match.func.view_class, VPSAsyncDetailView)
+
+    async def test_list_matches_sync(self):
+        """
+        Асинхронный список совпадает со списком VPSViewSet, включая фильтры
+        и заголовки условного GET.
+        """
+        for params in (
+            {},
+            {"status": "started"},
+            {"cpu_min": 4, "limit": 1},
+            {"fields": "status,hdd"},
+        ):
+            with self.subTest(params=params):
+                await cache.aclear()
+                response = await self.async_client.get(self.list_vps, params)
+                await self.clear_responses()
+                expected = await self.sync_get(self.list_vps, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json(), expected.json())
+                self.assertEqual(response["ETag"], expected["ETag"])
+
+    async def test_list_pagination(self):
+        """
+        Курсор следующей страницы ведёт на оставшиеся серверы.
+        """
+        first = (await self.async_client.get(self.list_vps, {"limit": 1})).json()
+        self.assertIsNone(first["prev"])
+        second = (await self.async_client.get(first["next"])).json()
+        uids = [server["uid"] for server in first["servers"] + second["servers"]]
+        self.assertEqual(
+            uids,
+            [str(uid) async for uid in VPS.objects.values_list("uid", flat=True)],
+        )
+        self.assertIsNone(second["next"])
+
+    async def test_list_invalid_filter(self):
+        """
+        Некорректный фильтр возвращает 400.
+        """
+        response = await self.async_client.get(self.list_vps, {"status": "reserved"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json())
+
+    async def test_retrieve_not_modified(self):
+        """
+        Сервер отдаётся с ETag, повторный запрос с If-None-Match получает 304.
+        """
+        response = await self.async_client.get(self.detail_vps)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["uid"], str(self.vps.uid))
+        response = await self.async_client.get(
+            self.detail_vps, headers={"If-None-Match": response["ETag"]}
+        )
+        self.assertEqual(response.status_code, 304)
+
+    async def test_retrieve_fields(self):
+        """
+        Параметр fields ограничивает поля ответа, как у VPSViewSet.
+        """
+        response = await self.async_client.get(self.detail_vps, {"fields": "cpu"})
+        self.assertEqual(response.json(), {"uid": str(self.vps.uid), "cpu": 8})
+        response = await self.async_client.get(self.detail_vps, {"fields": "x"})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_retrieve_not_found(self):
+        """
+        Несуществующий сервер возвращает 404.
+        """
+        response = await self.async_client.get(
+            reverse("vps-detail", kwargs={"uid": uuid.uuid4()})
+        )
+        self.assertEqual(response.status_code, 404)
+        self.assertIn("detail", response.json())
+
+    async def test_create(self):
+        """
+        Создание сервера сохраняет его и обновляет сводку.
+        """
+        response = await self.async_client.post(
+            self.list_vps,
+            {"cpu": 2, "ram": 4, "hdd": 10, "status": "blocked"},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await VPS.objects.filter(uid=response.json()["uid"]).aexists())
+        stats = await VPSStats.objects.aget(status="blocked")
+        self.assertEqual(stats.servers, 1)
+
+    async def test_create_invalid(self):
+        """
+        Некорректные данные и повторяющийся UID возвращают 400.
+        """
+        response = await self.async_client.post(
+            self.list_vps, {"cpu": 1}, content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cpu", response.json())
+        response = await self.async_client.post(
+            self.list_vps,
+            {"uid": str(self.vps.uid), "cpu": 2, "ram": 4, "hdd": 10},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("uid", response.json())
+
+    async def test_partial_update(self):
+        """
+        Частичное обновление меняет статус и версию сервера.
+        """
+        response = await self.async_client.patch(
+            self.detail_vps,
+            {"status": "stopped"},
+            content_type="application/json",
+            headers={"If-Match": self.vps.etag},
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["status"], "stopped")
+        await self.vps.arefresh_from_db()
+        self.assertEqual(self.vps.status, "stopped")
+        self.assertEqual(response["ETag"], self.vps.etag)
+
+    async def test_partial_update_precondition_failed(self):
+        """
+        Устаревший ETag в If-Match возвращает 412 без изменения сервера.
+        """
+        response = await self.async_client.patch(
+            self.detail_vps,
+            {"status": "stopped"},
+            content_type="application/json",
+            headers={"If-Match": '"100"'},
+        )
+        self.assertEqual(response.status_code, 412)
+        await self.vps.arefresh_from_db()
+        self.assertEqual(self.vps.status, "started")
+
+    async def clear_responses(self):
+        """
+        Очищает кэш ответов, сохраняя поколение данных, от которого
+        зависит ETag списка.
+        """
+        generation = await response_cache.aget_generation()
+        await cache.aclear()
+        await cache.aset(response_cache.generation_key, generation, None)
+
+    async def sync_get(self, path, params):
+        """
+        Выполняет GET через синхронный (WSGI) клиент.
+        """
+        return await sync_to_async(self.client.get)(path, params)
+
+
+@skipIf(msgpack is None, "msgpack is not installed")
+class VPSAsyncMessagePackTestCase(TestCase):
+    """
+    Тесты формата MessagePack в асинхронных представлениях VPS: формат
+    выбирается так же, как в VPSViewSet.
+    """
+
+    def setUp(self):
+        """
+        Очищает кэш и создаёт тестовый сервер.
+        """
+        cache.clear()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+
+    async def request(self, method, url, data=None, **params):
+        """
+        Выполняет запрос с телом и ответом в формате MessagePack.
+
+        :return: Ответ и его разобранное тело
+        """
+        kwargs = {"headers": {"Accept": MessagePackRenderer.media_type}}
+        if data is not None:
+            kwargs["data"] = MessagePackRenderer().render(data)
+            kwargs["content_type"] = MessagePackRenderer.media_type
+        elif params:
+            kwargs["data"] = params
+        response = await getattr(self.async_client, method)(url, **kwargs)
+        self.assertEqual(response["Content-Type"], MessagePackRenderer.media_type)
+        self.assertIn("Accept", response["Vary"])
+        return response, MessagePackParser().parse(io.BytesIO(response.content))
+
+    async def test_read(self):
+        """
+        Список, сервер и лента изменений в MessagePack совпадают с JSON.
+        """
+        for url, params in (
+            (reverse("vps-list"), {}),
+            (reverse("vps-detail", kwargs={"uid": self.vps.uid}), {}),
+            (reverse("vps-changes"), {"since": 0}),
+        ):
+            with self.subTest(url=url):
+                await cache.aclear()
+                _, data = await self.request("get", url, **params)
+                response = await self.async_client.get(url, params)
+                self.assertIn("Accept", response["Vary"])
+                self.assertEqual(
+                    json.loads(JSONRenderer().render(data)), response.json()
+                )
+
+    async def test_write(self):
+        """
+        Создание и частичное обновление принимают тело в MessagePack,
+        в том числе UID в расширении UUID.
+        """
+        uid = uuid.uuid4()
+        response, data = await self.request(
+            "post",
+            reverse("vps-list"),
+            {"uid": uid, "cpu": 4, "ram": 17, "hdd": 100, "status": "stopped"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((data["uid"], data["ram"]), (uid, 16))
+
+        response, data = await self.request(
+            "patch", reverse("vps-detail", kwargs={"uid": uid}), {"status": "blocked"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(data["status"], "blocked")
+
+    async def test_errors(self):
+        """
+        Ошибки выводятся в запрошенном формате, повреждённое тело - 400.
+        """
+        response, data = await self.request("post", reverse("vps-list"), {"cpu": 1})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("cpu", data)
+        response = await self.async_client.post(
+            reverse("vps-list"),
+            b"\xc1",
+            content_type=MessagePackRenderer.media_type,
+        )
+        self.assertEqual(response.status_code, 400)
+
+    async def test_without_msgpack(self):
+        """
+        Без пакета msgpack формат не предлагается: 406 и 415.
+        """
+        with mock.patch.object(async_views, "msgpack", None):
+            response = await self.async_client.get(
+                reverse("vps-list"),
+                headers={"Accept": MessagePackRenderer.media_type},
+            )
+            self.assertEqual(response.status_code, 406)
+            self.assertIn("detail", response.json())
+            response = await self.async_client.post(
+                reverse("vps-list"),
+                MessagePackRenderer().render({"cpu": 4}),
+                content_type=MessagePackRenderer.media_type,
+            )
+            self.assertEqual(response.status_code, 415)
@@ -0,0 +1,232 @@
+import json
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils.http import parse_http_date
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+
+from api.cache import response_cache
+from api.models import VPS
+from api.v1.serializers import VPSSerializer
+
+
+class VPSResponseCacheTestCase(TestCase):
+    """
+    Тесты кэша ответов списка и получения VPS.
+    """
+
+    def setUp(self):
+        """
+        Очищает кэш и создаёт тестовый сервер.
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        self.list_vps = reverse("vps-list")
+        self.detail_vps = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+
+    def test_list_cached(self):
+        """
+        Повторный запрос списка отдаётся из кэша без запросов к БД.
+        """
+        stats = response_cache.get_stats()
+        first = self.client.get(self.list_vps, {"status": "started", "cpu": 8})
+        with self.assertNumQueries(0):
+            second = self.client.get(self.list_vps, {"cpu": 8, "status": "started"})
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(
+            response_cache.get_stats(),
+            {"hits": stats["hits"] + 1, "misses": stats["misses"] + 1},
+        )
+
+    @override_settings(ALLOWED_HOSTS=["testserver", "api.example.com"])
+    def test_list_keyed_by_host(self):
+        """
+        Ссылки на соседние страницы из кэша построены для схемы и хоста
+        самого запроса.
+        """
+        VPS.objects.create(cpu=4, ram=16, hdd=200, status="stopped")
+        first = self.client.get(self.list_vps, {"limit": 1})
+        self.assertTrue(first.json()["next"].startswith("http://testserver/"))
+        second = self.client.get(
+            self.list_vps, {"limit": 1}, HTTP_HOST="api.example.com", secure=True
+        )
+        self.assertTrue(second.json()["next"].startswith("https://api.example.com/"))
+        self.assertEqual(first.json()["servers"], second.json()["servers"])
+
+    @override_settings(
+        VPS_DB_ROUTING_SETTINGS={
+            "REPLICAS": ["default"],
+            "STICKY_SECONDS": 5,
+            "COOKIE_NAME": "vps_primary",
+        }
+    )
+    def test_primary_pinned_read(self):
+        """
+        После записи клиент, закреплённый за основной БД, не получает ответ,
+        закэшированный при чтении из реплики.
+        """
+        writer = APIClient()
+        response = writer.patch(self.detail_vps, {"status": "blocked"})
+        self.assertIn("vps_primary", response.cookies)
+        # Ответ, закэшированный другим клиентом при чтении из реплики
+        self.client.get(self.detail_vps)
+        with self.assertNumQueries(0):
+            self.client.get(self.detail_vps)
+
+        with self.assertNumQueries(1):
+            response = writer.get(self.detail_vps)
+        self.assertEqual(response.json()["status"], "blocked")
+        with self.assertNumQueries(0):
+            writer.get(self.detail_vps)
+
+    def test_list_validators(self):
+        """
+        Валидаторы списка зависят от параметров запроса и меняются после
+        записи; Last-Modified не раньше времени записи.
+        """
+        etag = self.client.get(self.list_vps)["ETag"]
+        self.assertNotEqual(
+            self.client.get(self.list_vps, {"status": "started"})["ETag"], etag
+        )
+        self.vps.update_status("stopped")
+        response = self.client.get(self.list_vps)
+        self.assertNotEqual(response["ETag"], etag)
+        self.vps.refresh_from_db()
+        self.assertGreaterEqual(
+            parse_http_date(response["Last-Modified"]),
+            int(self.vps.updated_at.timestamp()),
+        )
+
+    def test_retrieve_cached(self):
+        """
+        Повторный запрос сервера отдаётся из кэша вместе с ETag.
+        """
+        first = self.client.get(self.detail_vps)
+        with self.assertNumQueries(0):
+            second = self.client.get(self.detail_vps)
+        self.assertEqual(first.content, second.content)
+        self.assertEqual(first["ETag"], second["ETag"])
+
+    def test_errors_not_cached(self):
+        """
+        Ответы с ошибками не кэшируются.
+        """
+        self.client.get(self.list_vps, {"status": "reserved"})
+        response = self.client.get(self.list_vps, {"status": "reserved"})
+        self.assertEqual(response.status_code, 400)
+
+    def assertInvalidated(self, write):
+        """
+        Проверяет, что после записи список и сервер читаются из БД заново
+        и отражают изменения.
+
+        :param write: Функция, выполняющая запись
+        """
+        self.client.get(self.list_vps)
+        self.client.get(self.detail_vps)
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        servers = self.client.get(self.list_vps).json()["servers"]
+        self.assertEqual(
+            servers,
+            json.loads(
+                JSONRenderer().render(VPSSerializer(VPS.objects.all(), many=True).data)
+            ),
+        )
+        self.vps.refresh_from_db()
+        self.assertEqual(
+            self.client.get(self.detail_vps).json()["status"], self.vps.status
+        )
+
+    def test_invalidated_by_create(self):
+        """
+        Создание сервера инвалидирует кэш.
+        """
+        self.assertInvalidated(
+            lambda: self.client.post(
+                self.list_vps,
+                {"cpu": 4, "ram": 16, "hdd": 100, "status": "stopped"},
+                format="json",
+            )
+        )
+
+    def test_invalidated_by_batch_create(self):
+        """
+        Пакетное создание серверов инвалидирует кэш.
+        """
+        self.assertInvalidated(
+            lambda: self.client.post(
+                reverse("vps-batch-create"),
+                [{"cpu": 4, "ram": 16, "hdd": 100, "status": "stopped"}],
+                format="json",
+            )
+        )
+
+    def test_invalidated_by_partial_update(self):
+        """
+        Частичное обновление сервера инвалидирует кэш.
+        """
+        self.assertInvalidated(
+            lambda: self.client.patch(
+                self.detail_vps, {"status": "stopped"}, format="json"
+            )
+        )
+
+    def test_invalidated_by_bulk_status(self):
+        """
+        Массовая смена статуса инвалидирует кэш.
+        """
+        self.assertInvalidated(
+            lambda: self.client.post(
+                reverse("vps-bulk-status"),
+                {"status": "blocked", "uids": [str(self.vps.uid)], "return_uids": True},
+                format="json",
+            )
+        )
+
+    def test_invalidated_by_admin_save(self):
+        """
+        Сохранение сервера в админке инвалидирует кэш.
+        """
+        admin = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_login(admin)
+        self.assertInvalidated(
+            lambda: self.client.post(
+                reverse("admin:api_vps_change", args=[self.vps.uid]),
+                {
+                    "uid": str(self.vps.uid),
+                    "cpu": 16,
+                    "ram": 32,
+                    "hdd": 500,
+                    "status": "stopped",
+                },
+            )
+        )
+
+    def test_admin_save_changes_etag(self):
+        """
+        Сохранение сервера в админке меняет его ETag.
+        """
+        etag = self.client.get(self.detail_vps)["ETag"]
+        self.vps.cpu = 16
+        self.vps.save()
+        response = self.client.get(self.detail_vps, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["cpu"], 16)
+
+    def test_generation_bumped_after_commit(self):
+        """
+        Поколение меняется и при записи, и после фиксации транзакции.
+        """
+        generation = response_cache.get_generation()
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.vps.update_status("stopped")
+            in_transaction = response_cache.get_generation()
+        self.assertNotEqual(in_transaction, generation)
+        for callback in callbacks:
+            callback()
+        self.assertNotEqual(response_cache.get_generation(), in_transaction)
@@ -0,0 +1,246 @@
+import threading
+import time
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.models import User
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.changes import change_notifier
+from api.models import VPS, VPSChange
+
+STREAM_SETTINGS = {
+    "LIMIT": 1000,
+    "MAX_WAIT": 30,
+    "POLL_INTERVAL": 0.05,
+    "HEARTBEAT": 0.1,
+    "STREAM_TIMEOUT": 0.3,
+}
+
+
+class VPSChangeLogTestCase(TestCase):
+    """
+    Тесты журнала изменений VPS и ленты изменений.
+    """
+
+    def setUp(self):
+        """
+        Создаёт тестовый сервер.
+        """
+        self.client = APIClient()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        self.changes_vps = reverse("vps-changes")
+
+    def get_changes(self, **params):
+        """
+        Запрашивает ленту изменений.
+
+        :return: Тело ответа
+        """
+        response = self.client.get(self.changes_vps, params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_recorded(self):
+        """
+        Создание и смена статуса через API записываются в журнал по порядку.
+        """
+        response = self.client.post(
+            reverse("vps-list"),
+            {"cpu": 4, "ram": 16, "hdd": 100, "status": "stopped"},
+            format="json",
+        )
+        uid = response.json()["uid"]
+        self.client.patch(
+            reverse("vps-detail", kwargs={"uid": uid}),
+            {"status": "started"},
+            format="json",
+        )
+        data = self.get_changes(since=0)
+        self.assertEqual(
+            [
+                (change["uid"], change["action"], change["status"])
+                for change in data["changes"]
+            ],
+            [
+                (str(self.vps.uid), "create", "started"),
+                (uid, "create", "stopped"),
+                (uid, "status", "started"),
+            ],
+        )
+        self.assertEqual(data["last"], data["changes"][-1]["seq"])
+        self.assertEqual(self.get_changes(since=data["last"]), data | {"changes": []})
+
+    def test_bulk_recorded(self):
+        """
+        Пакетное создание и массовая смена статуса записываются в журнал,
+        ожидающие клиенты оповещаются после фиксации транзакции.
+        """
+        # Номера записей откатываются вместе с транзакцией теста
+        self.addCleanup(setattr, change_notifier, "last_seq", change_notifier.last_seq)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("vps-batch-create"),
+                [{"cpu": 2, "ram": 4, "hdd": 10, "status": "stopped"}],
+                format="json",
+            )
+        uid = response.json()["servers"][0]["uid"]
+        self.assertEqual(change_notifier.last_seq, VPSChange.objects.get_last_seq())
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                reverse("vps-bulk-status"),
+                {"uids": [str(self.vps.uid), uid], "status": "blocked"},
+                format="json",
+            )
+        self.assertEqual(change_notifier.last_seq, VPSChange.objects.get_last_seq())
+        changes = [
+            (change["uid"], change["action"], change["status"])
+            for change in self.get_changes(since=0)["changes"]
+        ]
+        self.assertEqual(
+            changes[:2],
+            [(str(self.vps.uid), "create", "started"), (uid, "create", "stopped")],
+        )
+        self.assertCountEqual(
+            changes[2:],
+            [(str(self.vps.uid), "status", "blocked"), (uid, "status", "blocked")],
+        )
+
+    def test_admin_save(self):
+        """
+        Смена статуса в админке записывается, изменение ресурсов - нет.
+        """
+        self.client.force_login(User.objects.create_superuser("admin"))
+        url = reverse("admin:api_vps_change", args=[self.vps.uid])
+        data = {"uid": str(self.vps.uid), "cpu": 16, "ram": 32, "hdd": 500}
+        self.client.post(url, data | {"status": "started"})
+        self.client.post(url, data | {"status": "blocked"})
+        self.assertEqual(
+            list(VPSChange.objects.values_list("action", "status")),
+            [("create", "started"), ("status", "blocked")],
+        )
+
+    def test_since_default(self):
+        """
+        Без since лента начинается с текущего конца журнала.
+        """
+        self.assertEqual(
+            self.get_changes(), {"changes": [], "last": VPSChange.objects.get().seq}
+        )
+
+    def test_limit(self):
+        """
+        Параметр limit ограничивает количество записей в ответе.
+        """
+        self.vps.update_status("stopped")
+        data = self.get_changes(since=0, limit=1)
+        self.assertEqual([change["action"] for change in data["changes"]], ["create"])
+        data = self.get_changes(since=data["last"], limit=1)
+        self.assertEqual([change["action"] for change in data["changes"]], ["status"])
+
+    def test_invalid_params(self):
+        """
+        Некорректные параметры отклоняются с кодом 400.
+        """
+        for params in ({"since": -1}, {"wait": 3600}, {"limit": 0}):
+            with self.subTest(params=params):
+                response = self.client.get(self.changes_vps, params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(next(iter(params)), response.json())
+
+    @override_settings(VPS_CHANGES_SETTINGS=STREAM_SETTINGS)
+    def test_event_stream(self):
+        """
+        Поток Server-Sent Events отдаёт записи после Last-Event-ID
+        и комментарии keep-alive, пока изменений нет.
+        """
+        self.vps.update_status("stopped")
+        first = VPSChange.objects.first().seq
+        response = self.client.get(
+            self.changes_vps,
+            HTTP_ACCEPT="text/event-stream",
+            HTTP_LAST_EVENT_ID=str(first),
+        )
+        self.assertEqual(response["Content-Type"], "text/event-stream; charset=utf-8")
+        content = b"".join(response.streaming_content).decode()
+        events = content.split("\n\n")
+        self.assertTrue(events[0].startswith(f"id: {first + 1}\nevent: change\ndata: "))
+        self.assertIn('"status":"stopped"', events[0])
+        self.assertIn(": keep-alive", events[1:])
+
+    @override_settings(VPS_CHANGES_SETTINGS=STREAM_SETTINGS)
+    async def test_async_view(self):
+        """
+        Асинхронная лента изменений отдаёт те же записи, что и VPSViewSet.
+        """
+        response = await self.async_client.get(self.changes_vps, {"since": 0})
+        expected = await sync_to_async(self.get_changes)(since=0)
+        self.assertEqual(response.json(), expected)
+        response = await self.async_client.get(self.changes_vps, {"format": "sse"})
+        content = b"".join([chunk async for chunk in response.streaming_content])
+        self.assertTrue(content.startswith(b": keep-alive\n\n"))
+
+
+@override_settings(VPS_CHANGES_SETTINGS={**STREAM_SETTINGS, "POLL_INTERVAL": 60})
+class VPSChangeLongPollTestCase(TransactionTestCase):
+    """
+    Тесты ожидания изменений (long-poll): запись в другом потоке будит
+    ожидающий запрос сразу после фиксации транзакции, без опроса БД.
+    """
+
+    serialized_rollback = True
+
+    def setUp(self):
+        """
+        Создаёт тестовый сервер.
+        """
+        self.client = APIClient()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+
+    def update_later(self):
+        """
+        Запускает смену статуса сервера в другом потоке через 0.1 секунды.
+
+        :return: Поток
+        """
+
+        def update():
+            time.sleep(0.1)
+            self.vps.update_status("stopped")
+
+        thread = threading.Thread(target=update)
+        thread.start()
+        self.addCleanup(thread.join)
+        return thread
+
+    def test_long_poll(self):
+        """
+        Синхронная лента возвращает изменение, не дожидаясь конца wait.
+        """
+        self.update_later()
+        started = time.monotonic()
+        response = self.client.get(reverse("vps-changes"), {"wait": 10})
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(
+            [change["status"] for change in response.json()["changes"]], ["stopped"]
+        )
+
+    async def test_async_long_poll(self):
+        """
+        Асинхронная лента возвращает изменение, не дожидаясь конца wait.
+        """
+        self.update_later()
+        started = time.monotonic()
+        response = await self.async_client.get(reverse("vps-changes"), {"wait": 10})
+        self.assertLess(time.monotonic() - started, 5)
+        self.assertEqual(
+            [change["status"] for change in response.json()["changes"]], ["stopped"]
+        )
+
+    def test_timeout(self):
+        """
+        Без изменений запрос возвращает пустую ленту по истечении wait.
+        """
+        response = self.client.get(reverse("vps-changes"), {"wait": 0.2})
+        self.assertEqual(response.json()["changes"], [])
@@ -0,0 +1,150 @@
+import gzip
+import json
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from api import compression
+from api.compression import BrotliCodec, GzipCodec, select_codec
+from api.models import VPS
+
+
+class SelectCodecTestCase(TestCase):
+    """
+    Тесты выбора кодировки ответа по заголовку Accept-Encoding.
+    """
+
+    def test_select(self):
+        """
+        Выбирается кодировка с наибольшим весом, при равных весах -
+        предпочтительная для сервера; brotli - только если пакет установлен.
+        """
+        with mock.patch.object(compression, "brotli", object()):
+            for header, expected in (
+                ("gzip, deflate, br", BrotliCodec),
+                ("gzip;q=1.0, br;q=0.5", GzipCodec),
+                ("*", BrotliCodec),
+                ("br;q=0, *", GzipCodec),
+            ):
+                with self.subTest(header=header):
+                    self.assertIsInstance(select_codec(header), expected)
+            for header in ("", "identity", "deflate", "gzip;q=0"):
+                with self.subTest(header=header):
+                    self.assertIsNone(select_codec(header))
+        with mock.patch.object(compression, "brotli", None):
+            self.assertIsInstance(select_codec("br, gzip"), GzipCodec)
+            self.assertIsNone(select_codec("br"))
+
+
+@override_settings(
+    VPS_COMPRESSION_SETTINGS={
+        "ENCODINGS": ["gzip"],
+        "MIN_SIZE": 1024,
+        "GZIP_LEVEL": 6,
+        "BROTLI_QUALITY": 4,
+        "MEDIA_TYPES": ["application/json", "application/x-ndjson", "text/csv"],
+    }
+)
+class CompressionMiddlewareTestCase(TestCase):
+    """
+    Тесты сжатия ответов API VPS.
+    """
+
+    def setUp(self):
+        """
+        Очищает кэш и создаёт серверы, список которых больше порога сжатия.
+        """
+        cache.clear()
+        VPS.objects.bulk_create(
+            VPS(cpu=2 + i, ram=2, hdd=5, status="started") for i in range(50)
+        )
+        self.list_vps = reverse("vps-list")
+
+    def test_compressed(self):
+        """
+        Ответ больше порога сжимается gzip, ETag становится слабым,
+        а условный GET с ним получает 304.
+        """
+        plain = self.client.get(self.list_vps)
+        response = self.client.get(self.list_vps, headers={"accept-encoding": "gzip"})
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertEqual(gzip.decompress(response.content), plain.content)
+        self.assertLess(len(response.content), len(plain.content))
+        self.assertEqual(response["ETag"], f"W/{plain['ETag']}")
+        response = self.client.get(
+            self.list_vps,
+            headers={"accept-encoding": "gzip", "if-none-match": response["ETag"]},
+        )
+        self.assertEqual(response.status_code, 304)
+
+    def test_small_response(self):
+        """
+        Ответ меньше порога не сжимается.
+        """
+        response = self.client.get(
+            reverse("vps-stats"), headers={"accept-encoding": "gzip"}
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_html_not_compressed(self):
+        """
+        HTML-страницы админки с CSRF-токеном не сжимаются.
+        """
+        self.client.force_login(User.objects.create_superuser("admin"))
+        response = self.client.get(
+            reverse("admin:api_vps_changelist"), headers={"accept-encoding": "gzip"}
+        )
+        self.assertContains(response, "csrfmiddlewaretoken")
+        self.assertGreater(len(response.content), 1024)
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_streaming(self):
+        """
+        Потоковая выгрузка сжимается по порциям.
+        """
+        response = self.client.get(
+            reverse("vps-export"), headers={"accept-encoding": "gzip"}
+        )
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        lines = gzip.decompress(b"".join(response.streaming_content)).splitlines()
+        self.assertEqual(len([json.loads(line) for line in lines]), 50)
+
+    @override_settings(
+        VPS_CHANGES_SETTINGS={
+            "LIMIT": 1000,
+            "MAX_WAIT": 30,
+            "POLL_INTERVAL": 0.05,
+            "HEARTBEAT": 0.1,
+            "STREAM_TIMEOUT": 0.1,
+        }
+    )
+    def test_event_stream(self):
+        """
+        Поток Server-Sent Events не сжимается, чтобы события не задерживались
+        в буфере компрессора.
+        """
+        response = self.client.get(
+            reverse("vps-changes"),
+            headers={"accept": "text/event-stream", "accept-encoding": "gzip"},
+        )
+        self.assertFalse(response.has_header("Content-Encoding"))
+        self.assertTrue(b"".join(response.streaming_content).startswith(b": keep"))
+
+    async def test_async_streaming(self):
+        """
+        Асинхронный поток сжимается по порциям.
+        """
+        codec = GzipCodec()
+
+        async def chunks():
+            for chunk in (b"first,", b"second"):
+                yield chunk
+
+        data = b"".join(
+            [chunk async for chunk in compression.acompress_stream(codec, chunks())]
+        )
+        self.assertEqual(gzip.decompress(data), b"first,second")
@@ -0,0 +1,175 @@
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db.utils import ConnectionHandler
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from api.db import retry_on_locked
+from api.models import VPS, VPSStats, VPSStatsQuerySet
+
+NO_BACKOFF = {"ATTEMPTS": 3, "BACKOFF": 0, "MAX_BACKOFF": 0}
+
+
+@override_settings(VPS_DB_RETRY_SETTINGS=NO_BACKOFF)
+class RetryOnLockedTestCase(SimpleTestCase):
+    """
+    Тесты повтора записей, не выполненных из-за блокировки БД.
+    """
+
+    def test_retries_locked(self):
+        """
+        Запись повторяется, пока блокировка не снята.
+        """
+        func = mock.Mock(side_effect=[OperationalError("database is locked"), "done"])
+        self.assertEqual(retry_on_locked(func)(1, key=2), "done")
+        self.assertEqual(func.call_count, 2)
+        func.assert_called_with(1, key=2)
+
+    def test_gives_up(self):
+        """
+        После исчерпания попыток ошибка передаётся вызывающему коду.
+        """
+        func = mock.Mock(side_effect=OperationalError("database is locked"))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)()
+        self.assertEqual(func.call_count, NO_BACKOFF["ATTEMPTS"])
+
+    def test_other_errors_not_retried(self):
+        """
+        Ошибки, не связанные с блокировкой, не повторяются.
+        """
+        func = mock.Mock(side_effect=OperationalError("no such table: api_vps"))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)()
+        self.assertEqual(func.call_count, 1)
+
+
+@override_settings(VPS_DB_RETRY_SETTINGS=NO_BACKOFF)
+class RetryInTransactionTestCase(TestCase):
+    """
+    Тест того, что внутри внешней транзакции запись не повторяется.
+    """
+
+    def test_not_retried_in_transaction(self):
+        """
+        Внутри atomic-блока ошибка блокировки передаётся сразу.
+        """
+        func = mock.Mock(side_effect=OperationalError("database is locked"))
+        with self.assertRaises(OperationalError):
+            retry_on_locked(func)()
+        self.assertEqual(func.call_count, 1)
+
+
+@override_settings(VPS_DB_RETRY_SETTINGS=NO_BACKOFF)
+class VPSWriteRetryTestCase(TransactionTestCase):
+    """
+    Тесты повторов записи VPS после блокировки БД.
+    """
+
+    serialized_rollback = True
+
+    def fail_once(self):
+        """
+        Подменяет обновление сводки так, что первая попытка записи
+        завершается ошибкой блокировки.
+        """
+        apply_changes = VPSStatsQuerySet.apply_changes
+        calls = []
+
+        def side_effect(queryset, *args, **kwargs):
+            calls.append(args)
+            if len(calls) == 1:
+                raise OperationalError("database is locked")
+            return apply_changes(queryset, *args, **kwargs)
+
+        return mock.patch.object(
+            VPSStatsQuerySet, "apply_changes", autospec=True, side_effect=side_effect
+        )
+
+    def test_create_retried(self):
+        """
+        Создание сервера повторяется целиком и учитывается в сводке один раз.
+        """
+        with self.fail_once():
+            vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        self.assertEqual(VPS.objects.get(uid=vps.uid).version, 1)
+        self.assertEqual(VPSStats.objects.get_differences(), {})
+
+    def test_save_retried(self):
+        """
+        Изменение сервера повторяется, версия увеличивается один раз.
+        """
+        vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        vps.cpu = 16
+        with self.fail_once():
+            vps.save()
+        self.assertEqual(vps.version, 2)
+        self.assertEqual(VPS.objects.get(uid=vps.uid).version, 2)
+        self.assertEqual(VPSStats.objects.get_differences(), {})
+
+    def test_bulk_create_retried(self):
+        """
+        Пакетное создание из генератора повторяется со всеми объектами.
+        """
+        with self.fail_once():
+            VPS.objects.bulk_create(
+                VPS(cpu=2, ram=4, hdd=10, status="stopped") for _ in range(3)
+            )
+        self.assertEqual(VPS.objects.count(), 3)
+        self.assertEqual(VPSStats.objects.get_differences(), {})
+
+    def test_update_status_retried(self):
+        """
+        Частичное обновление статуса повторяется.
+        """
+        vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        with self.fail_once():
+            self.assertTrue(vps.update_status("stopped", version=1))
+        self.assertEqual(VPS.objects.get(uid=vps.uid).status, "stopped")
+        self.assertEqual(VPSStats.objects.get_differences(), {})
+
+
+class ProductionDatabaseProfileTestCase(SimpleTestCase):
+    """
+    Тест параметров соединения профиля БД production.
+    """
+
+    def test_pragmas(self):
+        """
+        Каждое новое соединение включает WAL и настраивает SQLite.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            profile = settings.DATABASE_PROFILES["production"]
+            connections = ConnectionHandler(
+                {"default": {**profile, "NAME": Path(directory) / "db.sqlite3"}}
+            )
+            connection = connections["default"]
+            # Соединение открывается напрямую: SimpleTestCase запрещает
+            # обращения к БД через курсоры Django
+            sqlite = connection.get_new_connection(connection.get_connection_params())
+            try:
+                pragmas = {
+                    pragma: sqlite.execute(f"PRAGMA {pragma}").fetchone()[0]
+                    for pragma in (
+                        "journal_mode",
+                        "busy_timeout",
+                        "synchronous",
+                        "cache_size",
+                    )
+                }
+            finally:
+                sqlite.close()
+        self.assertEqual(
+            pragmas,
+            {
+                "journal_mode": "wal",
+                "busy_timeout": 5000,
+                "synchronous": 1,  # NORMAL
+                "cache_size": -65536,
+            },
+        )
+        self.assertEqual(connection.transaction_mode, "IMMEDIATE")
+        self.assertGreater(profile["CONN_MAX_AGE"], 0)
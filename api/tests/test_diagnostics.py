@@ -0,0 +1,120 @@
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import VPS, SlowRequest
+
+DIAGNOSTICS = {"ENABLED": True, "THRESHOLD": 0, "MAX_SAMPLES": 2, "MAX_QUERIES": 100}
+
+
+class SlowRequestTestCase(TestCase):
+    """
+    Тесты журнала медленных запросов диагностического режима.
+    """
+
+    def setUp(self):
+        """
+        Создаёт тестовый сервер.
+        """
+        self.client = APIClient()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+
+    def test_disabled_by_default(self):
+        """
+        Без диагностического режима образцы не сохраняются.
+        """
+        self.client.get(reverse("vps-list"))
+        self.assertFalse(SlowRequest.objects.exists())
+
+    @override_settings(VPS_SLOW_REQUEST_SETTINGS=DIAGNOSTICS)
+    def test_sample(self):
+        """
+        Образец содержит SQL-запросы и план самого медленного из них.
+        """
+        with self.assertLogs("api.diagnostics", "WARNING"):
+            self.client.get(reverse("vps-list"), {"status": "started"})
+        sample = SlowRequest.objects.get()
+        self.assertEqual(
+            (sample.method, sample.path, sample.status_code),
+            ("GET", "/api/v1/vps?status=started", 200),
+        )
+        self.assertEqual(sample.query_count, len(sample.queries))
+        self.assertGreater(sample.query_count, 0)
+        self.assertIn(sample.slowest_sql, [query["sql"] for query in sample.queries])
+        self.assertIn("api_vps", sample.query_plan)
+
+    @override_settings(VPS_SLOW_REQUEST_SETTINGS={**DIAGNOSTICS, "THRESHOLD": 60})
+    def test_fast_request(self):
+        """
+        Запросы быстрее порога не сохраняются.
+        """
+        self.client.get(reverse("vps-list"))
+        self.assertFalse(SlowRequest.objects.exists())
+
+    @override_settings(VPS_SLOW_REQUEST_SETTINGS=DIAGNOSTICS)
+    def test_ring_buffer(self):
+        """
+        Хранятся только последние MAX_SAMPLES образцов.
+        """
+        with self.assertLogs("api.diagnostics", "WARNING"):
+            for cpu in (2, 4, 8):
+                self.client.get(reverse("vps-list"), {"cpu": cpu})
+        self.assertEqual(
+            list(SlowRequest.objects.values_list("path", flat=True)),
+            ["/api/v1/vps?cpu=8", "/api/v1/vps?cpu=4"],
+        )
+
+    @override_settings(VPS_SLOW_REQUEST_SETTINGS=DIAGNOSTICS)
+    def test_record_failure(self):
+        """
+        Ошибка записи образца в БД не ломает ответ и пишется в журнал.
+        """
+        with (
+            mock.patch(
+                "api.middleware.record_slow_request",
+                side_effect=DatabaseError("database is locked"),
+            ),
+            self.assertLogs("api.middleware", "ERROR") as logs,
+        ):
+            response = self.client.get(reverse("vps-list"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["servers"][0]["uid"], str(self.vps.uid))
+        self.assertIn("Failed to record slow request GET /api/v1/vps", logs.output[0])
+
+    @override_settings(VPS_SLOW_REQUEST_SETTINGS=DIAGNOSTICS)
+    async def test_record_failure_async(self):
+        """
+        Под ASGI ошибка записи образца тоже не ломает ответ.
+        """
+        with (
+            mock.patch(
+                "api.middleware.record_slow_request",
+                side_effect=DatabaseError("database is locked"),
+            ),
+            self.assertLogs("api.middleware", "ERROR"),
+        ):
+            response = await self.async_client.get(reverse("vps-list"))
+        self.assertEqual(response.status_code, 200)
+
+    @override_settings(VPS_SLOW_REQUEST_SETTINGS=DIAGNOSTICS)
+    def test_admin(self):
+        """
+        Образцы доступны в админке только для просмотра.
+        """
+        with self.assertLogs("api.diagnostics", "WARNING"):
+            self.client.get(reverse("vps-detail", kwargs={"uid": self.vps.uid}))
+        sample = SlowRequest.objects.get()
+        self.client.force_login(User.objects.create_superuser("admin"))
+        with self.settings(VPS_SLOW_REQUEST_SETTINGS={**DIAGNOSTICS, "ENABLED": False}):
+            response = self.client.get(reverse("admin:api_slowrequest_changelist"))
+            self.assertContains(response, sample.path)
+            response = self.client.get(
+                reverse("admin:api_slowrequest_change", args=[sample.pk])
+            )
+            self.assertContains(response, "api_vps")
+            response = self.client.get(reverse("admin:api_slowrequest_add"))
+            self.assertEqual(response.status_code, 403)
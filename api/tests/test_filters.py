@@ -55,3 +55,67 @@ class VPSFilterTestCase(TestCase):
         self.assertEqual(
             filter_set.qs.count(), 0
         )  # Исправлено, результат должен быть пустым
+
+    def test_filter_by_range(self):
+        """
+        Тест фильтрации по диапазонам ресурсов.
+        Проверяется, что границы ``_min``/``_max`` включаются в выборку.
+        """
+        queryset = VPS.objects.all()
+        filter_set = VPSFilter({"ram_min": 16, "ram_max": 32}, queryset=queryset)
+        self.assertEqual(filter_set.qs.count(), 2)
+        filter_set = VPSFilter({"cpu_min": 8, "hdd_max": 500}, queryset=queryset)
+        self.assertEqual(filter_set.qs.count(), 1)
+
+    def test_filter_by_status_in(self):
+        """
+        Тест фильтрации по нескольким статусам, перечисленным через запятую.
+        """
+        queryset = VPS.objects.all()
+        filter_set = VPSFilter({"status__in": "started,stopped"}, queryset=queryset)
+        self.assertEqual(filter_set.qs.count(), 3)
+        filter_set = VPSFilter({"status__in": "stopped,blocked"}, queryset=queryset)
+        self.assertEqual(filter_set.qs.count(), 1)
+
+    def test_filter_by_status_in_with_error_value(self):
+        """
+        Тест фильтрации по нескольким статусам с недопустимым значением.
+        """
+        queryset = VPS.objects.all()
+        filter_set = VPSFilter({"status__in": "started,reserved"}, queryset=queryset)
+        self.assertFalse(filter_set.is_valid())
+        self.assertIn("status__in", filter_set.errors)
+        self.assertEqual(filter_set.qs.count(), 0)
+
+    def test_combined_filters_single_query(self):
+        """
+        Тест того, что комбинация фильтров выполняется одним SQL-запросом.
+        """
+        queryset = VPS.objects.all()
+        filter_set = VPSFilter(
+            {
+                "status__in": "started,stopped",
+                "cpu_min": 4,
+                "cpu_max": 16,
+                "ram_min": 16,
+                "hdd_max": 1000,
+            },
+            queryset=queryset,
+        )
+        with self.assertNumQueries(1):
+            self.assertEqual(len(filter_set.qs), 3)
+
+    def test_filter_by_uid(self):
+        """
+        Тест фильтрации по одному или нескольким UID через запятую.
+        """
+        queryset = VPS.objects.all()
+        first, second = VPS.objects.order_by("cpu")[:2]
+        filter_set = VPSFilter({"uid": str(first.uid)}, queryset=queryset)
+        self.assertEqual(list(filter_set.qs), [first])
+        filter_set = VPSFilter(
+            {"uid": f"{first.uid},{second.uid}"}, queryset=queryset.order_by("cpu")
+        )
+        self.assertEqual(list(filter_set.qs), [first, second])
+        filter_set = VPSFilter({"uid": "not-a-uuid"}, queryset=queryset)
+        self.assertIn("uid", filter_set.errors)
@@ -0,0 +1,219 @@
+import json
+import tempfile
+import uuid
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import CommandError, call_command
+from django.db import DatabaseError
+from django.test import TestCase
+
+from api.imports import ImportCheckpoint
+from api.models import VPS, VPSChange, VPSImport, VPSStats
+
+UID = "123e4567-e89b-12d3-a456-426614174000"
+
+
+class ImportVPSCommandTestCase(TestCase):
+    """
+    Тесты команды import_vps.
+    """
+
+    def setUp(self):
+        """
+        Создаёт временный каталог для входных файлов.
+        """
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def write(self, name, lines):
+        """
+        Записывает входной файл.
+
+        :return: Путь к файлу
+        """
+        path = self.directory / name
+        path.write_text("".join(f"{line}\n" for line in lines), encoding="utf-8")
+        return str(path)
+
+    def write_ndjson(self, records):
+        """
+        Записывает записи в файл NDJSON.
+
+        :return: Путь к файлу
+        """
+        return self.write(
+            "vps.ndjson",
+            [
+                record if isinstance(record, str) else json.dumps(record)
+                for record in records
+            ],
+        )
+
+    def import_vps(self, *args):
+        """
+        Выполняет команду.
+
+        :return: Вывод stdout и stderr
+        """
+        stdout, stderr = StringIO(), StringIO()
+        call_command("import_vps", *args, stdout=stdout, stderr=stderr)
+        return stdout.getvalue(), stderr.getvalue()
+
+    def test_csv(self):
+        """
+        Импорт CSV: нечётный RAM округляется вниз, пустой статус заменяется
+        статусом по умолчанию, UID из файла сохраняется, сводка и журнал
+        изменений обновляются.
+        """
+        path = self.write(
+            "vps.csv",
+            ["uid,cpu,ram,hdd,status", ",4,17,100,started", f"{UID},2,2.0,5,"],
+        )
+        stdout, stderr = self.import_vps(path)
+        self.assertEqual(stderr, "")
+        self.assertIn("Imported 2 servers", stdout)
+        self.assertEqual(
+            sorted(VPS.objects.values_list("cpu", "ram", "hdd", "status")),
+            [(2, 2, 5, "blocked"), (4, 16, 100, "started")],
+        )
+        self.assertTrue(VPS.objects.filter(uid=uuid.UUID(UID)).exists())
+        self.assertEqual(VPSStats.objects.get_summary()["total"]["servers"], 2)
+        self.assertCountEqual(
+            VPSChange.objects.values_list("uid", "action"),
+            [
+                (uid, VPSChange.CREATE)
+                for uid in VPS.objects.values_list("uid", flat=True)
+            ],
+        )
+
+    def test_instant_batch(self):
+        """
+        Порция, сохранённая за время меньше разрешения таймера, не ломает
+        вывод скорости импорта.
+        """
+        path = self.write_ndjson([{"cpu": 2, "ram": 2, "hdd": 5}])
+        with mock.patch("time.monotonic", return_value=100.0):
+            stdout, _stderr = self.import_vps(path)
+        self.assertIn("(0 records/s)", stdout)
+        self.assertEqual(VPS.objects.count(), 1)
+
+    def test_stdin_skip_invalid(self):
+        """
+        Импорт NDJSON из stdin с пропуском невалидных записей: ошибки
+        выводятся с номерами записей, валидные записи сохраняются.
+        """
+        VPS.objects.create(uid=uuid.UUID(UID), cpu=2, ram=2, hdd=5, status="started")
+        lines = [
+            json.dumps({"cpu": 2, "ram": 65, "hdd": 5}),
+            "not json",
+            json.dumps({"cpu": "x", "ram": 2, "hdd": 4097, "status": "reserved"}),
+            json.dumps({"uid": UID, "cpu": 2, "ram": 2, "hdd": 5}),
+            json.dumps({"uid": "42", "cpu": 2, "ram": 2, "hdd": 5}),
+            json.dumps({"cpu": 80, "ram": 64, "hdd": 4096}),
+        ]
+        with mock.patch("sys.stdin", StringIO("\n".join(lines))):
+            stdout, stderr = self.import_vps("--format", "ndjson", "--skip-invalid")
+        errors = stderr.splitlines()
+        self.assertEqual(
+            [error.split(":")[:2] for error in errors],
+            [
+                ["Record 1", " ram"],
+                ["Record 2", " non_field_errors"],
+                ["Record 3", " cpu"],
+                ["Record 3", " hdd"],
+                ["Record 3", " status"],
+                ["Record 4", " uid"],
+                ["Record 5", " uid"],
+            ],
+        )
+        self.assertIn("imported 1, invalid 5", stdout)
+        self.assertEqual(VPS.objects.filter(cpu=80).count(), 1)
+
+    def test_resume(self):
+        """
+        Импорт останавливается на порции с ошибкой, сохранив предыдущие
+        порции; повторный запуск с контрольной точкой продолжает импорт
+        без повторной вставки сохранённых записей.
+        """
+        records = [{"cpu": 2 + index, "ram": 2, "hdd": 5} for index in range(5)]
+        records[3]["uid"] = "invalid"
+        path = self.write_ndjson(records)
+        options = ["--batch-size", "2", "--checkpoint", "vps"]
+
+        with self.assertRaisesMessage(CommandError, "after record 2"):
+            self.import_vps(path, *options)
+        self.assertEqual(VPS.objects.count(), 2)
+
+        del records[3]["uid"]
+        path = self.write_ndjson(records)
+        stdout, _stderr = self.import_vps(path, *options)
+        self.assertIn("Resuming after record 2.", stdout)
+        self.assertEqual(
+            sorted(VPS.objects.values_list("cpu", flat=True)), [2, 3, 4, 5, 6]
+        )
+        # Завершённый импорт повторно ничего не вставляет
+        self.import_vps(path, *options)
+        self.assertEqual(VPS.objects.count(), 5)
+
+    def test_checkpoint_in_batch_transaction(self):
+        """
+        Контрольная точка записывается в транзакции порции: если запись
+        не удалась, порция откатывается, и повторный запуск вставляет её
+        один раз.
+        """
+        path = self.write_ndjson(
+            [{"cpu": 2 + index, "ram": 2, "hdd": 5} for index in range(5)]
+        )
+        options = ["--batch-size", "2", "--checkpoint", "vps"]
+        save = ImportCheckpoint.save
+        calls = []
+
+        def fail_second(checkpoint, state):
+            calls.append(state)
+            if len(calls) == 2:
+                raise DatabaseError("disk I/O error")
+            save(checkpoint, state)
+
+        with mock.patch.object(ImportCheckpoint, "save", fail_second):
+            with self.assertRaises(DatabaseError):
+                self.import_vps(path, *options)
+        self.assertEqual(VPS.objects.count(), 2)
+        self.assertEqual(VPSImport.objects.get(name="vps").records, 2)
+
+        stdout, _stderr = self.import_vps(path, *options)
+        self.assertIn("Resuming after record 2.", stdout)
+        self.assertEqual(
+            sorted(VPS.objects.values_list("cpu", flat=True)), [2, 3, 4, 5, 6]
+        )
+        self.assertEqual(
+            VPSImport.objects.values("records", "imported", "invalid").get(),
+            {"records": 5, "imported": 5, "invalid": 0},
+        )
+
+    def test_duplicate_uid_across_batches(self):
+        """
+        Повтор UID в порции и в уже сохранённой порции - ошибка записи.
+        """
+        path = self.write_ndjson([{"uid": UID, "cpu": 2, "ram": 2, "hdd": 5}] * 3)
+        stdout, stderr = self.import_vps(path, "--batch-size", "2", "--skip-invalid")
+        self.assertEqual(
+            [error.split(":")[0] for error in stderr.splitlines()],
+            ["Record 2", "Record 3"],
+        )
+        self.assertEqual(VPS.objects.count(), 1)
+
+    def test_invalid_arguments(self):
+        """
+        Формат stdin обязателен, контрольная точка привязана к источнику.
+        """
+        with self.assertRaisesMessage(CommandError, "--format"):
+            self.import_vps()
+        path = self.write_ndjson([{"cpu": 2, "ram": 2, "hdd": 5}])
+        self.import_vps(path, "--checkpoint", "vps")
+        with self.assertRaisesMessage(CommandError, "belongs to"):
+            self.import_vps(self.write("other.csv", ["cpu"]), "--checkpoint", "vps")
+        with self.assertRaisesMessage(CommandError, "Cannot open"):
+            self.import_vps(str(self.directory / "missing.csv"))
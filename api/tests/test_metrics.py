@@ -0,0 +1,168 @@
+import tempfile
+import threading
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.metrics import (
+    DB_QUERIES,
+    REQUEST_DURATION,
+    REQUESTS,
+    MetricsRegistry,
+    metrics_registry,
+    render_metrics,
+)
+from api.models import VPS
+
+
+class MetricsRegistryTestCase(TestCase):
+    """
+    Тесты реестра метрик и экспорта в формате Prometheus.
+    """
+
+    def test_threads_merged(self):
+        """
+        Значения, записанные разными потоками, суммируются, в том числе
+        после завершения потоков.
+        """
+        registry = MetricsRegistry()
+
+        def work():
+            for _ in range(100):
+                registry.inc(REQUESTS, ("vps-list", "list", "GET", "200"))
+
+        threads = [threading.Thread(target=work) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        registry.inc(REQUESTS, ("vps-list", "list", "GET", "200"))
+        self.assertEqual(
+            registry.collect(),
+            {("vps_http_requests_total", ("vps-list", "list", "GET", "200")): [401]},
+        )
+        self.assertEqual(len(registry.shards), 1)
+
+    def test_histogram(self):
+        """
+        Гистограмма экспортируется с накопительными корзинами, суммой
+        и количеством наблюдений.
+        """
+        registry = MetricsRegistry()
+        for value in (0, 1, 2, 200):
+            registry.observe(DB_QUERIES, ("vps-detail", "retrieve"), value)
+        text = render_metrics(registry.collect())
+        labels = 'route="vps-detail",action="retrieve"'
+        for line in (
+            "# TYPE vps_db_queries_per_request histogram",
+            f'vps_db_queries_per_request_bucket{{{labels},le="0.0"}} 1',
+            f'vps_db_queries_per_request_bucket{{{labels},le="2.0"}} 3',
+            f'vps_db_queries_per_request_bucket{{{labels},le="100.0"}} 3',
+            f'vps_db_queries_per_request_bucket{{{labels},le="+Inf"}} 4',
+            f"vps_db_queries_per_request_sum{{{labels}}} 203",
+            f"vps_db_queries_per_request_count{{{labels}}} 4",
+        ):
+            self.assertIn(line, text.splitlines())
+
+    def test_processes_merged(self):
+        """
+        /metrics суммирует снимки других процессов из каталога метрик.
+        """
+        other = MetricsRegistry()
+        other.observe(REQUEST_DURATION, ("vps-list", "list"), 0.02)
+        registry = MetricsRegistry()
+        registry.observe(REQUEST_DURATION, ("vps-list", "list"), 0.2)
+        with tempfile.TemporaryDirectory() as directory:
+            other.dump(directory)
+            (other.get_snapshot_path(directory)).rename(
+                other.get_snapshot_path(directory, pid=1)
+            )
+            with override_settings(
+                VPS_METRICS_SETTINGS={"DIRECTORY": directory, "DUMP_INTERVAL": 5}
+            ):
+                totals = registry.collect_all()
+        values = totals["vps_http_request_duration_seconds", ("vps-list", "list")]
+        self.assertEqual(values[-1], 2)
+        self.assertAlmostEqual(values[-2], 0.22)
+
+
+class MetricsMiddlewareTestCase(TestCase):
+    """
+    Тесты сбора метрик запросов к API VPS.
+    """
+
+    def setUp(self):
+        """
+        Сбрасывает метрики и создаёт тестовый сервер.
+        """
+        metrics_registry.reset()
+        self.client = APIClient()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+
+    def get_metrics(self):
+        """
+        Запрашивает /metrics.
+
+        :return: Строки экспорта
+        """
+        response = self.client.get("/metrics")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+        return response.content.decode().splitlines()
+
+    def test_request_metrics(self):
+        """
+        Запросы учитываются с маршрутом и действием ViewSet.
+        """
+        self.client.get(reverse("vps-detail", kwargs={"uid": self.vps.uid}))
+        self.client.patch(
+            reverse("vps-detail", kwargs={"uid": self.vps.uid}),
+            {"status": "stopped"},
+            format="json",
+        )
+        lines = self.get_metrics()
+        detail = 'route="vps-detail",action="retrieve"'
+        update = 'route="vps-detail",action="partial_update"'
+        for line in (
+            f'vps_http_requests_total{{{detail},method="GET",status="200"}} 1',
+            f'vps_http_requests_total{{{update},method="PATCH",status="200"}} 1',
+            f"vps_http_request_duration_seconds_count{{{detail}}} 1",
+            f"vps_http_response_size_bytes_count{{{detail}}} 1",
+            f"vps_db_queries_per_request_sum{{{detail}}} 1",
+            f"vps_serializer_duration_seconds_count{{{update}}} 1",
+        ):
+            self.assertIn(line, lines)
+
+    async def test_async_views(self):
+        """
+        Асинхронные представления учитываются с теми же действиями,
+        что и VPSViewSet.
+        """
+        await self.async_client.get(f"/api/v1/vps/{self.vps.uid}")
+        lines = render_metrics(metrics_registry.collect()).splitlines()
+        detail = 'route="vps-detail",action="retrieve"'
+        for line in (
+            f'vps_http_requests_total{{{detail},method="GET",status="200"}} 1',
+            f"vps_db_queries_per_request_sum{{{detail}}} 1",
+        ):
+            self.assertIn(line, lines)
+
+    def test_unmatched(self):
+        """
+        Запросы к несуществующим адресам учитываются одной серией.
+        """
+        self.client.get("/missing")
+        self.assertIn(
+            'vps_http_requests_total{route="unmatched",action="",method="GET",'
+            'status="404"} 1',
+            self.get_metrics(),
+        )
+
+    @override_settings(VPS_METRICS_SETTINGS={"ENABLED": False, "DIRECTORY": None})
+    def test_disabled(self):
+        """
+        С выключенными метриками запросы не учитываются.
+        """
+        self.client.get(reverse("vps-list"))
+        self.assertEqual(metrics_registry.collect(), {})
@@ -0,0 +1,165 @@
+from django.db import connection
+from django.test import TestCase
+
+from api.models import VPS, VPSChange
+from api.v1.filters import VPSFilter
+from api.v1.pagination import VPSCursorPagination
+
+
+class VPSQuerySetTestCase(TestCase):
+    """
+    Тесты массовых операций VPSQuerySet.
+    """
+
+    def setUp(self):
+        """
+        Создаёт серверы в разных статусах.
+        """
+        self.started = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        self.stopped = VPS.objects.create(cpu=4, ram=16, hdd=200, status="stopped")
+
+    def test_set_status(self):
+        """
+        Смена статуса выполняется одним UPDATE и не трогает серверы,
+        уже находящиеся в целевом статусе.
+        Ещё три запроса - итоги выборки, обновление сводки VPSStats
+        и запись в журнал VPSChange.
+        """
+        last_seq = VPSChange.objects.get_last_seq()
+        with self.assertNumQueries(4):
+            updated = VPS.objects.all().set_status("stopped")
+        self.assertEqual(updated, 1)
+        self.assertEqual(
+            list(
+                VPSChange.objects.filter(seq__gt=last_seq).values_list(
+                    "uid", "action", "status"
+                )
+            ),
+            [(self.started.uid, VPSChange.STATUS, "stopped")],
+        )
+        self.assertEqual(VPS.objects.filter(status="stopped").count(), 2)
+        self.assertEqual(VPS.objects.get(uid=self.started.uid).version, 2)
+        self.assertEqual(VPS.objects.get(uid=self.stopped.uid).version, 1)
+
+    def test_set_status_touches_updated_at(self):
+        """
+        Смена статуса обновляет время изменения только изменённых серверов.
+        """
+        started_at = self.started.updated_at
+        stopped_at = self.stopped.updated_at
+        VPS.objects.all().set_status_returning("stopped")
+        self.started.refresh_from_db()
+        self.stopped.refresh_from_db()
+        self.assertGreater(self.started.updated_at, started_at)
+        self.assertEqual(self.stopped.updated_at, stopped_at)
+
+    def test_set_status_returning(self):
+        """
+        Смена статуса с RETURNING возвращает UID изменённых серверов
+        и записывает их в журнал VPSChange одним INSERT.
+        """
+        last_seq = VPSChange.objects.get_last_seq()
+        with self.assertNumQueries(4):
+            uids = VPS.objects.all().set_status_returning("blocked")
+        self.assertCountEqual(uids, [self.started.uid, self.stopped.uid])
+        self.assertCountEqual(
+            VPSChange.objects.filter(seq__gt=last_seq).values_list("uid", "status"),
+            [(self.started.uid, "blocked"), (self.stopped.uid, "blocked")],
+        )
+        self.assertEqual(VPS.objects.filter(status="blocked").count(), 2)
+
+    def test_set_status_returning_empty_selection(self):
+        """
+        Смена статуса пустой выборки не выполняет запросов.
+        """
+        with self.assertNumQueries(0):
+            self.assertEqual(VPS.objects.none().set_status_returning("blocked"), [])
+
+
+class VPSQueryPlanTestCase(TestCase):
+    """
+    Тесты планов выполнения запросов к модели VPS.
+    Проверяют по EXPLAIN, что список и фильтры обслуживаются индексами,
+    без полного сканирования таблицы и временного B-дерева для сортировки.
+    """
+
+    def setUp(self):
+        """
+        Создаёт набор серверов и обновляет статистику планировщика.
+        """
+        VPS.objects.bulk_create(
+            VPS(
+                cpu=2 + i % 8,
+                ram=2 + 2 * (i % 16),
+                hdd=5 + i,
+                status=VPS.STATUS_CHOICES[i % 3][0],
+            )
+            for i in range(300)
+        )
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def get_page_queryset(self, params=None):
+        """
+        Возвращает запрос первой страницы списка с указанными фильтрами.
+
+        :param params: Параметры фильтрации VPSFilter
+        :return: QuerySet, отсортированный так же, как при пагинации
+        """
+        queryset = VPSFilter(params or {}, queryset=VPS.objects.all()).qs
+        page_size = VPSCursorPagination.page_size
+        return queryset.order_by(VPSCursorPagination.ordering)[: page_size + 1]
+
+    def assertIndexedPlan(self, queryset, ordered_by_index=True):
+        """
+        Проверяет, что план запроса не содержит полного сканирования
+        таблицы и (если не указано обратное) сортировки во временном B-дереве.
+        """
+        plan = queryset.explain()
+        if ordered_by_index:
+            self.assertNotIn("TEMP B-TREE", plan)
+        for line in plan.splitlines():
+            if "SCAN" in line:
+                self.assertIn("USING", line, plan)
+
+    def test_default_ordering_uses_index(self):
+        """
+        Сортировка по умолчанию обслуживается индексом.
+        """
+        self.assertIndexedPlan(VPS.objects.all())
+
+    def test_list_page_uses_index(self):
+        """
+        Страница списка без фильтров выбирается по индексу первичного ключа.
+        """
+        self.assertIndexedPlan(self.get_page_queryset())
+
+    def test_filter_pages_use_index(self):
+        """
+        Страницы с фильтрами выбираются по составным индексам.
+        """
+        for params in (
+            {"status": "started"},
+            {"cpu": 4},
+            {"ram": 32},
+            {"hdd": 100},
+            {"ram": 32, "status": "stopped"},
+            {"status__in": "started,stopped"},
+            {"ram_min": 8, "status": "blocked"},
+        ):
+            with self.subTest(params=params):
+                self.assertIndexedPlan(self.get_page_queryset(params))
+
+    def test_range_filter_pages_use_index(self):
+        """
+        Диапазоны по ресурсам выбираются поиском по индексу.
+        Найденные строки сортируются по UID, но таблица целиком не читается.
+        """
+        for params in (
+            {"cpu_min": 4, "cpu_max": 6},
+            {"hdd_min": 100, "hdd_max": 120},
+        ):
+            with self.subTest(params=params):
+                queryset = self.get_page_queryset(params)
+                self.assertIn("USING INDEX", queryset.explain())
+                self.assertIndexedPlan(queryset, ordered_by_index=False)
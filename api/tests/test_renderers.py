@@ -0,0 +1,192 @@
+import datetime
+import io
+import uuid
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from api.v1 import renderers
+from api.v1.parsers import MessagePackParser
+from api.v1.renderers import (
+    CSVRenderer,
+    FastJSONRenderer,
+    MessagePackRenderer,
+    NDJSONRenderer,
+    msgpack,
+)
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+    """
+    Тесты FastJSONRenderer.
+    """
+
+    def setUp(self):
+        """
+        Устанавливает данные с типами, которые по-разному кодируются
+        orjson и стандартным JSON-кодировщиком.
+        """
+        self.data = {
+            "servers": [
+                {
+                    "uid": uuid.UUID("123e4567-e89b-12d3-a456-426614174000"),
+                    "cpu": 4,
+                    "status": "запущен\u2028",
+                }
+            ],
+            "detail": _("Not found."),
+            "updated_at": datetime.datetime(
+                2025, 1, 14, 23, 12, 1, 123456, tzinfo=datetime.timezone.utc
+            ),
+            "price": Decimal("1.50"),
+            "next": None,
+        }
+
+    def test_matches_json_renderer(self):
+        """
+        Вывод побайтово совпадает с JSONRenderer.
+        """
+        self.assertEqual(
+            FastJSONRenderer().render(self.data), JSONRenderer().render(self.data)
+        )
+
+    def test_without_orjson(self):
+        """
+        Без orjson используется стандартный JSONRenderer.
+        """
+        with mock.patch.object(renderers, "orjson", None):
+            self.assertEqual(
+                FastJSONRenderer().render(self.data),
+                JSONRenderer().render(self.data),
+            )
+
+    def test_indent(self):
+        """
+        Запрошенный отступ обрабатывается стандартным JSONRenderer.
+        """
+        media_type = "application/json; indent=4"
+        self.assertEqual(
+            FastJSONRenderer().render(self.data, media_type),
+            JSONRenderer().render(self.data, media_type),
+        )
+
+
+@skipIf(msgpack is None, "msgpack is not installed")
+class MessagePackRendererTestCase(SimpleTestCase):
+    """
+    Тесты MessagePackRenderer и MessagePackParser.
+    """
+
+    uid = uuid.UUID("123e4567-e89b-12d3-a456-426614174000")
+
+    def parse(self, content):
+        """
+        Разбирает байтовую строку MessagePackParser.
+        """
+        return MessagePackParser().parse(io.BytesIO(content))
+
+    def test_round_trip(self):
+        """
+        Разобранный ответ совпадает с исходными данными: UUID и время
+        восстанавливаются, остальные типы кодируются как в JSON.
+        """
+        changed_at = datetime.datetime(
+            2025, 1, 14, 23, 12, 1, 123456, tzinfo=datetime.timezone.utc
+        )
+        data = {
+            "servers": [{"uid": self.uid, "cpu": 4, "status": "запущен"}],
+            "changed_at": changed_at,
+            "detail": _("Not found."),
+            "price": Decimal("1.50"),
+            "next": None,
+        }
+        self.assertEqual(
+            self.parse(MessagePackRenderer().render(data)),
+            {
+                "servers": [{"uid": self.uid, "cpu": 4, "status": "запущен"}],
+                "changed_at": changed_at,
+                "detail": str(_("Not found.")),
+                "price": 1.5,
+                "next": None,
+            },
+        )
+
+    def test_uuid_compact(self):
+        """
+        UUID занимает 18 байт (fixext 16) вместо 37 байт строки.
+        """
+        self.assertEqual(
+            MessagePackRenderer().render(self.uid),
+            b"\xd8\x01" + self.uid.bytes,
+        )
+
+    def test_stream(self):
+        """
+        Поток читается последовательностью объектов по одному на строку.
+        """
+        chunks = [[(self.uid, 4)], [(self.uid, 8)]]
+        content = b"".join(MessagePackRenderer().stream(("uid", "cpu"), chunks))
+        unpacker = msgpack.Unpacker(ext_hook=MessagePackParser().ext_hook)
+        unpacker.feed(content)
+        self.assertEqual(
+            list(unpacker), [{"uid": self.uid, "cpu": 4}, {"uid": self.uid, "cpu": 8}]
+        )
+
+    def test_parse_error(self):
+        """
+        Некорректное или обрезанное тело запроса отклоняется ParseError.
+        """
+        content = MessagePackRenderer().render({"cpu": 4})
+        for body in (content[:-1], content + b"\xc1", b"\xc1"):
+            with self.subTest(body=body):
+                with self.assertRaises(ParseError):
+                    self.parse(body)
+
+
+class StreamingRendererTestCase(SimpleTestCase):
+    """
+    Тесты потокового вывода NDJSONRenderer и CSVRenderer.
+    """
+
+    fields = ("uid", "cpu", "status")
+    chunks = [
+        [(uuid.UUID("123e4567-e89b-12d3-a456-426614174000"), 4, "started")],
+        [(uuid.UUID("123e4567-e89b-12d3-a456-426614174001"), 8, "stopped")],
+    ]
+
+    def test_ndjson_stream(self):
+        """
+        NDJSON выводит по одной строке на объект и по одному блоку на порцию.
+        """
+        blocks = list(NDJSONRenderer().stream(self.fields, iter(self.chunks)))
+        self.assertEqual(len(blocks), 2)
+        self.assertEqual(
+            blocks[0],
+            b'{"uid": "123e4567-e89b-12d3-a456-426614174000", "cpu": 4, '
+            b'"status": "started"}\n',
+        )
+
+    def test_csv_stream(self):
+        """
+        CSV выводит заголовок вместе с первой порцией.
+        """
+        blocks = list(CSVRenderer().stream(self.fields, iter(self.chunks)))
+        self.assertEqual(
+            blocks,
+            [
+                b"uid,cpu,status\r\n"
+                b"123e4567-e89b-12d3-a456-426614174000,4,started\r\n",
+                b"123e4567-e89b-12d3-a456-426614174001,8,stopped\r\n",
+            ],
+        )
+
+    def test_csv_stream_empty(self):
+        """
+        CSV без строк состоит из одного заголовка.
+        """
+        blocks = list(CSVRenderer().stream(self.fields, iter([])))
+        self.assertEqual(blocks, [b"uid,cpu,status\r\n"])
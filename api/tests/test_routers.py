@@ -0,0 +1,142 @@
+from contextvars import copy_context
+
+from django.db import router
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from api.middleware import primary_pinning_middleware
+from api.models import VPS
+from api.routers import primary_pinned
+
+ROUTING = {"REPLICAS": ["replica"], "STICKY_SECONDS": 5, "COOKIE_NAME": "vps_primary"}
+
+
+@override_settings(VPS_DB_ROUTING_SETTINGS=ROUTING)
+class PrimaryReplicaRouterTestCase(SimpleTestCase):
+    """
+    Тесты маршрутизации чтения на реплики и записи в основную БД.
+    """
+
+    def setUp(self):
+        """
+        Создаёт фабрику запросов.
+        """
+        self.factory = RequestFactory()
+
+    def route(self, request, write=False):
+        """
+        Выполняет запрос через primary_pinning_middleware.
+
+        :param request: Запрос
+        :param write: Выполнить ли в запросе запись
+        :return: Кортеж (ответ, БД чтения до записи, БД чтения в конце запроса)
+        """
+        databases = []
+
+        def get_response(request):
+            databases.append(router.db_for_read(VPS))
+            if write:
+                router.db_for_write(VPS)
+            databases.append(router.db_for_read(VPS))
+            return HttpResponse()
+
+        response = copy_context().run(primary_pinning_middleware(get_response), request)
+        return response, *databases
+
+    def test_read(self):
+        """
+        Чтение без записи идёт в реплику, cookie не выставляется.
+        """
+        response, before, after = self.route(self.factory.get("/api/v1/vps"))
+        self.assertEqual((before, after), ("replica", "replica"))
+        self.assertNotIn("vps_primary", response.cookies)
+
+    def test_read_after_write(self):
+        """
+        После записи чтение до конца запроса идёт в основную БД,
+        клиенту выставляется cookie.
+        """
+        response, before, after = self.route(
+            self.factory.get("/api/v1/vps"), write=True
+        )
+        self.assertEqual((before, after), ("replica", "default"))
+        self.assertEqual(response.cookies["vps_primary"]["max-age"], 5)
+
+    def test_unsafe_method(self):
+        """
+        Запрос с небезопасным методом читает из основной БД целиком.
+        """
+        response, before, after = self.route(
+            self.factory.patch("/api/v1/vps/1"), write=True
+        )
+        self.assertEqual((before, after), ("default", "default"))
+        self.assertIn("vps_primary", response.cookies)
+
+    def test_sticky_cookie(self):
+        """
+        Пока у клиента есть cookie недавней записи, он читает из основной БД.
+        Чтение не продлевает cookie.
+        """
+        request = self.factory.get("/api/v1/vps")
+        request.COOKIES["vps_primary"] = "1"
+        response, before, after = self.route(request)
+        self.assertEqual((before, after), ("default", "default"))
+        self.assertNotIn("vps_primary", response.cookies)
+
+    def test_pin_reset_after_request(self):
+        """
+        Закрепление за основной БД не переходит на следующие запросы.
+        """
+
+        def write(request):
+            router.db_for_write(VPS)
+            return HttpResponse()
+
+        def check():
+            primary_pinned.set(None)
+            primary_pinning_middleware(write)(self.factory.patch("/api/v1/vps/1"))
+            return primary_pinned.get(), router.db_for_read(VPS)
+
+        self.assertEqual(copy_context().run(check), (None, "replica"))
+
+    @override_settings(VPS_DB_ROUTING_SETTINGS={**ROUTING, "REPLICAS": []})
+    def test_without_replicas(self):
+        """
+        Без реплик чтение идёт в основную БД.
+        """
+        _response, before, after = self.route(self.factory.get("/api/v1/vps"))
+        self.assertEqual((before, after), ("default", "default"))
+
+
+@override_settings(VPS_DB_ROUTING_SETTINGS=ROUTING)
+class VPSWritesUsePrimaryTestCase(TestCase):
+    """
+    Тесты того, что записи VPS вместе с предварительным чтением итогов
+    для сводки выполняются в основной БД, даже когда чтение идёт в реплику.
+    Обращение к реплике в этих тестах завершилось бы ошибкой.
+    """
+
+    def setUp(self):
+        """
+        Создаёт тестовый сервер.
+        """
+        self.vps = copy_context().run(
+            VPS.objects.create, cpu=8, ram=32, hdd=500, status="started"
+        )
+
+    def test_writes(self):
+        """
+        Массовые и одиночные записи не читают из реплики.
+        """
+        for write in (
+            lambda: VPS.objects.filter(uid=self.vps.uid).set_status("stopped"),
+            lambda: VPS.objects.filter(uid=self.vps.uid).set_status_returning(
+                "blocked"
+            ),
+            lambda: VPS.objects.filter(uid=self.vps.uid).update(cpu=16),
+            lambda: VPS.objects.bulk_create([VPS(cpu=2, ram=4, hdd=10)]),
+            lambda: self.vps.update_status("started"),
+            lambda: VPS.objects.filter(cpu=2).delete(),
+        ):
+            copy_context().run(write)
+        self.assertEqual(VPS.objects.using("default").get().cpu, 16)
@@ -0,0 +1,192 @@
+import json
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from api.v1.docs import SchemaDocuments, VPSSchemaView, schema_documents
+
+
+class SchemaViewTestCase(SimpleTestCase):
+    """
+    Тесты отдачи предвычисленной схемы OpenAPI.
+    """
+
+    def setUp(self):
+        """
+        Сбрасывает предвычисленные документы схемы.
+        """
+        schema_documents.reset()
+        self.addCleanup(schema_documents.reset)
+        self.url = reverse("swagger")
+
+    def get_schema(self, language="ru", **extra):
+        """
+        Запрашивает схему в формате openapi.
+
+        :param language: Язык из заголовка Accept-Language
+        :return: Ответ
+        """
+        return self.client.get(
+            self.url, {"format": "openapi"}, HTTP_ACCEPT_LANGUAGE=language, **extra
+        )
+
+    def test_generated_once(self):
+        """
+        Схема генерируется один раз и затем отдаётся из памяти.
+        """
+        response = self.get_schema()
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("/vps/{uid}", json.loads(response.content)["paths"])
+        with mock.patch.object(SchemaDocuments, "generate") as generate:
+            self.assertEqual(self.get_schema().content, response.content)
+        generate.assert_not_called()
+
+    def test_fields_parameter(self):
+        """
+        Параметр fields описан у списка и выгрузки, но не у массовой смены
+        статуса.
+        """
+        paths = json.loads(self.get_schema().content)["paths"]
+        for path, method, documented in (
+            ("/vps", "get", True),
+            ("/vps/export", "get", True),
+            ("/vps/status", "post", False),
+        ):
+            with self.subTest(path=path):
+                names = {
+                    parameter["name"] for parameter in paths[path][method]["parameters"]
+                }
+                self.assertIs("fields" in names, documented)
+
+    def test_etag(self):
+        """
+        ETag зависит от содержимого схемы, на If-None-Match отдаётся 304.
+        """
+        response = self.get_schema()
+        self.assertEqual(response["ETag"], schema_documents.get("ru", "json").etag)
+        self.assertIn("Accept-Language", response["Vary"])
+        response = self.get_schema(HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b"")
+
+    def test_languages(self):
+        """
+        Схема отдаётся на языке из Accept-Language, иначе на языке по умолчанию.
+        """
+        descriptions = {
+            language: json.loads(self.get_schema(language).content)["info"][
+                "description"
+            ]
+            for language in ("ru", "en", "de")
+        }
+        self.assertEqual(
+            descriptions,
+            {
+                "ru": "API для работы с VPS серверами",
+                "en": "VPS API",
+                "de": "API для работы с VPS серверами",
+            },
+        )
+
+    def test_yaml(self):
+        """
+        Схема в формате YAML отдаётся со своим ETag.
+        """
+        response = self.client.get(self.url, {"format": ".yaml"})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("application/yaml"))
+        self.assertEqual(response["ETag"], schema_documents.get("ru", "yaml").etag)
+
+    def test_ui(self):
+        """
+        Страницы Swagger UI и ReDoc отдаются без генерации схемы.
+        """
+        with (
+            mock.patch.object(VPSSchemaView, "generator_class") as generator_class,
+            mock.patch.object(SchemaDocuments, "generate") as generate,
+        ):
+            for params in ({}, {"format": "redoc"}):
+                with self.subTest(params=params):
+                    response = self.client.get(
+                        self.url, params, HTTP_ACCEPT="text/html"
+                    )
+                    self.assertContains(response, "VPS API")
+        generator_class.assert_not_called()
+        generate.assert_not_called()
+
+
+class GenerateOpenAPISchemaTestCase(SimpleTestCase):
+    """
+    Тесты команды generate_openapi_schema.
+    """
+
+    def setUp(self):
+        """
+        Создаёт временный каталог для файлов схемы.
+        """
+        schema_documents.reset()
+        self.addCleanup(schema_documents.reset)
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = Path(directory.name)
+
+    def test_generate_and_serve(self):
+        """
+        Записанные файлы отдаются без генерации схемы.
+        """
+        call_command(
+            "generate_openapi_schema", output=self.directory, stdout=StringIO()
+        )
+        self.assertEqual(
+            sorted(path.name for path in self.directory.iterdir()),
+            [
+                "openapi.en.json",
+                "openapi.en.yaml",
+                "openapi.ru.json",
+                "openapi.ru.yaml",
+            ],
+        )
+        with (
+            override_settings(VPS_SCHEMA_SETTINGS={"DIRECTORY": self.directory}),
+            mock.patch.object(SchemaDocuments, "generate") as generate,
+        ):
+            response = self.client.get(reverse("swagger"), {"format": "openapi"})
+        generate.assert_not_called()
+        self.assertEqual(
+            response.content, (self.directory / "openapi.ru.json").read_bytes()
+        )
+
+    def test_check(self):
+        """
+        Проверка завершается ошибкой, если файлы схемы устарели.
+        """
+        call_command(
+            "generate_openapi_schema", output=self.directory, stdout=StringIO()
+        )
+        call_command(
+            "generate_openapi_schema",
+            output=self.directory,
+            check=True,
+            stdout=StringIO(),
+        )
+        (self.directory / "openapi.en.yaml").write_text("swagger: '2.0'\n")
+        with self.assertRaises(CommandError):
+            call_command(
+                "generate_openapi_schema",
+                output=self.directory,
+                check=True,
+                stdout=StringIO(),
+            )
+
+    def test_no_directory(self):
+        """
+        Без каталога команда завершается ошибкой.
+        """
+        with self.assertRaises(CommandError):
+            call_command("generate_openapi_schema", stdout=StringIO())
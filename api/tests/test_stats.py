@@ -0,0 +1,135 @@
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from api.models import VPS, VPSStats
+
+
+class VPSStatsTestCase(TestCase):
+    """
+    Тесты сводки VPSStats и эндпоинта статистики.
+    """
+
+    def setUp(self):
+        """
+        Создаёт тестовые серверы.
+        """
+        self.client = APIClient()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+        VPS.objects.create(cpu=4, ram=16, hdd=200, status="stopped")
+
+    def assertStatsValid(self):
+        """
+        Проверяет, что сводка совпадает с итогами, посчитанными по таблице VPS.
+        """
+        self.assertEqual(VPSStats.objects.get_differences(), {})
+
+    def test_stats(self):
+        """
+        Эндпоинт отдаёт итоги по статусам и общий итог одним запросом.
+        """
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("vps-stats"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "statuses": {
+                    "started": {"servers": 1, "cpu": 8, "ram": 32, "hdd": 500},
+                    "stopped": {"servers": 1, "cpu": 4, "ram": 16, "hdd": 200},
+                    "blocked": {"servers": 0, "cpu": 0, "ram": 0, "hdd": 0},
+                },
+                "total": {"servers": 2, "cpu": 12, "ram": 48, "hdd": 700},
+            },
+        )
+
+    def test_stats_after_api_writes(self):
+        """
+        Сводка обновляется при создании, пакетном создании, частичном
+        обновлении и массовой смене статуса.
+        """
+        self.client.post(
+            reverse("vps-list"),
+            {"cpu": 2, "ram": 4, "hdd": 10, "status": "blocked"},
+            format="json",
+        )
+        self.client.post(
+            reverse("vps-batch-create"),
+            [
+                {"cpu": 2, "ram": 4, "hdd": 10, "status": "started"},
+                {"cpu": 6, "ram": 8, "hdd": 20, "status": "stopped"},
+            ],
+            format="json",
+        )
+        self.client.patch(
+            reverse("vps-detail", kwargs={"uid": self.vps.uid}),
+            {"status": "blocked"},
+            format="json",
+        )
+        self.assertStatsValid()
+        self.client.post(
+            reverse("vps-bulk-status") + "?cpu_min=4",
+            {"status": "stopped"},
+            format="json",
+        )
+        self.assertStatsValid()
+        response = self.client.get(reverse("vps-stats"))
+        self.assertEqual(response.json()["statuses"]["stopped"]["servers"], 3)
+        self.assertEqual(response.json()["total"]["servers"], 5)
+
+    def test_stats_after_model_writes(self):
+        """
+        Сводка обновляется при сохранении, удалении и массовом изменении
+        серверов через ORM.
+        """
+        self.vps.cpu = 16
+        self.vps.status = "blocked"
+        self.vps.save()
+        self.assertStatsValid()
+        VPS.objects.filter(status="stopped").update(ram=64)
+        self.assertStatsValid()
+        self.vps.delete()
+        self.assertStatsValid()
+        VPS.objects.all().delete()
+        self.assertStatsValid()
+        self.assertEqual(VPSStats.objects.get_summary()["total"]["servers"], 0)
+
+    def test_stats_after_admin_save(self):
+        """
+        Сохранение сервера в админке обновляет сводку.
+        """
+        admin = User.objects.create_superuser("admin", "admin@example.com", "admin")
+        self.client.force_login(admin)
+        self.client.post(
+            reverse("admin:api_vps_change", args=[self.vps.uid]),
+            {
+                "uid": str(self.vps.uid),
+                "cpu": 16,
+                "ram": 32,
+                "hdd": 500,
+                "status": "stopped",
+            },
+        )
+        self.assertStatsValid()
+        self.assertEqual(
+            VPSStats.objects.get_summary()["statuses"]["stopped"]["cpu"], 20
+        )
+
+    def test_rebuild_command(self):
+        """
+        Команда rebuild_vps_stats находит расхождения, а после пересчёта
+        проверка проходит.
+        """
+        VPSStats.objects.filter(status="started").update(servers=10)
+        with self.assertRaises(CommandError):
+            call_command("rebuild_vps_stats", "--check", stdout=StringIO())
+        out = StringIO()
+        call_command("rebuild_vps_stats", stdout=out)
+        self.assertIn("started", out.getvalue())
+        self.assertStatsValid()
+        call_command("rebuild_vps_stats", "--check", stdout=StringIO())
@@ -0,0 +1,79 @@
+import time
+import uuid
+from unittest import mock
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from api.models import VPS
+from api.uids import UUID7Generator, generate_uid, get_uid_timestamp
+
+
+class UUID7GeneratorTestCase(SimpleTestCase):
+    """
+    Тесты генератора UUID версии 7.
+    """
+
+    def test_layout(self):
+        """
+        UUID имеет версию 7, вариант RFC 9562 и время создания.
+        """
+        before = time.time()
+        uid = UUID7Generator()()
+        self.assertEqual(uid.version, 7)
+        self.assertEqual(uid.variant, uuid.RFC_4122)
+        self.assertLessEqual(int(before * 1000) / 1000, get_uid_timestamp(uid))
+        self.assertLessEqual(get_uid_timestamp(uid), time.time())
+        self.assertIsNone(get_uid_timestamp(uuid.uuid4()))
+
+    def test_monotonic(self):
+        """
+        UUID строго возрастают, в том числе в пределах одной миллисекунды,
+        при переполнении счётчика и при переводе часов назад.
+        """
+        generator = UUID7Generator()
+        for clock in (
+            [1_700_000_000_000_000_000] * 5000,
+            [1_700_000_000_000_000_000, 1_699_999_999_000_000_000] * 10,
+        ):
+            with self.subTest(calls=len(clock)):
+                with mock.patch("api.uids.time.time_ns", side_effect=clock):
+                    uids = [generator() for _ in clock]
+                self.assertEqual(uids, sorted(set(uids)))
+        self.assertGreater(get_uid_timestamp(uids[-1]), 1_700_000_000)
+
+
+class GenerateUIDTestCase(TestCase):
+    """
+    Тесты выбора версии UID новых серверов.
+    """
+
+    def test_default_version(self):
+        """
+        По умолчанию создаются UUID версии 4.
+        """
+        self.assertEqual(generate_uid().version, 4)
+
+    @override_settings(VPS_UID_SETTINGS={"VERSION": 7})
+    def test_uuid7_with_existing_rows(self):
+        """
+        Серверы с UUID версии 7 соседствуют с серверами версии 4,
+        а в списке следуют в порядке создания после них.
+        """
+        old = VPS.objects.create(
+            uid=uuid.UUID("00000000-0000-4000-8000-000000000000"),
+            cpu=2,
+            ram=2,
+            hdd=5,
+            status="started",
+        )
+        created = VPS.objects.bulk_create(
+            VPS(cpu=2, ram=2, hdd=5, status="started") for _ in range(3)
+        )
+        created.append(VPS.objects.create(cpu=4, ram=4, hdd=10, status="stopped"))
+        self.assertEqual({vps.uid.version for vps in created}, {7})
+        servers = self.client.get(reverse("vps-list")).json()["servers"]
+        self.assertEqual(
+            [server["uid"] for server in servers],
+            [str(vps.uid) for vps in [old, *created]],
+        )
@@ -1,8 +1,20 @@
-from django.test import TestCase
+import io
+import json
+from unittest import mock, skipIf
+
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
 from rest_framework.test import APIClient
 
-from api.models import VPS
+from api.cache import response_cache
+from api.models import VPS, VPSChange
+from api.v1 import views
+from api.v1.parsers import MessagePackParser
+from api.v1.renderers import MessagePackRenderer, msgpack
+from api.v1.serializers import VPSSerializer
 
 
 class VPSViewSetTestCase(TestCase):
@@ -39,6 +51,122 @@ class VPSViewSetTestCase(TestCase):
         response = self.client.get(self.list_vps)
         self.assertEqual(response.status_code, 200)
         self.assertIn("servers", response.data)
+        self.assertIn("next", response.data)
+        self.assertIn("prev", response.data)
+
+    def test_list_vps_matches_serializer_output(self):
+        """
+        Тест того, что быстрый путь списка побайтово совпадает с выводом
+        VPSSerializer и стандартного JSONRenderer.
+        """
+        VPS.objects.create(cpu=16, ram=64, hdd=1000, status="stopped")
+        response = self.client.get(self.list_vps)
+        expected = JSONRenderer().render(
+            {
+                "servers": VPSSerializer(VPS.objects.order_by("uid"), many=True).data,
+                "next": None,
+                "prev": None,
+            }
+        )
+        self.assertEqual(response.content, expected)
+
+    def test_list_vps_filtered_single_query(self):
+        """
+        Тест того, что отфильтрованный список выбирается за один запрос к БД:
+        ETag и Last-Modified строятся без запросов.
+        """
+        VPS.objects.create(cpu=16, ram=64, hdd=1000, status="stopped")
+        VPS.objects.create(cpu=4, ram=16, hdd=200, status="blocked")
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                self.list_vps,
+                {"status__in": "started,stopped", "cpu_min": 8, "ram_max": 64},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data["servers"]), 2)
+
+    def test_list_vps_fields(self):
+        """
+        Тест списка VPS с параметром fields: в SQL-запрос и в ответ попадают
+        только запрошенные поля и UID.
+        """
+        with self.assertNumQueries(1) as context:
+            response = self.client.get(self.list_vps, {"fields": "status,cpu"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json()["servers"],
+            [{"uid": str(self.vps.uid), "cpu": 8, "status": "started"}],
+        )
+        page_sql = context.captured_queries[0]["sql"]
+        self.assertIn('"status"', page_sql)
+        self.assertNotIn('"ram"', page_sql)
+
+    def test_retrieve_vps_fields(self):
+        """
+        Тест получения VPS с параметром fields и с неизвестным полем.
+        """
+        url = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+        with self.assertNumQueries(1) as context:
+            response = self.client.get(url, {"fields": "ram"})
+        self.assertEqual(response.json(), {"uid": str(self.vps.uid), "ram": 32})
+        self.assertNotIn('"hdd"', context.captured_queries[0]["sql"])
+        self.assertEqual(response["ETag"], self.vps.etag)
+
+        response = self.client.get(url, {"fields": "ram,password"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fields", response.json())
+
+    def test_list_vps_invalid_filter(self):
+        """
+        Тест получения списка VPS с недопустимым значением фильтра.
+        """
+        response = self.client.get(self.list_vps, {"status__in": "started,reserved"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status__in", response.data)
+
+    def test_list_vps_cursor_pagination(self):
+        """
+        Тест курсорной пагинации списка VPS.
+        Проверяется, что обход по курсорам ``next`` возвращает все серверы
+        ровно один раз в порядке UID, а ``prev`` возвращает на предыдущую страницу.
+        """
+        for _ in range(4):
+            VPS.objects.create(cpu=4, ram=8, hdd=50, status="stopped")
+
+        response = self.client.get(self.list_vps, {"limit": 2})
+        first_page = response.json()["servers"]
+        self.assertEqual(len(first_page), 2)
+        self.assertIsNone(response.json()["prev"])
+
+        uids = [server["uid"] for server in first_page]
+        next_link = response.json()["next"]
+        while next_link:
+            response = self.client.get(next_link)
+            uids.extend(server["uid"] for server in response.json()["servers"])
+            next_link = response.json()["next"]
+
+        expected = [
+            str(uid)
+            for uid in VPS.objects.order_by("uid").values_list("uid", flat=True)
+        ]
+        self.assertEqual(uids, expected)
+
+        response = self.client.get(response.json()["prev"])
+        self.assertEqual(
+            [server["uid"] for server in response.json()["servers"]], expected[2:4]
+        )
+
+    def test_list_vps_cursor_page_query(self):
+        """
+        Тест того, что страница выбирается одним запросом по курсору без OFFSET.
+        """
+        VPS.objects.create(cpu=4, ram=8, hdd=50, status="stopped")
+        response = self.client.get(self.list_vps, {"limit": 1})
+        with self.assertNumQueries(1) as context:
+            self.client.get(response.data["next"])
+        sql = context.captured_queries[0]["sql"]
+        self.assertIn('"uid" >', sql)
+        self.assertNotIn("OFFSET", sql)
 
     def test_retrieve_vps(self):
         """
@@ -47,6 +175,67 @@ class VPSViewSetTestCase(TestCase):
         response = self.client.get(reverse("vps-detail", kwargs={"uid": self.vps.uid}))
         self.assertEqual(response.status_code, 200)
 
+    def test_list_vps_not_modified(self):
+        """
+        Тест условного GET списка по ETag.
+        Проверяется, что при неизменных данных 304 возвращается без запросов
+        к БД, даже если ответа нет в кэше, а после записи - 200 с новым ETag.
+        """
+        response = self.client.get(self.list_vps, {"status": "started"})
+        etag = response["ETag"]
+        self.assertIn("Last-Modified", response)
+
+        # Ответ вытеснен из кэша, поколение данных сохранилось
+        generation = response_cache.get_generation()
+        cache.clear()
+        cache.set(response_cache.generation_key, generation, None)
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.list_vps, {"status": "started"}, HTTP_IF_NONE_MATCH=etag
+            )
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+        response = self.client.get(
+            self.list_vps, {"status": "started"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 304)
+
+        self.vps.update_status("stopped")
+        response = self.client.get(
+            self.list_vps, {"status": "started"}, HTTP_IF_NONE_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_list_vps_not_modified_since(self):
+        """
+        Тест условного GET списка по If-Modified-Since.
+        """
+        last_modified = self.client.get(self.list_vps)["Last-Modified"]
+        response = self.client.get(self.list_vps, HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, 304)
+        response = self.client.get(
+            self.list_vps, HTTP_IF_MODIFIED_SINCE="Mon, 01 Jan 2001 00:00:00 GMT"
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_retrieve_vps_not_modified(self):
+        """
+        Тест условного GET сервера по ETag.
+        """
+        url = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+        etag = self.client.get(url)["ETag"]
+        cache.clear()
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.client.patch(url, data={"status": "stopped"}, format="json")
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status"], "stopped")
+
     def test_retrieve_unknown_vps(self):
         """
         Тест получения несуществующего VPS по UID.
@@ -60,6 +249,119 @@ class VPSViewSetTestCase(TestCase):
             response.json()["detail"], "Не найден сервер по указанному UID"
         )
 
+    def test_lookup_vps(self):
+        """
+        Тест получения нескольких VPS по списку UID в строке запроса.
+        Серверы возвращаются в порядке запроса, повторы UID не дублируются,
+        ненайденные UID перечисляются в missing.
+        """
+        other = VPS.objects.create(cpu=4, ram=16, hdd=200, status="stopped")
+        unknown = "00000000-0000-0000-0000-000000000000"
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("vps-lookup"),
+                {"uids": f"{other.uid},{unknown},{self.vps.uid},{other.uid}"},
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "servers": [
+                    VPSSerializer(other).data | {"uid": str(other.uid)},
+                    VPSSerializer(self.vps).data | {"uid": str(self.vps.uid)},
+                ],
+                "missing": [unknown],
+            },
+        )
+
+    def test_lookup_vps_post_chunked(self):
+        """
+        Тест получения VPS по списку UID в теле запроса. Список UID длиннее
+        предела параметров запроса СУБД выбирается несколькими запросами IN.
+        """
+        uids = [str(self.vps.uid)] + [
+            str(vps.uid)
+            for vps in VPS.objects.bulk_create(
+                VPS(cpu=2, ram=2, hdd=5, status="started") for _ in range(4)
+            )
+        ]
+        with mock.patch.object(connection.features, "max_query_params", 2):
+            with self.assertNumQueries(3):
+                response = self.client.post(
+                    reverse("vps-lookup"), {"uids": uids}, format="json"
+                )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([server["uid"] for server in response.json()["servers"]], uids)
+        self.assertEqual(response.json()["missing"], [])
+
+    def test_lookup_vps_invalid(self):
+        """
+        Тест получения VPS по некорректному или пустому списку UID.
+        """
+        for params in ({"uids": "not-a-uuid"}, {}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse("vps-lookup"), params)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("uids", response.json())
+
+    @override_settings(VPS_EXPORT_SETTINGS={"CHUNK_SIZE": 2})
+    def test_export_vps_ndjson(self):
+        """
+        Тест потоковой выгрузки VPS в формате NDJSON.
+        Проверяется, что строки совпадают с сериализованными объектами списка,
+        а БД читается порциями по одному запросу на порцию.
+        """
+        for _ in range(4):
+            VPS.objects.create(cpu=4, ram=8, hdd=50, status="stopped")
+
+        response = self.client.get(reverse("vps-export"))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertTrue(response["Content-Type"].startswith("application/x-ndjson"))
+        with self.assertNumQueries(3):
+            lines = b"".join(response.streaming_content).decode().splitlines()
+
+        servers = self.client.get(self.list_vps).json()["servers"]
+        self.assertEqual([json.loads(line) for line in lines], servers)
+
+    def test_export_vps_csv_fields(self):
+        """
+        Тест потоковой выгрузки VPS в формате CSV с параметром fields.
+        """
+        response = self.client.get(
+            reverse("vps-export"), {"format": "csv", "fields": "status"}
+        )
+        self.assertEqual(
+            b"".join(response.streaming_content).decode().splitlines(),
+            ["uid,status", f"{self.vps.uid},started"],
+        )
+
+    def test_export_vps_csv_filtered(self):
+        """
+        Тест потоковой выгрузки VPS в формате CSV с фильтром.
+        """
+        VPS.objects.create(cpu=4, ram=8, hdd=50, status="stopped")
+        response = self.client.get(
+            reverse("vps-export"), {"format": "csv", "status": "started"}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/csv"))
+        lines = b"".join(response.streaming_content).decode().splitlines()
+        self.assertEqual(lines[0], "uid,cpu,ram,hdd,status")
+        self.assertEqual(lines[1:], [f"{self.vps.uid},8,32,500,started"])
+
+    def test_export_vps_invalid_filter(self):
+        """
+        Тест потоковой выгрузки VPS с недопустимым значением фильтра.
+        """
+        response = self.client.get(
+            reverse("vps-export"),
+            {"status": "reserved"},
+            HTTP_ACCEPT="application/x-ndjson",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", json.loads(response.content))
+
     def test_create_vps(self):
         """
         Тест создания нового VPS с корректными данными.
@@ -93,6 +395,156 @@ class VPSViewSetTestCase(TestCase):
             "Убедитесь, что это значение меньше либо равно 4096.",
         )
 
+    def test_batch_create_vps(self):
+        """
+        Тест пакетного создания VPS.
+        Проверяется, что все серверы сохраняются, а нечётный RAM округляется.
+        """
+        data = [self.valid_data, {"cpu": 2, "ram": 4, "hdd": 10, "status": "started"}]
+        # Пакетные INSERT серверов и записей журнала VPSChange, UPDATE сводки
+        with self.assertNumQueries(3):
+            response = self.client.post(
+                reverse("vps-batch-create"), data=data, format="json"
+            )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["servers"]), 2)
+        self.assertEqual(response.data["servers"][0]["ram"], 16)
+        self.assertNotIn("errors", response.data)
+        self.assertEqual(VPS.objects.count(), 3)
+        self.assertEqual(VPSChange.objects.filter(action=VPSChange.CREATE).count(), 3)
+
+    def test_batch_create_vps_invalid(self):
+        """
+        Тест пакетного создания VPS с невалидным элементом.
+        Проверяется, что пакет отклоняется целиком, а ошибки привязаны к индексам.
+        """
+        response = self.client.post(
+            reverse("vps-batch-create"),
+            data=[self.valid_data, self.invalid_data],
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()[0], {})
+        self.assertIn("status", response.json()[1])
+        self.assertEqual(VPS.objects.count(), 1)
+
+    def test_batch_create_vps_skip_invalid(self):
+        """
+        Тест пакетного создания VPS в режиме ``skip_invalid``.
+        Проверяется, что валидные элементы сохраняются, а ошибки возвращаются.
+        """
+        uid = "123e4567-e89b-12d3-a456-426614174000"
+        data = [
+            dict(self.valid_data, uid=uid),
+            self.invalid_data,
+            dict(self.valid_data, uid=uid),
+        ]
+        response = self.client.post(
+            reverse("vps-batch-create") + "?skip_invalid=true",
+            data=data,
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["servers"]), 1)
+        self.assertEqual([error["index"] for error in response.data["errors"]], [1, 2])
+        self.assertIn("ram", response.data["errors"][0]["errors"])
+        self.assertIn("uid", response.data["errors"][1]["errors"])
+        self.assertEqual(VPS.objects.count(), 2)
+
+    def test_batch_create_vps_not_a_list(self):
+        """
+        Тест пакетного создания VPS с объектом вместо списка.
+        """
+        response = self.client.post(
+            reverse("vps-batch-create"), data=self.valid_data, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.data)
+
+    def test_bulk_status_by_filter(self):
+        """
+        Тест массовой смены статуса по параметрам фильтра.
+        Проверяется, что изменение выполняется одним UPDATE
+        (плюс итоги выборки, обновление сводки VPSStats и запись в журнал).
+        """
+        VPS.objects.create(cpu=16, ram=64, hdd=1000, status="started")
+        VPS.objects.create(cpu=4, ram=16, hdd=200, status="stopped")
+        with self.assertNumQueries(4) as context:
+            response = self.client.post(
+                reverse("vps-bulk-status") + "?cpu_min=8",
+                data={"status": "blocked"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {"updated": 2})
+        self.assertTrue(
+            context.captured_queries[1]["sql"].startswith('UPDATE "api_vps"')
+        )
+        self.assertEqual(VPS.objects.filter(status="blocked").count(), 2)
+
+    def test_bulk_status_by_uids(self):
+        """
+        Тест массовой смены статуса по списку UID с возвратом изменённых UID.
+        Серверы, уже находящиеся в целевом статусе, не считаются изменёнными.
+        """
+        other = VPS.objects.create(cpu=4, ram=16, hdd=200, status="stopped")
+        response = self.client.post(
+            reverse("vps-bulk-status"),
+            data={
+                "status": "stopped",
+                "uids": [str(self.vps.uid), str(other.uid)],
+                "return_uids": True,
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["updated"], 1)
+        self.assertEqual(response.json()["uids"], [str(self.vps.uid)])
+        self.vps.refresh_from_db()
+        self.assertEqual(self.vps.status, "stopped")
+
+    def test_bulk_status_requires_selection(self):
+        """
+        Тест массовой смены статуса без списка UID и без фильтров.
+        """
+        response = self.client.post(
+            reverse("vps-bulk-status"), data={"status": "stopped"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("non_field_errors", response.data)
+        self.assertEqual(VPS.objects.filter(status="stopped").count(), 0)
+
+    def test_bulk_status_requires_filter_value(self):
+        """
+        Тест массовой смены статуса с пустыми значениями фильтров:
+        пустой фильтр не выбирает серверы, и UPDATE не выполняется.
+        """
+        for query in ("status=", "cpu=&status__in=", "uid="):
+            with self.subTest(query=query):
+                response = self.client.post(
+                    f"{reverse('vps-bulk-status')}?{query}",
+                    data={"status": "stopped"},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("non_field_errors", response.data)
+        self.assertEqual(VPS.objects.filter(status="stopped").count(), 0)
+
+    def test_bulk_status_invalid_status(self):
+        """
+        Тест массовой смены статуса на недопустимый статус.
+        """
+        response = self.client.post(
+            reverse("vps-bulk-status") + "?status=started",
+            data={"status": "reversed"},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["status"][0],
+            "Невалидный статус. Пожалуйста, выберите из списка ('started', 'stopped', 'blocked')",
+        )
+
     def test_partial_update_vps(self):
         """
         Тест частичного обновления VPS (статус).
@@ -105,6 +557,95 @@ class VPSViewSetTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.data["status"], "stopped")
 
+    def test_partial_update_writes_only_status(self):
+        """
+        Тест того, что частичное обновление записывает только статус и версию.
+        Запросы: чтение сервера, итоги для сводки, UPDATE сервера,
+        UPDATE сводки VPSStats, запись в журнал изменений VPSChange.
+        """
+        with self.assertNumQueries(5) as context:
+            response = self.client.patch(
+                reverse("vps-detail", kwargs={"uid": self.vps.uid}),
+                data={"status": "stopped"},
+                format="json",
+            )
+        self.assertEqual(response.status_code, 200)
+        update_sql = context.captured_queries[2]["sql"]
+        self.assertTrue(update_sql.startswith("UPDATE"))
+        self.assertIn('"status"', update_sql)
+        self.assertNotIn('"ram"', update_sql)
+        self.assertEqual(response["ETag"], '"2"')
+
+    def test_partial_update_if_match(self):
+        """
+        Тест частичного обновления с актуальным ETag в заголовке If-Match.
+        """
+        url = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+        etag = self.client.get(url)["ETag"]
+        response = self.client.patch(
+            url, data={"status": "stopped"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_partial_update_if_match_conflict(self):
+        """
+        Тест частичного обновления с устаревшим ETag в заголовке If-Match.
+        Проверяется, что возвращается 412, а статус не изменяется.
+        """
+        url = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+        etag = self.client.get(url)["ETag"]
+        self.client.patch(url, data={"status": "blocked"}, format="json")
+        response = self.client.patch(
+            url, data={"status": "stopped"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 412)
+        self.vps.refresh_from_db()
+        self.assertEqual(self.vps.status, "blocked")
+
+    def test_partial_update_same_status(self):
+        """
+        Тест частичного обновления статусом, который у сервера уже есть.
+        Проверяется, что версия и журнал изменений не меняются, а запрос
+        с актуальным If-Match не получает 412.
+        """
+        url = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+        etag = self.client.get(url)["ETag"]
+        changes = VPSChange.objects.count()
+        response = self.client.patch(
+            url, data={"status": "started"}, format="json", HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(VPSChange.objects.count(), changes)
+        self.vps.refresh_from_db()
+        self.assertEqual(self.vps.version, 1)
+
+    def test_partial_update_concurrent_write(self):
+        """
+        Тест конкурентного изменения между чтением и записью объекта.
+        Проверяется, что условная запись не перезаписывает чужое изменение.
+        """
+        self.assertTrue(self.vps.update_status("stopped"))
+        stale = VPS.objects.get(uid=self.vps.uid)
+        self.assertTrue(self.vps.update_status("blocked", version=self.vps.version))
+        self.assertFalse(stale.update_status("started", version=stale.version))
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, "blocked")
+        self.assertEqual(stale.version, 3)
+
+    def test_partial_update_stale_version(self):
+        """
+        Тест записи статуса без If-Match из устаревшего объекта.
+        Проверяется, что новая версия объекта берётся из БД, а не считается
+        от устаревшей.
+        """
+        stale = VPS.objects.get(uid=self.vps.uid)
+        self.assertTrue(self.vps.update_status("stopped"))
+        self.assertTrue(stale.update_status("blocked"))
+        self.assertEqual(stale.version, 3)
+        self.assertEqual(stale.etag, VPS.objects.get(uid=self.vps.uid).etag)
+
     def test_partial_update_invalid_status(self):
         """
         Тест частичного обновления VPS с некорректным статусом.
@@ -120,3 +661,150 @@ class VPSViewSetTestCase(TestCase):
             response.json()["status"][0],
             "Невалидный статус. Пожалуйста, выберите из списка ('started', 'stopped', 'blocked')",
         )
+
+
+@skipIf(msgpack is None, "msgpack is not installed")
+class VPSMessagePackTestCase(TestCase):
+    """
+    Тесты формата MessagePack в API VPS: ответы совпадают с JSON
+    по структуре, UID передаются объектами UUID.
+    """
+
+    def setUp(self):
+        """
+        Очищает кэш и создаёт тестовый сервер.
+        """
+        cache.clear()
+        self.client = APIClient()
+        self.vps = VPS.objects.create(cpu=8, ram=32, hdd=500, status="started")
+
+    def request(self, method, url, data=None, **params):
+        """
+        Выполняет запрос с телом и ответом в формате MessagePack.
+
+        :return: Ответ и его разобранное тело
+        """
+        kwargs = {"HTTP_ACCEPT": MessagePackRenderer.media_type}
+        if data is not None:
+            kwargs["data"] = MessagePackRenderer().render(data)
+            kwargs["content_type"] = MessagePackRenderer.media_type
+        elif params:
+            kwargs["data"] = params
+        response = getattr(self.client, method)(url, **kwargs)
+        self.assertEqual(response["Content-Type"], MessagePackRenderer.media_type)
+        self.assertIn("Accept", response["Vary"])
+        return response, MessagePackParser().parse(io.BytesIO(response.content))
+
+    def assertMatchesJSON(self, url, **params):
+        """
+        Проверяет, что ответ MessagePack совпадает с ответом JSON.
+        """
+        _, data = self.request("get", url, **params)
+        self.assertEqual(
+            json.loads(JSONRenderer().render(data)), self.client.get(url, params).json()
+        )
+        return data
+
+    def test_read(self):
+        """
+        Список, сервер, поиск по UID, статистика и лента изменений
+        в MessagePack совпадают с JSON.
+        """
+        detail = reverse("vps-detail", kwargs={"uid": self.vps.uid})
+        data = self.assertMatchesJSON(reverse("vps-list"))
+        self.assertEqual(data["servers"][0]["uid"], self.vps.uid)
+        self.assertEqual(self.assertMatchesJSON(detail)["uid"], self.vps.uid)
+        self.assertMatchesJSON(detail, fields="status")
+        self.assertMatchesJSON(reverse("vps-lookup"), uids=str(self.vps.uid))
+        self.assertMatchesJSON(reverse("vps-stats"))
+        self.assertMatchesJSON(reverse("vps-changes"), since=0)
+
+    def test_write(self):
+        """
+        Создание, пакетное создание, смена статуса и поиск по UID принимают
+        тело в MessagePack, в том числе UID в расширении UUID.
+        """
+        response, data = self.request(
+            "post",
+            reverse("vps-list"),
+            {"cpu": 4, "ram": 17, "hdd": 100, "status": "stopped"},
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(data["ram"], 16)
+        created = data["uid"]
+
+        response, data = self.request(
+            "post",
+            reverse("vps-batch-create"),
+            [{"cpu": 2, "ram": 4, "hdd": 10, "status": "started"}],
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(data["servers"]), 1)
+
+        response, data = self.request(
+            "patch",
+            reverse("vps-detail", kwargs={"uid": created}),
+            {"status": "blocked"},
+        )
+        self.assertEqual(data["status"], "blocked")
+
+        response, data = self.request(
+            "post",
+            reverse("vps-bulk-status"),
+            {"uids": [self.vps.uid, created], "status": "stopped", "return_uids": True},
+        )
+        self.assertEqual(set(data["uids"]), {self.vps.uid, created})
+
+        response, data = self.request(
+            "post", reverse("vps-lookup"), {"uids": [created, self.vps.uid]}
+        )
+        self.assertEqual(
+            [server["uid"] for server in data["servers"]], [created, self.vps.uid]
+        )
+
+    def test_errors(self):
+        """
+        Ошибки проверки и разбора тела отдаются в MessagePack.
+        """
+        response, data = self.request(
+            "post",
+            reverse("vps-list"),
+            {"cpu": 4, "ram": 2, "hdd": 10, "status": "reversed"},
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", data)
+        response = self.client.post(
+            reverse("vps-list"),
+            data=b"\xc1",
+            content_type=MessagePackRenderer.media_type,
+            HTTP_ACCEPT=MessagePackRenderer.media_type,
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_export(self):
+        """
+        Потоковая выгрузка в MessagePack - последовательность объектов,
+        совпадающая со списком.
+        """
+        response = self.client.get(reverse("vps-export"), {"format": "msgpack"})
+        self.assertEqual(response["Content-Type"], "application/msgpack")
+        unpacker = msgpack.Unpacker(ext_hook=MessagePackParser().ext_hook)
+        unpacker.feed(b"".join(response.streaming_content))
+        _, data = self.request("get", reverse("vps-list"))
+        self.assertEqual(list(unpacker), data["servers"])
+
+    def test_without_msgpack(self):
+        """
+        Без пакета msgpack формат не предлагается: 406 и 415.
+        """
+        with mock.patch.object(views, "msgpack", None):
+            response = self.client.get(
+                reverse("vps-list"), HTTP_ACCEPT=MessagePackRenderer.media_type
+            )
+            self.assertEqual(response.status_code, 406)
+            response = self.client.post(
+                reverse("vps-list"),
+                data=MessagePackRenderer().render({"cpu": 4}),
+                content_type=MessagePackRenderer.media_type,
+            )
+            self.assertEqual(response.status_code, 415)
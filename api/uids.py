@@ -0,0 +1,79 @@
+import os
+import threading
+import time
+import uuid
+
+from django.conf import settings
+
+
+class UUID7Generator:
+    """
+    Генератор UUID версии 7 (RFC 9562): 48 бит времени Unix
+    в миллисекундах, 12 бит счётчика и 62 случайных бита.
+
+    UUID, созданные одним процессом, строго возрастают: в пределах
+    миллисекунды растёт счётчик (начинается со случайного значения
+    в нижней половине диапазона), при его переполнении или переводе
+    часов назад время берётся на миллисекунду больше предыдущего.
+    Поэтому новые ключи попадают в правый край индекса первичного ключа.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.last_ms = 0
+        self.counter = 0
+
+    def __call__(self):
+        """
+        :return: Новый UUID версии 7
+        """
+        with self.lock:
+            now_ms = time.time_ns() // 1_000_000
+            if now_ms > self.last_ms:
+                self.last_ms = now_ms
+                self.counter = int.from_bytes(os.urandom(2)) & 0x7FF
+            elif self.counter < 0xFFF:
+                self.counter += 1
+            else:
+                self.last_ms += 1
+                self.counter = 0
+            ms, counter = self.last_ms, self.counter
+        random_bits = int.from_bytes(os.urandom(8)) >> 2
+        return uuid.UUID(
+            int=(ms & 0xFFFFFFFFFFFF) << 80
+            | 0x7 << 76  # Версия
+            | counter << 64
+            | 0b10 << 62  # Вариант RFC 9562
+            | random_bits
+        )
+
+
+uuid7 = UUID7Generator()
+
+UID_GENERATORS = {
+    4: uuid.uuid4,
+    7: uuid7,
+}
+
+
+def generate_uid():
+    """
+    Возвращает UID нового сервера версии ``VPS_UID_SETTINGS["VERSION"]``.
+    UID обеих версий хранятся в одном столбце и могут соседствовать
+    в таблице.
+
+    :return: UUID
+    """
+    return UID_GENERATORS[settings.VPS_UID_SETTINGS["VERSION"]]()
+
+
+def get_uid_timestamp(uid):
+    """
+    Возвращает время создания, записанное в UUID версии 7.
+
+    :param uid: UUID
+    :return: Время Unix в секундах или None для других версий
+    """
+    if uid.version != 7:
+        return None
+    return (uid.int >> 80) / 1000
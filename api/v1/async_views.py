@@ -0,0 +1,310 @@
+from asgiref.sync import sync_to_async
+from django.http import Http404
+from django.utils.cache import patch_vary_headers
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from django_filters.utils import translate_validation
+from rest_framework import status
+from rest_framework.negotiation import DefaultContentNegotiation
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.views import exception_handler
+
+from api.cache import response_cache
+from api.changes import change_notifier
+from api.models import VPS, VPSChange
+from api.v1.exceptions import PreconditionFailed
+from api.v1.filters import VPSFilter
+from api.v1.mixins import ChangeFeedMixin, ConditionalResponseMixin, SparseFieldsMixin
+from api.v1.pagination import VPSCursorPagination
+from api.v1.parsers import MessagePackParser
+from api.v1.renderers import (
+    EventStreamRenderer,
+    FastJSONRenderer,
+    MessagePackRenderer,
+    msgpack,
+)
+from api.v1.serializers import VPSSerializer
+
+
+class VPSAsyncAPIView(ConditionalResponseMixin, SparseFieldsMixin, View):
+    """
+    Базовое асинхронное представление API VPS для ASGI.
+
+    Обработчики - корутины, поэтому ASGI-сервер выполняет их в цикле событий
+    без выделения потока на запрос: поток занимается только на время
+    обращений к БД через асинхронный ORM Django. Запросы и ответы
+    обрабатываются так же, как в VPSViewSet: тело разбирается JSONParser
+    или MessagePackParser по Content-Type, ошибки преобразуются обработчиком
+    исключений DRF, формат ответа (JSON или MessagePack, без Browsable API)
+    выбирается по заголовку Accept. MessagePack доступен, только если
+    установлен пакет msgpack.
+    """
+
+    parser_classes = (JSONParser, MessagePackParser)
+    renderer_classes = (FastJSONRenderer, MessagePackRenderer)
+    content_negotiation_class = DefaultContentNegotiation
+    serializer_class = VPSSerializer
+    filterset_class = VPSFilter
+    pagination_class = VPSCursorPagination
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        """
+        Возвращает представление без проверки CSRF, как у APIView.
+        """
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        """
+        Оборачивает запрос в Request DRF, выбирает формат ответа, вызывает
+        обработчик метода и отрисовывает ответ.
+
+        :param request: Запрос Django
+        :return: Ответ
+        """
+        request = Request(request, parsers=self.get_parsers())
+        self.request = request
+        try:
+            request.accepted_renderer, request.accepted_media_type = (
+                self.perform_content_negotiation(request)
+            )
+            response = await super().dispatch(request, *args, **kwargs)
+        except Exception as exc:
+            response = exception_handler(exc, {"view": self, "request": request})
+            if response is None:
+                raise
+        if isinstance(response, Response):
+            if not hasattr(request, "accepted_renderer"):
+                # Формат не выбран (406): ошибка выводится первым рендерером
+                request.accepted_renderer, request.accepted_media_type = (
+                    self.perform_content_negotiation(request, force=True)
+                )
+            response.accepted_renderer = request.accepted_renderer
+            response.accepted_media_type = request.accepted_media_type
+            response.renderer_context = {"view": self, "request": request}
+            response.render()
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def get_parsers(self):
+        """
+        Возвращает парсеры тела запроса; без пакета msgpack - без MessagePack.
+        """
+        return [
+            parser()
+            for parser in self.parser_classes
+            if msgpack is not None or not issubclass(parser, MessagePackParser)
+        ]
+
+    def get_renderers(self):
+        """
+        Возвращает рендереры ответа; без пакета msgpack - без MessagePack.
+        """
+        return [
+            renderer()
+            for renderer in self.renderer_classes
+            if msgpack is not None or not issubclass(renderer, MessagePackRenderer)
+        ]
+
+    def perform_content_negotiation(self, request, force=False):
+        """
+        Выбирает рендерер по заголовку Accept (или параметру ``format``),
+        как APIView.perform_content_negotiation.
+
+        :param request: Запрос
+        :param force: Вернуть первый рендерер, если подходящего нет
+        :return: Кортеж (рендерер, тип содержимого)
+        :raises NotAcceptable: Если подходящего рендерера нет и force не задан
+        """
+        renderers = self.get_renderers()
+        try:
+            return self.content_negotiation_class().select_renderer(request, renderers)
+        except Exception:
+            if force:
+                return renderers[0], renderers[0].media_type
+            raise
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Возвращает экземпляр VPSSerializer, ограниченный полями
+        параметра ``fields``.
+        """
+        kwargs.setdefault("fields", self.get_requested_fields(self.request))
+        return self.serializer_class(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        """
+        Фильтрует серверы параметрами VPSFilter из строки запроса.
+
+        :param queryset: Исходная выборка
+        :return: Отфильтрованная выборка
+        :raises ValidationError: Если параметры фильтра некорректны
+        """
+        if not self.request.query_params:
+            # Пустой фильтр не меняет выборку, форму фильтра можно не строить
+            return queryset
+        filterset = self.filterset_class(
+            self.request.query_params, queryset=queryset, request=self.request
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return filterset.qs
+
+    async def aget_object(self, uid, fields=None):
+        """
+        Возвращает сервер по UID с учётом параметров фильтра.
+
+        :param uid: UID сервера
+        :param fields: Поля, которые нужно прочитать из БД (кроме версии
+            и времени изменения), или None для всех полей
+        :return: Объект VPS
+        :raises Http404: Если сервер не найден
+        """
+        queryset = self.filter_queryset(VPS.objects.all())
+        if fields is not None:
+            queryset = queryset.only(*fields, "version", "updated_at")
+        try:
+            return await queryset.aget(uid=uid)
+        except VPS.DoesNotExist:
+            raise Http404(f"No {VPS._meta.object_name} matches the given query.")
+
+    async def ais_valid(self, serializer):
+        """
+        Проверяет данные сериализатора.
+        Проверка уникальности UID обращается к БД, поэтому выполняется
+        так же, как запросы асинхронного ORM.
+
+        :param serializer: Сериализатор с данными запроса
+        :raises ValidationError: Если данные некорректны
+        """
+        await sync_to_async(serializer.is_valid)(raise_exception=True)
+
+
+class VPSAsyncListView(VPSAsyncAPIView):
+    """
+    Асинхронные list и create для ``/api/v1/vps``.
+    """
+
+    http_method_names = ["get", "post", "options"]
+    actions = {"get": "list", "post": "create"}  # Действия VPSViewSet для метрик
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Получение списка VPS серверов с возможностью фильтрации.
+        Повторяет VPSViewSet.list: кэш ответов, ETag / Last-Modified,
+        курсорная пагинация и выборка строк через ``values()``.
+        """
+        key = await response_cache.amake_key(request, "list")
+        cached = await response_cache.aget(key)
+        if cached is None:
+            queryset = self.filter_queryset(VPS.objects.all())
+            etag, last_modified = response_cache.get_validators(key)
+            not_modified = self.get_not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            paginator = self.pagination_class()
+            page = await paginator.apaginate_queryset(
+                queryset.values(*self.get_serializer().fields), request, view=self
+            )
+            cached = (paginator.get_paginated_response(page).data, etag, last_modified)
+            await response_cache.aset(key, cached)
+        return self.get_conditional_response(request, *cached)
+
+    async def post(self, request, *args, **kwargs):
+        """
+        Создание нового VPS сервера на основе данных запроса.
+        """
+        serializer = self.get_serializer(data=request.data)
+        await self.ais_valid(serializer)
+        serializer.instance = await VPS.objects.acreate(**serializer.validated_data)
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+
+
+class VPSAsyncDetailView(VPSAsyncAPIView):
+    """
+    Асинхронные retrieve и partial_update для ``/api/v1/vps/<uid>``.
+    """
+
+    http_method_names = ["get", "patch", "options"]
+    actions = {"get": "retrieve", "patch": "partial_update"}
+
+    async def get(self, request, uid, *args, **kwargs):
+        """
+        Получение VPS сервера по UID.
+        Повторяет VPSViewSet.retrieve: кэш ответов, ETag / Last-Modified.
+        """
+        key = await response_cache.amake_key(request, "retrieve")
+        cached = await response_cache.aget(key)
+        if cached is None:
+            instance = await self.aget_object(uid, self.get_requested_fields(request))
+            not_modified = self.get_not_modified_response(
+                request, instance.etag, instance.updated_at
+            )
+            if not_modified is not None:
+                return not_modified
+            data = self.get_serializer(instance).data
+            cached = (data, instance.etag, instance.updated_at)
+            await response_cache.aset(key, cached)
+        return self.get_conditional_response(request, *cached)
+
+    async def patch(self, request, uid, *args, **kwargs):
+        """
+        Частичное обновление данных существующего VPS.
+        Повторяет VPSViewSet.partial_update: записывается только статус,
+        заголовок If-Match проверяется по версии сервера.
+        """
+        instance = await self.aget_object(uid)
+        version = self.get_if_match_version(request, instance)
+        serializer = self.get_serializer(instance, data=request.data, partial=True)
+        await self.ais_valid(serializer)
+
+        if "status" in serializer.validated_data:
+            if not await instance.aupdate_status(
+                serializer.validated_data["status"], version=version
+            ):
+                raise PreconditionFailed()
+
+        return Response(
+            serializer.data, status=status.HTTP_200_OK, headers={"ETag": instance.etag}
+        )
+
+
+class VPSAsyncChangesView(ChangeFeedMixin, VPSAsyncAPIView):
+    """
+    Асинхронная лента изменений для ``/api/v1/vps/changes``.
+    Ожидание long-poll и поток Server-Sent Events выполняются в цикле
+    событий, поэтому ожидающие клиенты не занимают потоков.
+    """
+
+    http_method_names = ["get", "options"]
+    actions = {"get": "changes"}
+    renderer_classes = (FastJSONRenderer, EventStreamRenderer, MessagePackRenderer)
+
+    async def get(self, request, *args, **kwargs):
+        """
+        Лента изменений VPS. Повторяет VPSViewSet.changes; поток событий
+        выбирается заголовком ``Accept: text/event-stream`` или параметром
+        ``format=sse``.
+        """
+        query = self.get_changes_query(request)
+        changes = VPSChange.objects.all()
+        since = query.get("since")
+        if since is None:
+            since = await changes.aget_last_seq()
+
+        async def fetch(seq):
+            return [change async for change in changes.since(seq, query["limit"])]
+
+        renderer = request.accepted_renderer
+        if isinstance(renderer, EventStreamRenderer):
+            return self.get_event_stream_response(
+                renderer.astream(change_notifier.astream(fetch, since))
+            )
+        return Response(
+            data=self.get_changes_data(
+                await change_notifier.apoll(fetch, since, query["wait"]), since
+            ),
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,204 @@
+import hashlib
+import threading
+from collections import namedtuple
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse
+from django.utils import translation
+from django.utils.cache import patch_vary_headers
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson, OpenAPICodecYaml
+from drf_yasg.renderers import _SpecRenderer
+from rest_framework.response import Response
+
+from api.v1.mixins import ConditionalResponseMixin
+from api.v1.schema import api_info, schema_view
+
+# Готовый документ схемы: содержимое и ETag по хешу содержимого
+SchemaDocument = namedtuple("SchemaDocument", ("content", "etag"))
+
+
+class SchemaDocuments:
+    """
+    Предвычисленные документы схемы OpenAPI.
+
+    Схема генерируется один раз на процесс для каждого языка из
+    ``LANGUAGES`` (описания в схеме переводятся через gettext_lazy) и каждого
+    формата (JSON, YAML), после чего отдаётся из памяти. Если в
+    ``VPS_SCHEMA_SETTINGS["DIRECTORY"]`` лежат файлы, созданные командой
+    ``generate_openapi_schema`` при сборке, схема читается из них без генерации.
+    """
+
+    codecs = {"json": OpenAPICodecJson, "yaml": OpenAPICodecYaml}
+
+    def __init__(self):
+        self.documents = None
+        self.ui_schema = None
+        self.lock = threading.Lock()
+
+    @property
+    def languages(self):
+        """
+        Коды языков, для которых генерируется схема.
+        """
+        return [code for code, _name in settings.LANGUAGES]
+
+    @staticmethod
+    def make_document(content):
+        """
+        Создаёт документ схемы с ETag по хешу содержимого.
+
+        :param content: Содержимое документа (bytes)
+        :return: SchemaDocument
+        """
+        return SchemaDocument(content, f'"{hashlib.sha256(content).hexdigest()}"')
+
+    @staticmethod
+    def get_filename(language, extension):
+        """
+        Возвращает имя файла документа схемы.
+
+        :param language: Код языка
+        :param extension: Формат документа (json, yaml)
+        :return: Имя файла
+        """
+        return f"openapi.{language}.{extension}"
+
+    def generate(self):
+        """
+        Генерирует документы схемы для всех языков и форматов.
+
+        :return: Словарь {(язык, формат): SchemaDocument}
+        """
+        documents = {}
+        for language in self.languages:
+            with translation.override(language):
+                generator = schema_view.generator_class(api_info)
+                schema = generator.get_schema(request=None, public=True)
+                for extension, codec_class in self.codecs.items():
+                    content = codec_class(validators=[]).encode(schema)
+                    documents[language, extension] = self.make_document(content)
+        return documents
+
+    def load(self, directory):
+        """
+        Читает документы схемы из каталога.
+
+        :param directory: Каталог с файлами схемы
+        :return: Словарь {(язык, формат): SchemaDocument} или None,
+            если какого-либо файла нет
+        """
+        documents = {}
+        for language in self.languages:
+            for extension in self.codecs:
+                path = Path(directory) / self.get_filename(language, extension)
+                if not path.is_file():
+                    return None
+                documents[language, extension] = self.make_document(path.read_bytes())
+        return documents
+
+    def save(self, directory, documents):
+        """
+        Записывает документы схемы в каталог.
+
+        :param directory: Каталог для файлов схемы
+        :param documents: Словарь {(язык, формат): SchemaDocument}
+        :return: Список путей записанных файлов
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for (language, extension), document in documents.items():
+            path = directory / self.get_filename(language, extension)
+            path.write_bytes(document.content)
+            paths.append(path)
+        return paths
+
+    def get_documents(self):
+        """
+        Возвращает документы схемы, при первом обращении читая их из
+        каталога артефактов или генерируя.
+
+        :return: Словарь {(язык, формат): SchemaDocument}
+        """
+        if self.documents is None:
+            with self.lock:
+                if self.documents is None:
+                    directory = settings.VPS_SCHEMA_SETTINGS["DIRECTORY"]
+                    documents = self.load(directory) if directory else None
+                    self.documents = documents or self.generate()
+        return self.documents
+
+    def get(self, language, extension):
+        """
+        Возвращает документ схемы.
+
+        :param language: Код языка; неизвестный язык заменяется на LANGUAGE_CODE
+        :param extension: Формат документа (json, yaml)
+        :return: SchemaDocument
+        """
+        documents = self.get_documents()
+        if (language, extension) not in documents:
+            language = settings.LANGUAGE_CODE
+        return documents[language, extension]
+
+    def get_ui_schema(self):
+        """
+        Возвращает схему для страниц Swagger UI и ReDoc. Страницы берут из
+        неё только заголовок и версию API, а сам документ загружают отдельным
+        запросом, поэтому схема без путей создаётся один раз и генератор
+        drf_yasg не вызывается.
+
+        :return: Объект Swagger без путей
+        """
+        if self.ui_schema is None:
+            self.ui_schema = openapi.Swagger(
+                info=api_info, _prefix="/", paths=openapi.Paths({})
+            )
+        return self.ui_schema
+
+    def reset(self):
+        """
+        Сбрасывает документы схемы; следующее обращение загрузит их заново.
+        """
+        self.documents = None
+        self.ui_schema = None
+
+
+schema_documents = SchemaDocuments()
+
+
+class VPSSchemaView(ConditionalResponseMixin, schema_view):
+    """
+    Представление документации API. Схема (форматы openapi, json, yaml)
+    отдаётся из предвычисленных документов на языке из Accept-Language,
+    с ETag и ответом 304 на If-None-Match. Страницы Swagger UI и ReDoc
+    отрисовываются шаблонами drf_yasg без генерации схемы: документ они
+    запрашивают по ``?format=openapi``.
+    """
+
+    def get(self, request, version="", format=None):
+        """
+        Возвращает схему API или страницу документации.
+        """
+        renderer = request.accepted_renderer
+        if not isinstance(renderer, _SpecRenderer):
+            return Response(schema_documents.get_ui_schema())
+        extensions = {
+            codec_class: extension
+            for extension, codec_class in SchemaDocuments.codecs.items()
+        }
+        document = schema_documents.get(
+            translation.get_language_from_request(request),
+            extensions[renderer.codec_class],
+        )
+        response = self.get_not_modified_response(request, document.etag, None)
+        if response is None:
+            response = HttpResponse(
+                document.content,
+                content_type=f"{renderer.media_type}; charset={renderer.charset}",
+                headers=self.get_validator_headers(document.etag, None),
+            )
+        patch_vary_headers(response, ("Accept", "Accept-Language"))
+        return response
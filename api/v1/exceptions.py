@@ -0,0 +1,14 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PreconditionFailed(APIException):
+    """
+    Исключение для запросов, условие If-Match которых не выполнено:
+    объект был изменён после получения клиентом его ETag.
+    """
+
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = _("The server was modified by another request.")
+    default_code = "precondition_failed"
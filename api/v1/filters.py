@@ -4,16 +4,40 @@ from django_filters import rest_framework as filters
 from api.models import VPS
 
 
+class StatusInFilter(filters.BaseInFilter, filters.ChoiceFilter):
+    """
+    Фильтр по нескольким статусам, переданным через запятую.
+    Каждое значение проверяется по списку допустимых статусов.
+    """
+
+
+class UUIDInFilter(filters.BaseInFilter, filters.UUIDFilter):
+    """
+    Фильтр по нескольким UID, переданным через запятую.
+    """
+
+
 class VPSFilter(filters.FilterSet):
     """
     Фильтр для модели VPS.
     Позволяет выполнять фильтрацию по следующим параметрам:
+    - UID (один или несколько через запятую)
     - RAM (оперативная память)
     - HDD (дисковое пространство)
     - CPU (количество ядер процессора)
     - Status (текущий статус сервера)
+
+    Для ресурсов доступны диапазоны ``<поле>_min``/``<поле>_max``,
+    для статуса - перечисление ``status__in``. Любая комбинация
+    фильтров собирается в один SQL-запрос.
     """
 
+    uid = UUIDInFilter(
+        field_name="uid",
+        lookup_expr="in",
+        label=_("UID"),
+        help_text=_("Фильтрация по одному или нескольким UID через запятую."),
+    )
     ram = filters.NumberFilter(
         field_name="ram",
         lookup_expr="exact",
@@ -34,12 +58,68 @@ class VPSFilter(filters.FilterSet):
         label=_("Number CPU cores"),
         help_text=_("Фильтрация по точному значению количества ядер процессора."),
     )
+    ram_min = filters.NumberFilter(
+        field_name="ram",
+        lookup_expr="gte",
+        label=_("Min RAM (GB)"),
+        help_text=_("Минимальный объём оперативной памяти (в ГБ), включительно."),
+    )
+    ram_max = filters.NumberFilter(
+        field_name="ram",
+        lookup_expr="lte",
+        label=_("Max RAM (GB)"),
+        help_text=_("Максимальный объём оперативной памяти (в ГБ), включительно."),
+    )
+    hdd_min = filters.NumberFilter(
+        field_name="hdd",
+        lookup_expr="gte",
+        label=_("Min HDD (GB)"),
+        help_text=_("Минимальный объём дискового пространства (в ГБ), включительно."),
+    )
+    hdd_max = filters.NumberFilter(
+        field_name="hdd",
+        lookup_expr="lte",
+        label=_("Max HDD (GB)"),
+        help_text=_("Максимальный объём дискового пространства (в ГБ), включительно."),
+    )
+    cpu_min = filters.NumberFilter(
+        field_name="cpu",
+        lookup_expr="gte",
+        label=_("Min CPU cores"),
+        help_text=_("Минимальное количество ядер процессора, включительно."),
+    )
+    cpu_max = filters.NumberFilter(
+        field_name="cpu",
+        lookup_expr="lte",
+        label=_("Max CPU cores"),
+        help_text=_("Максимальное количество ядер процессора, включительно."),
+    )
     status = filters.ChoiceFilter(
         choices=VPS.STATUS_CHOICES,
         label=_("Status"),
         help_text=_("Фильтрация по статусу сервера."),
     )
+    status__in = StatusInFilter(
+        field_name="status",
+        choices=VPS.STATUS_CHOICES,
+        label=_("Statuses"),
+        help_text=_("Фильтрация по нескольким статусам, перечисленным через запятую."),
+    )
 
     class Meta:
         model = VPS
         fields = "__all__"
+        exclude = ("version", "updated_at")
+
+    def filter_queryset(self, queryset):
+        """
+        Применяет фильтры к запросу.
+        Если хотя бы один параметр не прошёл валидацию, возвращает пустую
+        выборку, а не результат фильтрации по оставшимся параметрам.
+
+        :param queryset: Исходный QuerySet
+        :return: Отфильтрованный QuerySet
+        """
+        if not self.is_valid():
+            return queryset.none()
+        return super().filter_queryset(queryset)
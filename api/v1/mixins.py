@@ -0,0 +1,186 @@
+from django.http import StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from api.v1.exceptions import PreconditionFailed
+from api.v1.serializers import VPSChangesQuerySerializer, VPSSerializer
+
+
+class ConditionalResponseMixin:
+    """
+    Условные запросы к VPS: заголовки ETag / Last-Modified ответа,
+    ответы 304 на If-None-Match / If-Modified-Since и проверка If-Match.
+    Используется синхронным VPSViewSet и асинхронными представлениями.
+    """
+
+    def get_validator_headers(self, etag, last_modified):
+        """
+        Возвращает заголовки ETag и Last-Modified ответа.
+
+        :param etag: ETag
+        :param last_modified: Время последнего изменения или None
+        :return: Словарь заголовков
+        """
+        headers = {"ETag": etag}
+        if last_modified is not None:
+            headers["Last-Modified"] = http_date(last_modified.timestamp())
+        return headers
+
+    def get_not_modified_response(self, request, etag, last_modified):
+        """
+        Проверяет заголовки If-None-Match / If-Modified-Since (и If-Match)
+        запроса по валидаторам ресурса.
+
+        :param request: Запрос
+        :param etag: ETag ресурса
+        :param last_modified: Время последнего изменения ресурса или None
+        :return: Ответ 304 (или 412) с заголовками валидаторов либо None
+        """
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=(
+                int(last_modified.timestamp()) if last_modified is not None else None
+            ),
+        )
+        if response is not None:
+            for header, value in self.get_validator_headers(
+                etag, last_modified
+            ).items():
+                response.headers[header] = value
+        return response
+
+    def get_conditional_response(self, request, data, etag, last_modified):
+        """
+        Возвращает 304, если ресурс не изменился, иначе ответ с данными.
+
+        :param request: Запрос
+        :param data: Данные ответа
+        :param etag: ETag ресурса
+        :param last_modified: Время последнего изменения ресурса или None
+        :return: Ответ
+        """
+        not_modified = self.get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        return Response(
+            data=data,
+            status=status.HTTP_200_OK,
+            headers=self.get_validator_headers(etag, last_modified),
+        )
+
+    def get_if_match_version(self, request, instance):
+        """
+        Проверяет заголовок If-Match запроса.
+
+        :param request: Запрос
+        :param instance: Изменяемый объект VPS
+        :return: Версия, которую должен иметь объект при записи,
+            или None, если заголовок не передан или равен "*"
+        :raises PreconditionFailed: Если ни один ETag не совпадает с текущим
+        """
+        if_match = request.headers.get("If-Match")
+        if not if_match:
+            return None
+        etags = parse_etags(if_match)
+        if "*" in etags:
+            return None
+        if instance.etag not in etags:
+            raise PreconditionFailed()
+        return instance.version
+
+
+class ChangeFeedMixin:
+    """
+    Общая часть ленты изменений VPS (журнал VPSChange) для синхронного
+    VPSViewSet и асинхронного представления: разбор параметров запроса,
+    тело ответа long-poll и ответ с потоком Server-Sent Events.
+    """
+
+    def get_changes_query(self, request):
+        """
+        Проверяет параметры запроса ленты изменений. Заголовок
+        Last-Event-ID, который браузер передаёт при переподключении
+        к потоку событий, заменяет параметр ``since``.
+
+        :param request: Запрос
+        :return: Словарь с ключами since (если передан), wait и limit
+        :raises ValidationError: Если параметры некорректны
+        """
+        data = request.query_params.dict()
+        if "Last-Event-ID" in request.headers:
+            data["since"] = request.headers["Last-Event-ID"]
+        serializer = VPSChangesQuerySerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def get_changes_data(self, changes, since):
+        """
+        Возвращает тело ответа long-poll.
+
+        :param changes: Список записей журнала
+        :param since: Номер, после которого выбирались записи
+        :return: Словарь с записями и номером, который клиент передаст
+            в ``since`` следующего запроса
+        """
+        return {"changes": changes, "last": changes[-1]["seq"] if changes else since}
+
+    def get_event_stream_response(self, stream):
+        """
+        Возвращает потоковый ответ Server-Sent Events.
+
+        :param stream: Итератор (или асинхронный итератор) байтовых строк
+        :return: Ответ
+        """
+        response = StreamingHttpResponse(
+            stream, content_type="text/event-stream; charset=utf-8"
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"  # Прокси nginx не буферизует поток
+        return response
+
+
+class SparseFieldsMixin:
+    """
+    Выбор полей ответа параметром ``fields`` (через запятую) в запросах
+    чтения VPS: ``?fields=uid,status``. UID выводится всегда - он
+    идентифицирует сервер и служит позицией курсора пагинации.
+    Используется синхронным VPSViewSet и асинхронными представлениями.
+    """
+
+    fields_query_param = "fields"
+
+    def get_requested_fields(self, request):
+        """
+        Возвращает поля, запрошенные параметром ``fields``.
+
+        :param request: Запрос
+        :return: Кортеж имён полей в порядке VPSSerializer или None,
+            если параметр не передан или запрос не на чтение
+        :raises ValidationError: Если запрошено неизвестное поле
+        """
+        if request is None or request.method != "GET":
+            return None
+        value = request.query_params.get(self.fields_query_param)
+        if not value:
+            return None
+        requested = {name.strip() for name in value.split(",") if name.strip()}
+        available = tuple(VPSSerializer().fields)
+        unknown = requested - set(available)
+        if unknown:
+            raise ValidationError(
+                {
+                    self.fields_query_param: [
+                        _("Unknown fields: %(fields)s. Available: %(available)s.")
+                        % {
+                            "fields": ", ".join(sorted(unknown)),
+                            "available": ", ".join(available),
+                        }
+                    ]
+                }
+            )
+        return tuple(name for name in available if name in requested or name == "uid")
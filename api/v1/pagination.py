@@ -0,0 +1,160 @@
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+from rest_framework.response import Response
+
+
+class VPSCursorPagination(CursorPagination):
+    """
+    Курсорная (keyset) пагинация для списка VPS.
+    Позиция курсора хранит последний отданный UID, поэтому каждая страница
+    выбирается запросом вида ``WHERE uid > <курсор> ORDER BY uid LIMIT N``
+    по индексу первичного ключа, без OFFSET. Стоимость страницы не зависит
+    от того, насколько глубоко клиент пролистал список.
+    """
+
+    ordering = "uid"
+    page_size = 100
+    page_size_query_param = "limit"
+    max_page_size = 1000
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Выбирает строки текущей страницы и вычисляет курсоры соседних страниц.
+        Повторяет CursorPagination.paginate_queryset, но разделён на построение
+        запроса страницы и разбор результата, чтобы асинхронный вариант
+        apaginate_queryset выполнял тот же запрос без обращения к БД из потока.
+
+        :param queryset: QuerySet для пагинации
+        :param request: Запрос
+        :param view: Представление
+        :return: Строки страницы или None, если пагинация отключена
+        """
+        window = self.get_page_queryset(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page(list(window))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Асинхронный вариант paginate_queryset.
+
+        :param queryset: QuerySet для пагинации
+        :param request: Запрос
+        :param view: Представление
+        :return: Строки страницы или None, если пагинация отключена
+        """
+        window = self.get_page_queryset(queryset, request, view)
+        if window is None:
+            return None
+        return self.set_page([row async for row in window])
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Разбирает курсор запроса и строит запрос строк страницы
+        (с одной лишней строкой для определения следующей страницы).
+
+        :param queryset: QuerySet для пагинации
+        :param request: Запрос
+        :param view: Представление
+        :return: QuerySet строк страницы или None, если пагинация отключена
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            self.offset, self.reverse, self.current_position = 0, False, None
+        else:
+            self.offset, self.reverse, self.current_position = self.cursor
+
+        if self.reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        if self.current_position is not None:
+            order = self.ordering[0]
+            order_attr = order.lstrip("-")
+            if self.cursor.reverse != order.startswith("-"):
+                kwargs = {order_attr + "__lt": self.current_position}
+            else:
+                kwargs = {order_attr + "__gt": self.current_position}
+            queryset = queryset.filter(**kwargs)
+
+        # Одна лишняя строка показывает, есть ли следующая страница
+        start = self.offset
+        stop = start + self.page_size + 1
+        return queryset[start:stop]
+
+    def set_page(self, results):
+        """
+        Запоминает строки страницы и позиции курсоров соседних страниц.
+
+        :param results: Строки, выбранные запросом get_page_queryset
+        :return: Строки страницы
+        """
+        self.page = results[: self.page_size]
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(
+                results[-1], self.ordering
+            )
+        else:
+            has_following_position = False
+            following_position = None
+
+        has_current_position = self.current_position is not None or self.offset > 0
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = has_current_position
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = self.current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = has_current_position
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = self.current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def get_paginated_response(self, data):
+        """
+        Возвращает страницу в формате ``{"servers": [...], "next": ..., "prev": ...}``.
+
+        :param data: Сериализованные объекты текущей страницы
+        :return: Ответ со списком серверов и ссылками на соседние страницы
+        """
+        return Response(
+            {
+                "servers": data,
+                "next": self.get_next_link(),
+                "prev": self.get_previous_link(),
+            }
+        )
+
+    def get_paginated_response_schema(self, schema):
+        """
+        Описывает структуру ответа с пагинацией для генераторов схемы.
+
+        :param schema: Схема одного элемента списка
+        :return: Схема ответа со списком серверов и курсорами
+        """
+        return {
+            "type": "object",
+            "required": ["servers"],
+            "properties": {
+                "servers": schema,
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "prev": {"type": "string", "nullable": True, "format": "uri"},
+            },
+        }
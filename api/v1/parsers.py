@@ -0,0 +1,38 @@
+import uuid
+
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from api.v1.renderers import MessagePackRenderer, msgpack
+
+
+class MessagePackParser(BaseParser):
+    """
+    Парсер тела запроса в формате MessagePack (доступен, если установлен
+    пакет msgpack). Понимает расширения, которые выводит
+    MessagePackRenderer: UUID и Timestamp.
+    """
+
+    media_type = MessagePackRenderer.media_type
+    uuid_ext_type = MessagePackRenderer.uuid_ext_type
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """
+        Разбирает тело запроса.
+
+        :param stream: Поток тела запроса
+        :return: Разобранные данные
+        """
+        try:
+            return msgpack.unpackb(stream.read(), ext_hook=self.ext_hook, timestamp=3)
+        except (ValueError, msgpack.UnpackException) as exc:
+            raise ParseError(_("MessagePack parse error - %s") % exc)
+
+    def ext_hook(self, code, data):
+        """
+        Декодирует расширения MessagePack.
+        """
+        if code == self.uuid_ext_type and len(data) == 16:
+            return uuid.UUID(bytes=data)
+        return msgpack.ExtType(code, data)
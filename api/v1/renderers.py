@@ -0,0 +1,278 @@
+import csv
+import io
+import json
+import uuid
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson необязателен
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - msgpack необязателен
+    msgpack = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSON-рендерер, использующий orjson, если он установлен.
+    Вывод побайтово совпадает с JSONRenderer: компактные разделители,
+    UTF-8 без экранирования и экранированные U+2028/U+2029; даты и типы,
+    которые orjson не знает (ленивые строки перевода, Decimal), кодируются
+    тем же JSONEncoder, что и в DRF.
+    Если orjson недоступен или запрошен отступ, используется JSONRenderer.
+    """
+
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Сериализует данные ответа в JSON.
+
+        :param data: Данные ответа
+        :return: Байтовая строка JSON
+        """
+        if (
+            orjson is None
+            or data is None
+            or not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder.default,
+                option=orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except TypeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        return ret.replace("\u2028".encode(), b"\\u2028").replace(
+            "\u2029".encode(), b"\\u2029"
+        )
+
+
+class MessagePackRenderer(BaseRenderer):
+    """
+    Рендерер MessagePack (доступен, если установлен пакет msgpack).
+    Структура ответа та же, что у JSON; UUID кодируются 16 байтами
+    в расширении ``uuid_ext_type`` вместо 36-символьной строки, время -
+    стандартным расширением Timestamp. Остальные типы, которых нет
+    в MessagePack (ленивые строки перевода, Decimal), кодируются так же,
+    как в JSON.
+    Кроме обычного ``render`` умеет потоково выводить порции строк БД.
+    """
+
+    media_type = "application/msgpack"
+    format = "msgpack"
+    charset = None
+    render_style = "binary"
+    uuid_ext_type = 1
+    encoder = JSONEncoder()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Сериализует данные ответа в MessagePack.
+
+        :param data: Данные ответа
+        :return: Байтовая строка MessagePack
+        """
+        if data is None:
+            return b""
+        return self.packb(data)
+
+    def stream(self, fields, chunks):
+        """
+        Потоково выводит строки БД последовательностью объектов MessagePack,
+        по одному на строку (читается msgpack.Unpacker по мере получения).
+
+        :param fields: Имена полей
+        :param chunks: Итератор порций кортежей значений полей
+        :return: Генератор байтовых строк, по одной на порцию
+        """
+        packer = self.get_packer()
+        for chunk in chunks:
+            yield b"".join(packer.pack(dict(zip(fields, row))) for row in chunk)
+
+    def packb(self, data):
+        """
+        Сериализует один объект в MessagePack.
+        """
+        return self.get_packer().pack(data)
+
+    def get_packer(self):
+        """
+        Возвращает упаковщик MessagePack с кодированием UUID и времени.
+        """
+        return msgpack.Packer(default=self.default, datetime=True)
+
+    def default(self, obj):
+        """
+        Кодирует типы, которых нет в MessagePack.
+        """
+        if isinstance(obj, uuid.UUID):
+            return msgpack.ExtType(self.uuid_ext_type, obj.bytes)
+        return self.encoder.default(obj)
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Рендерер NDJSON: один JSON-объект на строку.
+    Кроме обычного ``render`` умеет потоково выводить порции строк БД.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Выводит данные ответа; список выводится построчно.
+
+        :param data: Данные ответа
+        :return: Байтовая строка NDJSON
+        """
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        return "".join(self.dumps(item) for item in items).encode(self.charset)
+
+    def stream(self, fields, chunks):
+        """
+        Потоково выводит строки БД в формате NDJSON.
+
+        :param fields: Имена полей
+        :param chunks: Итератор порций кортежей значений полей
+        :return: Генератор байтовых строк, по одной на порцию
+        """
+        for chunk in chunks:
+            yield "".join(self.dumps(dict(zip(fields, row))) for row in chunk).encode(
+                self.charset
+            )
+
+    def dumps(self, item):
+        """
+        Сериализует один объект в строку NDJSON.
+        """
+        return json.dumps(item, cls=JSONEncoder, ensure_ascii=False) + "\n"
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    Рендерер CSV с заголовком из имён полей.
+    Кроме обычного ``render`` умеет потоково выводить порции строк БД.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Выводит объект или список объектов в виде таблицы CSV.
+
+        :param data: Данные ответа
+        :return: Байтовая строка CSV
+        """
+        if data is None:
+            return b""
+        items = data if isinstance(data, list) else [data]
+        if not items:
+            return b""
+        fields = list(items[0])
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        writer.writerows([item.get(field) for field in fields] for item in items)
+        return buffer.getvalue().encode(self.charset)
+
+    def stream(self, fields, chunks):
+        """
+        Потоково выводит строки БД в формате CSV.
+
+        :param fields: Имена полей (строка заголовка)
+        :param chunks: Итератор порций кортежей значений полей
+        :return: Генератор байтовых строк: заголовок и по одной на порцию
+        """
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for chunk in chunks:
+            writer.writerows(chunk)
+            yield buffer.getvalue().encode(self.charset)
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode(self.charset)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """
+    Рендерер Server-Sent Events для ленты изменений VPS: по событию
+    ``change`` на запись журнала, с номером записи в поле ``id``, чтобы
+    при переподключении браузер передал его в заголовке Last-Event-ID.
+    Ответ с ошибкой выводится одним событием ``error``.
+    """
+
+    media_type = "text/event-stream"
+    format = "sse"
+    charset = "utf-8"
+    json_renderer = FastJSONRenderer()
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Выводит записи журнала из ответа ленты изменений или ошибку.
+
+        :param data: Данные ответа
+        :return: Байтовая строка событий
+        """
+        if data is None:
+            return b""
+        if "changes" in data:
+            return self.render_changes(data["changes"])
+        return self.render_event("error", data)
+
+    def stream(self, batches):
+        """
+        Потоково выводит порции записей журнала. Вместо пустой порции
+        выводится комментарий, который не даёт прокси закрыть соединение.
+
+        :param batches: Итератор списков записей
+        :return: Генератор байтовых строк, по одной на порцию
+        """
+        for changes in batches:
+            yield self.render_changes(changes) or b": keep-alive\n\n"
+
+    async def astream(self, batches):
+        """
+        Асинхронный вариант stream.
+
+        :param batches: Асинхронный итератор списков записей
+        :return: Асинхронный генератор байтовых строк
+        """
+        async for changes in batches:
+            yield self.render_changes(changes) or b": keep-alive\n\n"
+
+    def render_changes(self, changes):
+        """
+        Выводит записи журнала событиями ``change``.
+        """
+        return b"".join(
+            self.render_event("change", change, event_id=change["seq"])
+            for change in changes
+        )
+
+    def render_event(self, event, data, event_id=None):
+        """
+        Выводит одно событие. Компактный JSON не содержит переводов строк,
+        поэтому данные события занимают одну строку ``data``.
+        """
+        head = f"event: {event}\n"
+        if event_id is not None:
+            head = f"id: {event_id}\n{head}"
+        return head.encode() + b"data: " + self.json_renderer.render(data) + b"\n\n"
@@ -5,23 +5,23 @@ from drf_yasg.views import get_schema_view
 
 from api.v1.serializers import VPSSerializer
 
-schema_view = get_schema_view(
-    openapi.Info(
-        title="VPS API",
-        default_version="v1",
-        description=_("VPS API"),
-        contact=openapi.Contact(email="example@gmail.com"),
-    ),
-    public=True,
+api_info = openapi.Info(
+    title="VPS API",
+    default_version="v1",
+    description=_("VPS API"),
+    contact=openapi.Contact(email="example@gmail.com"),
 )
+schema_view = get_schema_view(api_info, public=True)
 
 # Параметры фильтров для списка VPS
 list_vps_parameters = [
     openapi.Parameter(
         "uid",
         openapi.IN_QUERY,
-        description=_("UID VPS"),
-        type=openapi.TYPE_STRING,
+        description=_("Comma-separated VPS UIDs filter"),
+        type=openapi.TYPE_ARRAY,
+        items=openapi.Items(type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID),
+        collection_format="csv",
     ),
     openapi.Parameter(
         "ram",
@@ -48,6 +48,77 @@ list_vps_parameters = [
         type=openapi.TYPE_STRING,
         enum=["started", "blocked", "stopped"],
     ),
+    openapi.Parameter(
+        "status__in",
+        openapi.IN_QUERY,
+        description=_("Comma-separated VPS statuses filter"),
+        type=openapi.TYPE_ARRAY,
+        items=openapi.Items(
+            type=openapi.TYPE_STRING, enum=["started", "blocked", "stopped"]
+        ),
+        collection_format="csv",
+    ),
+    openapi.Parameter(
+        "ram_min",
+        openapi.IN_QUERY,
+        description=_("Min RAM filter (GB)"),
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "ram_max",
+        openapi.IN_QUERY,
+        description=_("Max RAM filter (GB)"),
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "hdd_min",
+        openapi.IN_QUERY,
+        description=_("Min HDD filter (GB)"),
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "hdd_max",
+        openapi.IN_QUERY,
+        description=_("Max HDD filter (GB)"),
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "cpu_min",
+        openapi.IN_QUERY,
+        description=_("Min CPU core number filter"),
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "cpu_max",
+        openapi.IN_QUERY,
+        description=_("Max CPU core number filter"),
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "cursor",
+        openapi.IN_QUERY,
+        description=_("Pagination cursor"),
+        type=openapi.TYPE_STRING,
+    ),
+    openapi.Parameter(
+        "limit",
+        openapi.IN_QUERY,
+        description=_("Number of servers per page"),
+        type=openapi.TYPE_INTEGER,
+    ),
+    openapi.Parameter(
+        "fields",
+        openapi.IN_QUERY,
+        description=_(
+            "Comma-separated response fields (uid is always included), "
+            "e.g. uid,status"
+        ),
+        type=openapi.TYPE_ARRAY,
+        items=openapi.Items(
+            type=openapi.TYPE_STRING, enum=["uid", "cpu", "ram", "hdd", "status"]
+        ),
+        collection_format="csv",
+    ),
 ]
 
 # Документация для списка VPS
@@ -74,9 +145,20 @@ list_vps_schema = {
                             },
                         ),
                     ),
+                    "next": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        format=openapi.FORMAT_URI,
+                        x_nullable=True,
+                    ),
+                    "prev": openapi.Schema(
+                        type=openapi.TYPE_STRING,
+                        format=openapi.FORMAT_URI,
+                        x_nullable=True,
+                    ),
                 },
             ),
         ),
+        304: openapi.Response(description=_("Server list not modified")),
         400: openapi.Response(
             description=_("Filter error"),
             examples={
@@ -97,6 +179,14 @@ list_vps_schema = {
 partial_update_vps_schema = {
     "operation_description": _("Update VPS status"),
     "operation_id": "partial_update_vps_server",
+    "manual_parameters": [
+        openapi.Parameter(
+            "If-Match",
+            openapi.IN_HEADER,
+            description=_("ETag of the VPS version the change is based on"),
+            type=openapi.TYPE_STRING,
+        ),
+    ],
     "request_body": openapi.Schema(
         type=openapi.TYPE_OBJECT,
         properties={
@@ -129,6 +219,14 @@ partial_update_vps_schema = {
             description=_("Server not found"),
             examples={"application/json": {"detail": _("Not found.")}},
         ),
+        412: openapi.Response(
+            description=_("VPS version does not match If-Match"),
+            examples={
+                "application/json": {
+                    "detail": _("The server was modified by another request.")
+                }
+            },
+        ),
     },
 }
 
@@ -205,3 +303,381 @@ create_vps_schema = {
         ),
     },
 }
+
+# Документация для пакетного создания VPS
+batch_create_vps_schema = {
+    "operation_description": _(
+        "Create VPS servers in batch. By default any invalid item rejects "
+        "the whole batch; with skip_invalid=true valid items are created "
+        "and errors of the others are returned"
+    ),
+    "operation_id": "batch_create_vps_servers",
+    "manual_parameters": [
+        openapi.Parameter(
+            "skip_invalid",
+            openapi.IN_QUERY,
+            description=_("Create valid items and report errors of invalid ones"),
+            type=openapi.TYPE_BOOLEAN,
+            default=False,
+        ),
+    ],
+    "request_body": openapi.Schema(
+        type=openapi.TYPE_ARRAY,
+        items=create_vps_schema["request_body"],
+        max_items=settings.VPS_BATCH_SETTINGS["MAX_SIZE"],
+    ),
+    "responses": {
+        201: openapi.Response(
+            description=_("Success VPS batch created"),
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "servers": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=create_vps_schema["responses"][201].schema,
+                    ),
+                    "errors": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_OBJECT,
+                            properties={
+                                "index": openapi.Schema(type=openapi.TYPE_INTEGER),
+                                "errors": openapi.Schema(type=openapi.TYPE_OBJECT),
+                            },
+                        ),
+                    ),
+                },
+            ),
+        ),
+        400: openapi.Response(
+            description=_("Validation error"),
+            examples={
+                "application/json": [
+                    {},
+                    {"ram": [_("Ensure this value is less than or equal to 64.")]},
+                ]
+            },
+        ),
+    },
+}
+
+# Документация для массовой смены статуса VPS
+bulk_status_vps_schema = {
+    "operation_description": _(
+        "Change status of many VPS servers with a single UPDATE. Servers are "
+        "selected by uids and/or the list filters"
+    ),
+    "operation_id": "bulk_status_vps_servers",
+    "manual_parameters": [
+        parameter
+        for parameter in list_vps_parameters
+        if parameter.name not in ("cursor", "limit", "fields")
+    ],
+    "request_body": openapi.Schema(
+        type=openapi.TYPE_OBJECT,
+        properties={
+            "status": openapi.Schema(
+                type=openapi.TYPE_STRING,
+                description=_("VPS status"),
+                enum=["started", "stopped", "blocked"],
+            ),
+            "uids": openapi.Schema(
+                type=openapi.TYPE_ARRAY,
+                description=_("UID VPS"),
+                items=openapi.Schema(
+                    type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                ),
+                max_items=settings.VPS_BATCH_SETTINGS["MAX_SIZE"],
+            ),
+            "return_uids": openapi.Schema(
+                type=openapi.TYPE_BOOLEAN,
+                description=_("Return UIDs of changed servers"),
+                default=False,
+            ),
+        },
+        required=["status"],
+    ),
+    "responses": {
+        200: openapi.Response(
+            description=_("Success VPS updated status"),
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "updated": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    "uids": openapi.Schema(
+                        type=openapi.TYPE_ARRAY,
+                        items=openapi.Schema(
+                            type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                        ),
+                    ),
+                },
+            ),
+        ),
+        400: openapi.Response(
+            description=_("Validation error"),
+            examples={
+                "application/json": {
+                    "non_field_errors": [_("Specify uids or at least one filter.")],
+                }
+            },
+        ),
+    },
+}
+
+# Документация для получения нескольких VPS по списку UID
+lookup_vps_responses = {
+    200: openapi.Response(
+        description=_("Found servers and UIDs of missing ones"),
+        schema=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "servers": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=create_vps_schema["responses"][201].schema,
+                ),
+                "missing": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                    ),
+                ),
+            },
+        ),
+    ),
+    400: openapi.Response(
+        description=_("Validation error"),
+        examples={"application/json": {"uids": {"0": [_("Must be a valid UUID.")]}}},
+    ),
+}
+
+lookup_vps_schema = {
+    "get": {
+        "operation_description": _(
+            "Get VPS servers by a list of UIDs. Servers are returned in the "
+            "requested order, UIDs without a server are listed in missing"
+        ),
+        "operation_id": "lookup_vps_servers",
+        "manual_parameters": [
+            openapi.Parameter(
+                "uids",
+                openapi.IN_QUERY,
+                description=_("Comma-separated VPS UIDs"),
+                type=openapi.TYPE_ARRAY,
+                items=openapi.Items(
+                    type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                ),
+                collection_format="csv",
+                required=True,
+            ),
+        ],
+        "responses": lookup_vps_responses,
+    },
+    "post": {
+        "operation_description": _(
+            "Get VPS servers by a list of UIDs passed in the request body "
+            "(for lists too long for a URL)"
+        ),
+        "operation_id": "lookup_vps_servers_post",
+        "request_body": openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            properties={
+                "uids": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    description=_("UID VPS"),
+                    items=openapi.Schema(
+                        type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID
+                    ),
+                    max_items=settings.VPS_BATCH_SETTINGS["MAX_SIZE"],
+                ),
+            },
+            required=["uids"],
+        ),
+        "responses": lookup_vps_responses,
+    },
+}
+
+# Документация для потоковой выгрузки VPS
+export_vps_schema = {
+    "operation_description": _(
+        "Stream all VPS servers matching the list filters as NDJSON or CSV"
+    ),
+    "operation_id": "export_vps_servers",
+    "manual_parameters": [
+        parameter
+        for parameter in list_vps_parameters
+        if parameter.name not in ("cursor", "limit")
+    ]
+    + [
+        openapi.Parameter(
+            "format",
+            openapi.IN_QUERY,
+            description=_("Export format"),
+            type=openapi.TYPE_STRING,
+            enum=["ndjson", "csv"],
+            default="ndjson",
+        ),
+    ],
+    "responses": {
+        200: openapi.Response(
+            description=_("Server list"),
+            examples={
+                "application/x-ndjson": (
+                    '{"uid": "123e4567-e89b-12d3-a456-426614174000", '
+                    '"cpu": 4, "ram": 16, "hdd": 100, "status": "started"}\n'
+                ),
+                "text/csv": (
+                    "uid,cpu,ram,hdd,status\r\n"
+                    "123e4567-e89b-12d3-a456-426614174000,4,16,100,started\r\n"
+                ),
+            },
+        ),
+        400: list_vps_schema["responses"][400],
+    },
+}
+
+# Документация для статистики кэша ответов
+cache_stats_vps_schema = {
+    "operation_description": _("Response cache hit and miss counters"),
+    "operation_id": "vps_cache_stats",
+    "responses": {
+        200: openapi.Response(
+            description=_("Cache statistics"),
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "hits": openapi.Schema(type=openapi.TYPE_INTEGER),
+                    "misses": openapi.Schema(type=openapi.TYPE_INTEGER),
+                },
+            ),
+        ),
+    },
+}
+
+# Итоги по группе серверов в сводке VPS
+stats_totals_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "servers": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "cpu": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "ram": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "hdd": openapi.Schema(type=openapi.TYPE_INTEGER),
+    },
+)
+
+stats_vps_schema = {
+    "operation_description": _(
+        "Number of servers and total CPU, RAM and HDD per status and overall"
+    ),
+    "operation_id": "vps_stats",
+    "responses": {
+        200: openapi.Response(
+            description=_("VPS statistics"),
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "statuses": openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            status: stats_totals_schema
+                            for status in ("started", "stopped", "blocked")
+                        },
+                    ),
+                    "total": stats_totals_schema,
+                },
+            ),
+        ),
+    },
+}
+
+# Запись журнала изменений VPS
+vps_change_schema = openapi.Schema(
+    type=openapi.TYPE_OBJECT,
+    properties={
+        "seq": openapi.Schema(type=openapi.TYPE_INTEGER),
+        "uid": openapi.Schema(type=openapi.TYPE_STRING, format=openapi.FORMAT_UUID),
+        "action": openapi.Schema(type=openapi.TYPE_STRING, enum=["create", "status"]),
+        "status": openapi.Schema(
+            type=openapi.TYPE_STRING, enum=["started", "stopped", "blocked"]
+        ),
+        "changed_at": openapi.Schema(
+            type=openapi.TYPE_STRING, format=openapi.FORMAT_DATETIME
+        ),
+    },
+)
+
+# Документация для ленты изменений VPS
+changes_vps_schema = {
+    "operation_description": _(
+        "VPS creations and status changes after the given sequence number. "
+        "With wait the request is held until changes appear (long-poll); "
+        "with Accept: text/event-stream changes are streamed as "
+        "Server-Sent Events"
+    ),
+    "operation_id": "vps_changes",
+    "manual_parameters": [
+        openapi.Parameter(
+            "since",
+            openapi.IN_QUERY,
+            description=_(
+                "Sequence number of the last received change; "
+                "by default the feed starts at the current end of the log"
+            ),
+            type=openapi.TYPE_INTEGER,
+            minimum=0,
+        ),
+        openapi.Parameter(
+            "wait",
+            openapi.IN_QUERY,
+            description=_("Seconds to wait for changes"),
+            type=openapi.TYPE_NUMBER,
+            minimum=0,
+            maximum=settings.VPS_CHANGES_SETTINGS["MAX_WAIT"],
+            default=0,
+        ),
+        openapi.Parameter(
+            "limit",
+            openapi.IN_QUERY,
+            description=_("Max number of changes per response"),
+            type=openapi.TYPE_INTEGER,
+            minimum=1,
+            maximum=settings.VPS_CHANGES_SETTINGS["LIMIT"],
+        ),
+        openapi.Parameter(
+            "Last-Event-ID",
+            openapi.IN_HEADER,
+            description=_("Sequence number to resume an event stream from"),
+            type=openapi.TYPE_INTEGER,
+        ),
+    ],
+    "responses": {
+        200: openapi.Response(
+            description=_("VPS changes"),
+            schema=openapi.Schema(
+                type=openapi.TYPE_OBJECT,
+                properties={
+                    "changes": openapi.Schema(
+                        type=openapi.TYPE_ARRAY, items=vps_change_schema
+                    ),
+                    "last": openapi.Schema(type=openapi.TYPE_INTEGER),
+                },
+            ),
+            examples={
+                "text/event-stream": (
+                    "id: 42\n"
+                    "event: change\n"
+                    'data: {"seq":42,"uid":"123e4567-e89b-12d3-a456-426614174000",'
+                    '"action":"status","status":"stopped",'
+                    '"changed_at":"2025-01-01T12:00:00+03:00"}\n\n'
+                ),
+            },
+        ),
+        400: openapi.Response(
+            description=_("Validation error"),
+            examples={
+                "application/json": {
+                    "since": [_("Ensure this value is greater than or equal to 0.")],
+                }
+            },
+        ),
+    },
+}
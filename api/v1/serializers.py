@@ -1,14 +1,141 @@
+import uuid
+
+from django.conf import settings
+from django.db import models
 from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 
+from api.metrics import measure_serializer
 from api.models import VPS
 
 
-class VPSSerializer(serializers.ModelSerializer):
+class MeasuredSerializerMixin:
+    """
+    Учитывает время проверки и представления данных сериализатором
+    в метриках запроса (vps_serializer_duration_seconds).
+    """
+
+    def run_validation(self, *args, **kwargs):
+        with measure_serializer():
+            return super().run_validation(*args, **kwargs)
+
+    def to_representation(self, *args, **kwargs):
+        with measure_serializer():
+            return super().to_representation(*args, **kwargs)
+
+
+class VPSListSerializer(MeasuredSerializerMixin, serializers.ListSerializer):
+    """
+    Сериализатор списка VPS для пакетного создания.
+    Проверяет каждый элемент списка и сохраняет все валидные объекты
+    пакетными INSERT в одной транзакции.
+
+    Если в контексте передан флаг ``skip_invalid``, невалидные элементы
+    не прерывают обработку: их ошибки собираются в ``item_errors``
+    (индекс элемента -> ошибки), а сохраняются только валидные элементы.
+    """
+
+    default_error_messages = {
+        "duplicate_uid": _("Duplicate UID in batch."),
+    }
+
+    def run_child_validation(self, data):
+        """
+        Проверяет один элемент списка.
+        В режиме ``skip_invalid`` возвращает исключение вместо его выбрасывания,
+        чтобы ошибка элемента не прерывала проверку остальных.
+
+        :param data: Данные одного VPS
+        :return: Проверенные данные или ValidationError
+        """
+        try:
+            return super().run_child_validation(data)
+        except serializers.ValidationError as exc:
+            if not self.context.get("skip_invalid", False):
+                raise
+            return exc
+
+    def to_internal_value(self, data):
+        """
+        Проверяет список VPS и отбрасывает элементы с ошибками.
+        Повторяющиеся в одном запросе UID считаются ошибкой элемента.
+
+        :param data: Список данных VPS
+        :return: Список проверенных данных валидных элементов
+        """
+        items = super().to_internal_value(data)
+        self.item_errors = {}
+        validated = []
+        seen_uids = set()
+
+        for index, item in enumerate(items):
+            if isinstance(item, serializers.ValidationError):
+                self.item_errors[index] = item.detail
+                continue
+            uid = item.get("uid")
+            if uid is not None:
+                if uid in seen_uids:
+                    self.item_errors[index] = {
+                        "uid": [self.error_messages["duplicate_uid"]]
+                    }
+                    continue
+                seen_uids.add(uid)
+            validated.append(item)
+
+        if self.item_errors and not self.context.get("skip_invalid", False):
+            raise serializers.ValidationError(
+                [self.item_errors.get(index, {}) for index in range(len(items))]
+            )
+        return validated
+
+    def create(self, validated_data):
+        """
+        Создаёт VPS пакетными INSERT внутри одной транзакции
+        (её открывает VPSQuerySet.bulk_create).
+
+        :param validated_data: Список проверенных данных VPS
+        :return: Список созданных объектов VPS
+        """
+        instances = [VPS(**attrs) for attrs in validated_data]
+        return VPS.objects.bulk_create(
+            instances, batch_size=settings.VPS_BATCH_SETTINGS["INSERT_SIZE"]
+        )
+
+
+class UUIDObjectField(serializers.UUIDField):
+    """
+    Поле UUID, которое выводит объект uuid.UUID, а не строку, как UUID
+    из ``values()`` в списке: JSON-рендереры кодируют его строкой,
+    а MessagePackRenderer - 16 байтами.
+    """
+
+    def to_representation(self, value):
+        if isinstance(value, uuid.UUID):
+            return value
+        return uuid.UUID(str(value))
+
+
+class VPSSerializer(MeasuredSerializerMixin, serializers.ModelSerializer):
     """
     Сериализатор для модели VPS.
+    Аргумент ``fields`` ограничивает вывод перечисленными полями
+    (параметр ``fields`` запросов чтения).
     """
 
+    serializer_field_mapping = {
+        **serializers.ModelSerializer.serializer_field_mapping,
+        models.UUIDField: UUIDObjectField,
+    }
+
+    def __init__(self, *args, fields=None, **kwargs):
+        """
+        :param fields: Имена выводимых полей или None для всех полей
+        """
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
     class Meta:
         """
         Метаданные сериализатора.
@@ -16,7 +143,8 @@ class VPSSerializer(serializers.ModelSerializer):
         """
 
         model = VPS
-        fields = "__all__"
+        exclude = ("version", "updated_at")
+        list_serializer_class = VPSListSerializer
         extra_kwargs = {
             "status": {
                 "error_messages": {
@@ -39,3 +167,50 @@ class VPSSerializer(serializers.ModelSerializer):
         if value % 2 != 0:
             value -= 1
         return value
+
+
+class VPSBulkStatusSerializer(MeasuredSerializerMixin, serializers.Serializer):
+    """
+    Сериализатор запроса на массовую смену статуса VPS.
+    Серверы выбираются списком UID и/или параметрами фильтра VPSFilter.
+    """
+
+    status = serializers.ChoiceField(
+        choices=VPS.STATUS_CHOICES,
+        error_messages=VPSSerializer.Meta.extra_kwargs["status"]["error_messages"],
+    )
+    uids = serializers.ListField(
+        child=serializers.UUIDField(),
+        required=False,
+        allow_empty=False,
+        max_length=settings.VPS_BATCH_SETTINGS["MAX_SIZE"],
+    )
+    return_uids = serializers.BooleanField(default=False)
+
+
+class VPSChangesQuerySerializer(serializers.Serializer):
+    """
+    Сериализатор параметров запроса ленты изменений VPS.
+    """
+
+    since = serializers.IntegerField(min_value=0, required=False)
+    wait = serializers.FloatField(
+        min_value=0, max_value=settings.VPS_CHANGES_SETTINGS["MAX_WAIT"], default=0
+    )
+    limit = serializers.IntegerField(
+        min_value=1,
+        max_value=settings.VPS_CHANGES_SETTINGS["LIMIT"],
+        default=settings.VPS_CHANGES_SETTINGS["LIMIT"],
+    )
+
+
+class VPSLookupSerializer(MeasuredSerializerMixin, serializers.Serializer):
+    """
+    Сериализатор запроса на получение нескольких VPS по списку UID.
+    """
+
+    uids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=settings.VPS_BATCH_SETTINGS["MAX_SIZE"],
+    )
@@ -1,22 +1,78 @@
+from django.conf import settings
+from django.core.validators import EMPTY_VALUES
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.translation import gettext_lazy as _
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.parsers import FormParser, JSONParser, MultiPartParser
+from rest_framework.renderers import BrowsableAPIRenderer
 from rest_framework.response import Response
 from rest_framework.viewsets import ModelViewSet
 
-from api.models import VPS
+from api.cache import response_cache
+from api.changes import change_notifier
+from api.models import VPS, VPSChange, VPSStats
+from api.v1.exceptions import PreconditionFailed
 from api.v1.filters import VPSFilter
-from api.v1.schema import create_vps_schema, list_vps_schema, partial_update_vps_schema
-from api.v1.serializers import VPSSerializer
+from api.v1.mixins import ChangeFeedMixin, ConditionalResponseMixin, SparseFieldsMixin
+from api.v1.pagination import VPSCursorPagination
+from api.v1.parsers import MessagePackParser
+from api.v1.renderers import (
+    CSVRenderer,
+    EventStreamRenderer,
+    FastJSONRenderer,
+    MessagePackRenderer,
+    NDJSONRenderer,
+    msgpack,
+)
+from api.v1.schema import (
+    batch_create_vps_schema,
+    bulk_status_vps_schema,
+    cache_stats_vps_schema,
+    changes_vps_schema,
+    create_vps_schema,
+    export_vps_schema,
+    list_vps_schema,
+    lookup_vps_schema,
+    partial_update_vps_schema,
+    stats_vps_schema,
+)
+from api.v1.serializers import (
+    VPSBulkStatusSerializer,
+    VPSLookupSerializer,
+    VPSSerializer,
+)
 
 
-class VPSViewSet(ModelViewSet):
+class VPSViewSet(
+    ChangeFeedMixin, ConditionalResponseMixin, SparseFieldsMixin, ModelViewSet
+):
     """
     ViewSet для управления объектами модели VPS.
     Предоставляет следующие действия:
     - Получение списка VPS (list)
+    - Получение VPS по UID (retrieve)
+    - Получение нескольких VPS по списку UID (lookup)
+    - Статистика кэша ответов (cache_stats)
+    - Сводка по серверам в разрезе статусов (stats)
+    - Лента изменений VPS: long-poll или Server-Sent Events (changes)
     - Создание нового VPS (create)
+    - Пакетное создание VPS (batch_create)
+    - Массовая смена статуса VPS (bulk_status)
+    - Потоковая выгрузка VPS в NDJSON или CSV (export)
     - Частичное обновление существующего VPS (partial_update)
+
+    Запросы чтения (list, retrieve, lookup, export) принимают параметр
+    ``fields``: в ответ и в SQL-запрос попадают только перечисленные поля.
+
+    Если установлен пакет msgpack, все действия принимают тело запроса
+    и отдают ответ в формате MessagePack (``application/msgpack``)
+    по заголовкам Content-Type и Accept.
     """
 
     http_method_names = ["get", "post", "patch", "options"]
@@ -24,15 +80,66 @@ class VPSViewSet(ModelViewSet):
     serializer_class = VPSSerializer
     filter_backends = (DjangoFilterBackend,)
     filterset_class = VPSFilter
+    pagination_class = VPSCursorPagination
+    parser_classes = (JSONParser, MessagePackParser, FormParser, MultiPartParser)
+    renderer_classes = (FastJSONRenderer, MessagePackRenderer, BrowsableAPIRenderer)
     lookup_field = "uid"
 
     @swagger_auto_schema(**list_vps_schema)
     def list(self, request, *args, **kwargs):
         """
-        Получение списка всех VPS серверов с возможностью фильтрации.
+        Получение списка VPS серверов с возможностью фильтрации.
+        Список отдаётся страницами с курсорами ``next`` и ``prev``.
+        Строки выбираются из БД сразу словарями полей сериализатора,
+        без создания объектов модели и вызова VPSSerializer.
+        Ответ кэшируется до следующей записи в таблицу VPS.
+        ETag и Last-Modified строятся по поколению кэша ответов и параметрам
+        запроса (см. VPSResponseCache.get_validators); если они совпадают
+        с условиями запроса, возвращается 304 без запросов к БД.
         """
-        servers = super().list(request, *args, **kwargs)
-        return Response(data={"servers": servers.data}, status=status.HTTP_200_OK)
+        key = response_cache.make_key(request, "list")
+        cached = response_cache.get(key)
+        if cached is None:
+            queryset = self.filter_queryset(self.get_queryset())
+            etag, last_modified = response_cache.get_validators(key)
+            not_modified = self.get_not_modified_response(request, etag, last_modified)
+            if not_modified is not None:
+                return not_modified
+            page = self.paginate_queryset(queryset.values(*self.get_read_fields()))
+            cached = (self.get_paginated_response(page).data, etag, last_modified)
+            response_cache.set(key, cached)
+        return self.get_conditional_response(request, *cached)
+
+    @swagger_auto_schema(**export_vps_schema)
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[NDJSONRenderer, CSVRenderer, MessagePackRenderer],
+    )
+    def export(self, request, *args, **kwargs):
+        """
+        Потоковая выгрузка VPS серверов с теми же фильтрами, что и у списка.
+        Формат (NDJSON, CSV или последовательность объектов MessagePack)
+        выбирается заголовком Accept или параметром ``format``. Серверы
+        читаются из БД порциями и отдаются клиенту по мере чтения,
+        не накапливаясь в памяти.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        fields = self.get_read_fields()
+        renderer = request.accepted_renderer
+        chunks = queryset.iter_chunks(
+            fields, settings.VPS_EXPORT_SETTINGS["CHUNK_SIZE"]
+        )
+        content_type = renderer.media_type
+        if renderer.charset:
+            content_type = f"{content_type}; charset={renderer.charset}"
+        response = StreamingHttpResponse(
+            renderer.stream(fields, chunks), content_type=content_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="vps.{renderer.format}"'
+        )
+        return response
 
     @swagger_auto_schema(**create_vps_schema)
     def create(self, request, *args, **kwargs):
@@ -41,19 +148,294 @@ class VPSViewSet(ModelViewSet):
         """
         return super().create(request, *args, **kwargs)
 
+    @swagger_auto_schema(**batch_create_vps_schema)
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch_create(self, request, *args, **kwargs):
+        """
+        Пакетное создание VPS серверов из JSON-массива.
+        Все валидные серверы сохраняются в одной транзакции.
+        По умолчанию ошибка любого элемента отклоняет весь пакет;
+        с параметром ``skip_invalid=true`` сохраняются валидные элементы,
+        а ошибки остальных возвращаются в поле ``errors``.
+        """
+        skip_invalid = request.query_params.get("skip_invalid", "").lower() in (
+            "1",
+            "true",
+        )
+        context = self.get_serializer_context()
+        context["skip_invalid"] = skip_invalid
+        serializer = self.get_serializer(
+            data=request.data,
+            many=True,
+            max_length=settings.VPS_BATCH_SETTINGS["MAX_SIZE"],
+            context=context,
+        )
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+
+        data = {"servers": serializer.data}
+        if skip_invalid:
+            data["errors"] = [
+                {"index": index, "errors": errors}
+                for index, errors in serializer.item_errors.items()
+            ]
+        return Response(data=data, status=status.HTTP_201_CREATED)
+
+    @swagger_auto_schema(**bulk_status_vps_schema)
+    @action(detail=False, methods=["post"], url_path="status")
+    def bulk_status(self, request, *args, **kwargs):
+        """
+        Массовая смена статуса VPS одним условным UPDATE.
+        Серверы выбираются списком ``uids`` в теле запроса и/или
+        параметрами фильтра VPSFilter в строке запроса.
+        Возвращает количество изменённых серверов и, по запросу, их UID.
+        """
+        serializer = VPSBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        target_status = serializer.validated_data["status"]
+        uids = serializer.validated_data.get("uids")
+
+        # Выбор проверяется по очищенным значениям фильтров: пустой
+        # параметр (``?status=``) фильтр игнорирует, и UPDATE затронул бы
+        # все серверы
+        filterset = DjangoFilterBackend().get_filterset(
+            request, self.get_queryset(), self
+        )
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        filtered = any(
+            value not in EMPTY_VALUES for value in filterset.form.cleaned_data.values()
+        )
+        if uids is None and not filtered:
+            raise ValidationError(
+                {"non_field_errors": [_("Specify uids or at least one filter.")]}
+            )
+
+        queryset = filterset.qs
+        if uids is not None:
+            queryset = queryset.filter(uid__in=uids)
+
+        if serializer.validated_data["return_uids"]:
+            changed = queryset.set_status_returning(target_status)
+            data = {"updated": len(changed), "uids": changed}
+        else:
+            data = {"updated": queryset.set_status(target_status)}
+        return Response(data=data, status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(method="get", **lookup_vps_schema["get"])
+    @swagger_auto_schema(method="post", **lookup_vps_schema["post"])
+    @action(
+        detail=False,
+        methods=["get", "post"],
+        filter_backends=(),
+        pagination_class=None,
+    )
+    def lookup(self, request, *args, **kwargs):
+        """
+        Получение нескольких VPS по списку UID одним запросом к API.
+        UID передаются параметром ``uids`` через запятую (GET) или списком
+        ``uids`` в теле запроса (POST, для больших списков). Серверы
+        выбираются запросами ``uid IN (...)`` по индексу первичного ключа
+        и возвращаются в порядке запроса; UID, для которых сервер
+        не найден, перечисляются в ``missing``.
+        """
+        if request.method == "GET":
+            data = {
+                "uids": [
+                    uid
+                    for value in request.query_params.getlist("uids")
+                    for uid in value.split(",")
+                    if uid
+                ]
+            }
+        else:
+            data = request.data
+        serializer = VPSLookupSerializer(data=data)
+        serializer.is_valid(raise_exception=True)
+        uids = list(dict.fromkeys(serializer.validated_data["uids"]))
+
+        rows = self.get_queryset().values_by_uid(uids, self.get_read_fields())
+        return Response(
+            data={
+                "servers": [rows[uid] for uid in uids if uid in rows],
+                "missing": [uid for uid in uids if uid not in rows],
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        """
+        Получение VPS сервера по UID.
+        Версия сервера возвращается в заголовке ETag, время изменения -
+        в Last-Modified; при совпадении с условиями запроса возвращается 304.
+        Ответ кэшируется до следующей записи в таблицу VPS.
+        """
+        key = response_cache.make_key(request, "retrieve")
+        cached = response_cache.get(key)
+        if cached is None:
+            instance = self.get_object()
+            not_modified = self.get_not_modified_response(
+                request, instance.etag, instance.updated_at
+            )
+            if not_modified is not None:
+                return not_modified
+            data = self.get_serializer(instance).data
+            cached = (data, instance.etag, instance.updated_at)
+            response_cache.set(key, cached)
+        return self.get_conditional_response(request, *cached)
+
+    @swagger_auto_schema(**cache_stats_vps_schema)
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="cache",
+        filter_backends=(),
+        pagination_class=None,
+    )
+    def cache_stats(self, request, *args, **kwargs):
+        """
+        Счётчики попаданий и промахов кэша ответов в текущем процессе.
+        """
+        return Response(data=response_cache.get_stats(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(**stats_vps_schema)
+    @action(
+        detail=False,
+        methods=["get"],
+        filter_backends=(),
+        pagination_class=None,
+    )
+    def stats(self, request, *args, **kwargs):
+        """
+        Количество серверов и суммарные CPU, RAM и HDD по статусам и в целом.
+        Читается из сводки VPSStats (по строке на статус), поэтому время
+        ответа не зависит от количества серверов.
+        """
+        return Response(data=VPSStats.objects.get_summary(), status=status.HTTP_200_OK)
+
+    @swagger_auto_schema(**changes_vps_schema)
+    @action(
+        detail=False,
+        methods=["get"],
+        renderer_classes=[
+            FastJSONRenderer,
+            EventStreamRenderer,
+            MessagePackRenderer,
+            BrowsableAPIRenderer,
+        ],
+        filter_backends=(),
+        pagination_class=None,
+    )
+    def changes(self, request, *args, **kwargs):
+        """
+        Лента изменений VPS: записи журнала VPSChange с номерами больше
+        ``since``. Без ``since`` лента начинается с текущего конца журнала.
+        С параметром ``wait`` запрос ждёт появления записей до ``wait``
+        секунд (long-poll). С заголовком ``Accept: text/event-stream``
+        записи отдаются потоком Server-Sent Events по мере появления.
+        """
+        query = self.get_changes_query(request)
+        changes = VPSChange.objects.all()
+        since = query.get("since")
+        if since is None:
+            since = changes.get_last_seq()
+
+        def fetch(seq):
+            return list(changes.since(seq, query["limit"]))
+
+        renderer = request.accepted_renderer
+        if isinstance(renderer, EventStreamRenderer):
+            return self.get_event_stream_response(
+                renderer.stream(change_notifier.stream(fetch, since))
+            )
+        return Response(
+            data=self.get_changes_data(
+                change_notifier.poll(fetch, since, query["wait"]), since
+            ),
+            status=status.HTTP_200_OK,
+        )
+
     @swagger_auto_schema(**partial_update_vps_schema)
     def partial_update(self, request, *args, **kwargs):
         """
         Частичное обновление данных существующего VPS.
         Поддерживает обновление поля статус у объекта VPS.
+        В БД записывается только статус; при переданном заголовке If-Match
+        изменение выполняется, только если версия сервера не изменилась,
+        иначе возвращается 412.
         """
         instance = self.get_object()
+        version = self.get_if_match_version(request, instance)
         serializer = self.get_serializer(instance, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
 
         # Обновление статуса, если он присутствует в данных
         if "status" in serializer.validated_data:
-            instance.status = serializer.validated_data["status"]
-            instance.save()
+            if not instance.update_status(
+                serializer.validated_data["status"], version=version
+            ):
+                raise PreconditionFailed()
+
+        return Response(
+            serializer.data, status=status.HTTP_200_OK, headers={"ETag": instance.etag}
+        )
 
-        return Response(serializer.data, status=status.HTTP_200_OK)
+    def get_parsers(self):
+        """
+        Возвращает парсеры действия; без пакета msgpack - без MessagePack.
+        """
+        return [
+            parser
+            for parser in super().get_parsers()
+            if msgpack is not None or not isinstance(parser, MessagePackParser)
+        ]
+
+    def get_renderers(self):
+        """
+        Возвращает рендереры действия; без пакета msgpack - без MessagePack.
+        """
+        return [
+            renderer
+            for renderer in super().get_renderers()
+            if msgpack is not None or not isinstance(renderer, MessagePackRenderer)
+        ]
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        """
+        Отмечает, что формат ответа зависит от заголовка Accept, чтобы
+        промежуточные кэши не отдали MessagePack клиенту JSON и наоборот.
+        """
+        response = super().finalize_response(request, response, *args, **kwargs)
+        patch_vary_headers(response, ("Accept",))
+        return response
+
+    def get_queryset(self):
+        """
+        Возвращает выборку серверов. Для retrieve с параметром ``fields``
+        из БД читаются только запрошенные поля и поля валидаторов
+        условного GET (версия и время изменения).
+        """
+        queryset = super().get_queryset()
+        if self.action == "retrieve":
+            fields = self.get_requested_fields(self.request)
+            if fields is not None:
+                queryset = queryset.only(*fields, "version", "updated_at")
+        return queryset
+
+    def get_serializer(self, *args, **kwargs):
+        """
+        Возвращает VPSSerializer, ограниченный полями параметра ``fields``.
+        """
+        kwargs.setdefault("fields", self.get_requested_fields(self.request))
+        return super().get_serializer(*args, **kwargs)
+
+    def get_read_fields(self):
+        """
+        Возвращает имена полей, которые отдаёт VPSSerializer (с учётом
+        параметра ``fields``). Все они - простые столбцы модели без
+        преобразований, поэтому их значения можно выбирать из БД напрямую
+        через ``values()``.
+
+        :return: Кортеж имён полей в порядке сериализатора
+        """
+        return tuple(self.get_serializer().fields)
@@ -0,0 +1,20 @@
+from django.http import HttpResponse
+from django.views.decorators.http import require_GET
+
+from api.metrics import metrics_registry, render_metrics
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Экспорт метрик API в текстовом формате Prometheus.
+    При заданном ``VPS_METRICS_SETTINGS["DIRECTORY"]`` включает значения
+    всех процессов-воркеров.
+
+    :param request: Запрос
+    :return: Ответ с метриками
+    """
+    return HttpResponse(
+        render_metrics(metrics_registry.collect_all()),
+        content_type="text/plain; version=0.0.4; charset=utf-8",
+    )
@@ -0,0 +1,506 @@
+"""
+Нагрузочный бенчмарк API VPS: пропускная способность, задержки, число
+SQL-запросов и пиковое потребление памяти.
+
+Для каждого размера набора данных (по умолчанию 1k, 100k и 1M серверов)
+во временный файл SQLite загружаются серверы, после чего операции API
+прогоняются двумя способами:
+
+- ``client``: тестовый клиент Django, без HTTP и сети;
+- ``server``: настоящий HTTP-сервер (wsgiref с WSGI-приложением проекта
+  и пулом из ``--threads`` потоков) в отдельном процессе, запросы
+  отправляются по TCP из ``--concurrency`` потоков.
+
+Операции: ``list`` (первая страница без фильтров), ``list_filtered``
+(фильтры по статусу и диапазонам ресурсов), ``retrieve``, ``create``
+и ``partial_update``. Для каждой операции выводятся пропускная способность,
+задержки p50 / p95 / p99, медианное число SQL-запросов на запрос и пиковый
+RSS процесса, обрабатывавшего запросы. Кэш ответов по умолчанию отключён
+(DummyCache), чтобы измерялась работа с БД; ``--cache`` оставляет
+настроенный кэш.
+
+Результаты сохраняются в JSON (``--output``) и сравниваются с ранее
+сохранёнными (``--baseline``): падение пропускной способности или рост p95
+и RSS больше чем на ``--tolerance``, а также любой рост числа SQL-запросов
+считаются регрессией, и бенчмарк завершается с кодом 1. Базовые результаты
+зависят от машины, поэтому сравнивать стоит запуски на одном окружении.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.api_load --output results.json
+    python -m benchmarks.api_load --sizes 1000 100000 \\
+        --baseline benchmarks/baselines/api_load.json
+"""
+
+import argparse
+import http.client
+import itertools
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+OPERATIONS = ("list", "list_filtered", "retrieve", "create", "partial_update")
+STATUSES = ("started", "stopped", "blocked")
+SEED_CHUNK_SIZE = 10000
+UID_SAMPLE_SIZE = 1000
+
+
+def setup_django(args):
+    """
+    Настраивает Django на файл БД бенчмарка. Вызывается в дочерних процессах
+    до обращения к моделям.
+    """
+    os.environ["VPS_DATABASE_PROFILE"] = args.profile
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
+
+    import django
+    from django.conf import settings
+
+    settings.DATABASES["default"]["NAME"] = args.database
+    settings.DEBUG = False
+    settings.ALLOWED_HOSTS = ["*"]
+    if not args.cache:
+        settings.CACHES = {
+            "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+        }
+    django.setup()
+
+
+def get_peak_rss(usage):
+    """
+    Возвращает пиковый RSS процесса в мегабайтах.
+
+    :param usage: Результат resource.getrusage / os.wait4
+    """
+    # ru_maxrss: килобайты в Linux, байты в macOS
+    scale = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(usage.ru_maxrss / scale, 1)
+
+
+def seed(args):
+    """
+    Создаёт схему БД и заполняет таблицу VPS ``--rows`` серверами.
+    """
+    setup_django(args)
+
+    from django.core.management import call_command
+
+    from api.models import VPS
+
+    call_command("migrate", verbosity=0)
+    servers = (
+        VPS(
+            cpu=2 + i % 79,
+            ram=2 + 2 * (i % 32),
+            hdd=5 + i % 4092,
+            status=STATUSES[i % 3],
+        )
+        for i in range(args.rows)
+    )
+    while chunk := list(itertools.islice(servers, SEED_CHUNK_SIZE)):
+        VPS.objects.bulk_create(chunk)
+
+
+def make_request(operation, uids, i):
+    """
+    Строит i-й запрос операции.
+
+    :param operation: Операция из OPERATIONS
+    :param uids: UID существующих серверов
+    :param i: Номер запроса
+    :return: Кортеж (метод, путь, тело или None, ожидаемый код ответа)
+    """
+    uid = uids[i % len(uids)]
+    if operation == "list":
+        return "GET", "/api/v1/vps?limit=100", None, 200
+    if operation == "list_filtered":
+        return (
+            "GET",
+            f"/api/v1/vps?status={STATUSES[i % 3]}&cpu_min=8&ram_max=32&limit=100",
+            None,
+            200,
+        )
+    if operation == "retrieve":
+        return "GET", f"/api/v1/vps/{uid}", None, 200
+    if operation == "create":
+        body = {"cpu": 4, "ram": 8, "hdd": 100, "status": STATUSES[i % 3]}
+        return "POST", "/api/v1/vps", body, 201
+    body = {"status": STATUSES[i % 3]}
+    return "PATCH", f"/api/v1/vps/{uid}", body, 200
+
+
+def measure(send, operation, uids, args, concurrency=1):
+    """
+    Выполняет запросы операции и собирает задержки и число SQL-запросов.
+
+    :param send: Функция (метод, путь, тело) -> (код ответа, тело, число запросов)
+    :param operation: Операция из OPERATIONS
+    :param uids: UID существующих серверов
+    :param concurrency: Число одновременных клиентов
+    :return: Словарь результатов операции
+    """
+    latencies = []
+    queries = []
+
+    def call(i):
+        method, path, body, expected = make_request(operation, uids, i)
+        start = time.perf_counter()
+        status, _content, query_count = send(method, path, body)
+        latency = time.perf_counter() - start
+        assert status == expected, f"{method} {path} -> {status}"
+        return latency, query_count
+
+    for i in range(args.warmup):
+        call(i)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for latency, query_count in pool.map(call, range(args.requests)):
+            latencies.append(latency)
+            queries.append(query_count)
+    elapsed = time.perf_counter() - start
+
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return {
+        "operation": operation,
+        "requests": args.requests,
+        "throughput": round(args.requests / elapsed, 1),
+        "p50_ms": round(percentiles[49] * 1000, 2),
+        "p95_ms": round(percentiles[94] * 1000, 2),
+        "p99_ms": round(percentiles[98] * 1000, 2),
+        "queries": statistics.median(queries),
+    }
+
+
+def run_operations(send, args, concurrency=1):
+    """
+    Прогоняет все операции; UID для retrieve / partial_update берутся
+    из первой страницы списка.
+
+    :return: Список результатов операций
+    """
+    path = f"/api/v1/vps?limit={UID_SAMPLE_SIZE}"
+    _status, content, _queries = send("GET", path, None)
+    uids = [server["uid"] for server in json.loads(content)["servers"]]
+    return [
+        measure(send, operation, uids, args, concurrency) for operation in OPERATIONS
+    ]
+
+
+def run_client(args):
+    """
+    Прогоняет операции через тестовый клиент Django и печатает результаты
+    в формате JSON.
+    """
+    setup_django(args)
+
+    from django.db import connection
+    from django.test import Client
+
+    client = Client()
+
+    def send(method, path, body):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(count):
+            response = getattr(client, method.lower())(
+                path,
+                data=json.dumps(body) if body is not None else None,
+                content_type="application/json",
+            )
+        return response.status_code, response.content, len(queries)
+
+    results = run_operations(send, args)
+    peak_rss = get_peak_rss(resource.getrusage(resource.RUSAGE_SELF))
+    for result in results:
+        result["peak_rss_mb"] = peak_rss
+    print(json.dumps(results))
+
+
+def serve(args):
+    """
+    Запускает многопоточный HTTP-сервер с WSGI-приложением проекта
+    на свободном порту и печатает номер порта. Число SQL-запросов
+    каждого запроса передаётся в заголовке ``X-Query-Count``.
+    """
+    setup_django(args)
+
+    from wsgiref.simple_server import WSGIRequestHandler, WSGIServer, make_server
+
+    from django.core.wsgi import get_wsgi_application
+    from django.db import connection
+
+    application = get_wsgi_application()
+
+    def counting_application(environ, start_response):
+        queries = []
+
+        def count(execute, sql, params, many, context):
+            queries.append(sql)
+            return execute(sql, params, many, context)
+
+        def start(status, headers, exc_info=None):
+            headers.append(("X-Query-Count", str(len(queries))))
+            return start_response(status, headers, exc_info)
+
+        with connection.execute_wrapper(count):
+            return application(environ, start)
+
+    class ThreadPoolWSGIServer(WSGIServer):
+        """
+        Сервер, обрабатывающий запросы в пуле из ``--threads`` потоков,
+        как воркер gthread: соединения с БД переиспользуются потоками.
+        """
+
+        request_queue_size = 128
+        pool = ThreadPoolExecutor(max_workers=args.threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.process_request_thread, request, client_address)
+
+        def process_request_thread(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    class QuietHandler(WSGIRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+    server = make_server(
+        "127.0.0.1",
+        0,
+        counting_application,
+        server_class=ThreadPoolWSGIServer,
+        handler_class=QuietHandler,
+    )
+    print(server.server_port, flush=True)
+    server.serve_forever()
+
+
+def run_server(args, database):
+    """
+    Запускает сервер в отдельном процессе и прогоняет операции по HTTP.
+
+    :return: Список результатов операций
+    """
+    process = subprocess.Popen(
+        child_command(args, "--serve", database),
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    try:
+        port = int(process.stdout.readline())
+
+        def send(method, path, body):
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+            try:
+                connection.request(
+                    method,
+                    path,
+                    body=json.dumps(body) if body is not None else None,
+                    headers={"Content-Type": "application/json"},
+                )
+                response = connection.getresponse()
+                content = response.read()
+                return response.status, content, int(response.headers["X-Query-Count"])
+            finally:
+                connection.close()
+
+        results = run_operations(send, args, args.concurrency)
+    finally:
+        process.terminate()
+        process.stdout.close()
+    # Пиковый RSS сервера берётся из rusage завершённого процесса
+    _pid, _status, usage = os.wait4(process.pid, 0)
+    process.returncode = 0
+    peak_rss = get_peak_rss(usage)
+    for result in results:
+        result["peak_rss_mb"] = peak_rss
+    return results
+
+
+def child_command(args, mode, database):
+    """
+    Строит команду запуска дочернего процесса бенчмарка.
+    """
+    command = [
+        sys.executable,
+        "-m",
+        "benchmarks.api_load",
+        mode,
+        "--database",
+        str(database),
+        "--profile",
+        args.profile,
+        "--requests",
+        str(args.requests),
+        "--warmup",
+        str(args.warmup),
+        "--threads",
+        str(args.threads),
+    ]
+    if args.cache:
+        command.append("--cache")
+    return command
+
+
+def run_dataset(args, rows):
+    """
+    Заполняет временную БД и прогоняет операции обоими способами.
+
+    :return: Список результатов для набора данных
+    """
+    with tempfile.TemporaryDirectory() as directory:
+        database = Path(directory) / "bench.sqlite3"
+        start = time.perf_counter()
+        subprocess.run(
+            child_command(args, "--seed", database) + ["--rows", str(rows)],
+            check=True,
+        )
+        print(f"seeded {rows} rows in {time.perf_counter() - start:.1f} s", flush=True)
+
+        output = subprocess.run(
+            child_command(args, "--client", database),
+            check=True,
+            stdout=subprocess.PIPE,
+            text=True,
+        ).stdout
+        results = [
+            {"rows": rows, "driver": "client", **result}
+            for result in json.loads(output)
+        ]
+        results += [
+            {"rows": rows, "driver": "server", **result}
+            for result in run_server(args, database)
+        ]
+    for result in results:
+        print(format_result(result), flush=True)
+    return results
+
+
+def format_result(result):
+    """
+    Форматирует результат операции строкой таблицы.
+    """
+    return (
+        f"{result['rows']:>9} {result['driver']:>7} {result['operation']:>15} "
+        f"{result['throughput']:>8.0f} {result['p50_ms']:>8.2f} "
+        f"{result['p95_ms']:>8.2f} {result['p99_ms']:>8.2f} "
+        f"{result['queries']:>8.2f} {result['peak_rss_mb']:>8.1f}"
+    )
+
+
+def compare(results, baseline, tolerance):
+    """
+    Сравнивает результаты с базовыми.
+
+    :param results: Текущие результаты
+    :param baseline: Базовые результаты
+    :param tolerance: Допустимое относительное ухудшение
+    :return: Список описаний регрессий
+    """
+    base = {
+        (result["rows"], result["driver"], result["operation"]): result
+        for result in baseline["results"]
+    }
+    regressions = []
+    for result in results:
+        key = (result["rows"], result["driver"], result["operation"])
+        if key not in base:
+            continue
+        previous = base[key]
+        label = "{} {} {}".format(*key)
+        if result["throughput"] < previous["throughput"] * (1 - tolerance):
+            regressions.append(
+                f"{label}: throughput {previous['throughput']} -> "
+                f"{result['throughput']} req/s"
+            )
+        for metric in ("p95_ms", "peak_rss_mb"):
+            if result[metric] > previous[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{label}: {metric} {previous[metric]} -> {result[metric]}"
+                )
+        if result["queries"] > previous["queries"]:
+            regressions.append(
+                f"{label}: queries {previous['queries']} -> {result['queries']}"
+            )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000])
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--profile", default="production")
+    parser.add_argument("--cache", action="store_true")
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--seed", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--client", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--database", help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.seed:
+        return seed(args)
+    if args.client:
+        return run_client(args)
+    if args.serve:
+        return serve(args)
+
+    print(
+        f"{'rows':>9} {'driver':>7} {'operation':>15} {'req/s':>8} {'p50, ms':>8} "
+        f"{'p95, ms':>8} {'p99, ms':>8} {'queries':>8} {'RSS, MB':>8}",
+        flush=True,
+    )
+    results = []
+    for rows in args.sizes:
+        results += run_dataset(args, rows)
+
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "profile": args.profile,
+            "cache": args.cache,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "threads": args.threads,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.baseline:
+        regressions = compare(
+            results, json.loads(args.baseline.read_text()), args.tolerance
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+        print("No regressions against the baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+"""
+Бенчмарк конкурентности API VPS под WSGI и ASGI с медленными клиентами.
+
+Каждый клиент тратит ``--client-delay`` секунд на отправку запроса и столько же
+на получение ответа (медленная сеть). Сравниваются три пути:
+
+- ``wsgi``: WSGIHandler в пуле из ``--threads`` потоков (как воркер gthread):
+  поток занят запросом всё время, пока клиент отправляет и получает данные;
+- ``asgi-sync``: ASGIHandler с синхронным VPSViewSet
+  (``VPS_ASYNC_SETTINGS["URLCONF"] = None``);
+- ``asgi-async``: ASGIHandler с асинхронными представлениями VPS.
+
+Клиенты запрашивают серверы по UID (каждый UID один раз, чтобы ответы
+не отдавались из кэша) и страницы списка. Для каждого уровня конкурентности
+выводятся пропускная способность и задержки p50 / p99.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.asgi_concurrency --concurrency 10 100 500
+"""
+
+import argparse
+import asyncio
+import io
+import os
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.core.asgi import get_asgi_application  # noqa: E402
+from django.core.cache import cache  # noqa: E402
+from django.core.wsgi import get_wsgi_application  # noqa: E402
+from django.db import connection  # noqa: E402
+
+from api.models import VPS  # noqa: E402
+
+HOST = "localhost"
+
+
+def seed(rows):
+    """
+    Заполняет таблицу VPS указанным количеством серверов.
+
+    :return: Список UID созданных серверов
+    """
+    VPS.objects.all().delete()
+    return [
+        vps.uid
+        for vps in VPS.objects.bulk_create(
+            VPS(
+                cpu=2 + i % 79,
+                ram=2 + 2 * (i % 32),
+                hdd=5 + i % 4092,
+                status=VPS.STATUS_CHOICES[i % 3][0],
+            )
+            for i in range(rows)
+        )
+    ]
+
+
+def make_paths(uids, count):
+    """
+    Строит пути запросов: четыре из пяти - получение сервера по UID,
+    каждый пятый - страница списка.
+
+    :return: Список пар (путь, строка запроса)
+    """
+    paths = []
+    for i in range(count):
+        if i % 5 == 4:
+            paths.append(("/api/v1/vps", f"limit={10 + i % 90}&status=started"))
+        else:
+            paths.append((f"/api/v1/vps/{uids[i % len(uids)]}", ""))
+    return paths
+
+
+def call_wsgi(application, path, query, delay):
+    """
+    Выполняет запрос через WSGI-приложение в потоке пула.
+    Поток занят и пока клиент отправляет запрос, и пока получает ответ.
+
+    :return: Код ответа
+    """
+    time.sleep(delay)
+    result = {}
+
+    def start_response(status, headers, exc_info=None):
+        result["status"] = int(status.split()[0])
+
+    environ = {
+        "REQUEST_METHOD": "GET",
+        "PATH_INFO": path,
+        "QUERY_STRING": query,
+        "SERVER_NAME": HOST,
+        "SERVER_PORT": "80",
+        "SERVER_PROTOCOL": "HTTP/1.1",
+        "HTTP_HOST": HOST,
+        "wsgi.input": io.BytesIO(),
+        "wsgi.errors": sys.stderr,
+        "wsgi.url_scheme": "http",
+    }
+    response = application(environ, start_response)
+    try:
+        b"".join(response)
+    finally:
+        response.close()
+    time.sleep(delay)
+    return result["status"]
+
+
+async def call_asgi(application, path, query, delay):
+    """
+    Выполняет запрос через ASGI-приложение в цикле событий.
+    Отправка запроса и получение ответа клиентом не занимают поток.
+
+    :return: Код ответа
+    """
+    result = {}
+    sent = asyncio.Event()
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": query.encode(),
+        "root_path": "",
+        "headers": [(b"host", HOST.encode())],
+        "client": ("127.0.0.1", 50000),
+        "server": (HOST, 80),
+    }
+    body_received = False
+
+    async def receive():
+        nonlocal body_received
+        if not body_received:
+            body_received = True
+            await asyncio.sleep(delay)
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await sent.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            result["status"] = message["status"]
+        elif not message.get("more_body", False):
+            await asyncio.sleep(delay)
+            sent.set()
+
+    await application(scope, receive, send)
+    return result["status"]
+
+
+async def run_clients(call, paths, concurrency):
+    """
+    Выполняет запросы ``concurrency`` одновременными клиентами.
+
+    :return: Кортеж (общее время, задержки запросов)
+    """
+    queue = list(reversed(paths))
+    latencies = []
+
+    async def client():
+        while queue:
+            path, query = queue.pop()
+            start = time.perf_counter()
+            status = await call(path, query)
+            latencies.append(time.perf_counter() - start)
+            assert status == 200, f"{path}?{query} -> {status}"
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return time.perf_counter() - start, latencies
+
+
+def run_wsgi(paths, concurrency, threads, delay):
+    """
+    Прогоняет запросы через WSGI-приложение в пуле потоков.
+    """
+    application = get_wsgi_application()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+
+        async def call(path, query):
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                pool, call_wsgi, application, path, query, delay
+            )
+
+        return asyncio.run(run_clients(call, paths, concurrency))
+
+
+def run_asgi(paths, concurrency, delay, urlconf):
+    """
+    Прогоняет запросы через ASGI-приложение с указанным URLconf.
+    """
+    settings.VPS_ASYNC_SETTINGS["URLCONF"] = urlconf
+    application = get_asgi_application()
+
+    async def call(path, query):
+        return await call_asgi(application, path, query, delay)
+
+    return asyncio.run(run_clients(call, paths, concurrency))
+
+
+def percentile(values, percent):
+    """
+    Возвращает перцентиль значений.
+    """
+    return statistics.quantiles(values, n=100, method="inclusive")[percent - 1]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--client-delay", type=float, default=0.05)
+    args = parser.parse_args()
+
+    connection.creation.create_test_db(verbosity=0)
+    uids = seed(args.rows)
+    async_urlconf = settings.VPS_ASYNC_SETTINGS["URLCONF"]
+    runners = {
+        "wsgi": lambda paths, concurrency: run_wsgi(
+            paths, concurrency, args.threads, args.client_delay
+        ),
+        "asgi-sync": lambda paths, concurrency: run_asgi(
+            paths, concurrency, args.client_delay, None
+        ),
+        "asgi-async": lambda paths, concurrency: run_asgi(
+            paths, concurrency, args.client_delay, async_urlconf
+        ),
+    }
+
+    print(f"{'path':>10} {'clients':>8} {'req/s':>8} {'p50, ms':>9} {'p99, ms':>9}")
+    for concurrency in args.concurrency:
+        for name, run in runners.items():
+            cache.clear()
+            elapsed, latencies = run(make_paths(uids, args.requests), concurrency)
+            print(
+                f"{name:>10} {concurrency:>8} {len(latencies) / elapsed:>8.0f} "
+                f"{percentile(latencies, 50) * 1000:>9.1f} "
+                f"{percentile(latencies, 99) * 1000:>9.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+Бенчмарк объёма и времени передачи списка VPS.
+
+Сравнивает полный список серверов и список с параметром ``fields``
+без сжатия и со сжатием gzip / brotli (если установлен пакет brotli)
+для двух способов получить весь парк:
+
+- ``list``: обход всех страниц ``GET /api/v1/vps?limit=1000`` по курсорам;
+- ``export``: потоковая выгрузка ``GET /api/v1/vps/export`` (NDJSON).
+
+Запросы выполняются тестовым клиентом Django через всю цепочку middleware,
+кэш ответов отключён. Сквозное время складывается из времени сервера,
+оценки времени передачи по каналу ``--bandwidth`` Мбит/с и времени
+распаковки и разбора JSON клиентом.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.list_payload --rows 100000
+"""
+
+import argparse
+import gzip
+import json
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings  # noqa: E402
+
+from api.compression import brotli  # noqa: E402
+from benchmarks.list_serialization import seed  # noqa: E402
+
+FIELDS = (None, "uid,status")
+DECODERS = {
+    "identity": lambda body: body,
+    "gzip": gzip.decompress,
+}
+if brotli is not None:
+    DECODERS["br"] = brotli.decompress
+
+
+def get_body(response):
+    """
+    Возвращает тело ответа (потокового или обычного).
+    """
+    if response.streaming:
+        return b"".join(response.streaming_content)
+    return response.content
+
+
+def fetch_list(client, params, headers):
+    """
+    Обходит все страницы списка.
+
+    :return: Список тел ответов и время сервера, секунды
+    """
+    bodies, server_time = [], 0.0
+    url, query = "/api/v1/vps", {"limit": 1000, **params}
+    while url:
+        start = time.perf_counter()
+        response = client.get(url, query, headers=headers)
+        bodies.append(get_body(response))
+        server_time += time.perf_counter() - start
+        encoding = response.get("Content-Encoding", "identity")
+        url = json.loads(DECODERS[encoding](bodies[-1]))["next"]
+        query = None
+    return bodies, encoding, server_time
+
+
+def fetch_export(client, params, headers):
+    """
+    Выполняет потоковую выгрузку.
+
+    :return: Список из одного тела ответа и время сервера, секунды
+    """
+    start = time.perf_counter()
+    response = client.get("/api/v1/vps/export", params, headers=headers)
+    body = get_body(response)
+    return (
+        [body],
+        response.get("Content-Encoding", "identity"),
+        (time.perf_counter() - start),
+    )
+
+
+def decode(bodies, encoding, mode):
+    """
+    Распаковывает и разбирает тела ответов, как это делает клиент.
+
+    :return: Количество серверов и время, секунды
+    """
+    start = time.perf_counter()
+    servers = 0
+    for body in bodies:
+        text = DECODERS[encoding](body)
+        if mode == "list":
+            servers += len(json.loads(text)["servers"])
+        else:
+            servers += sum(1 for line in text.splitlines() if json.loads(line))
+    return servers, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--bandwidth", type=float, default=100.0, help="Mbit/s")
+    args = parser.parse_args()
+
+    settings.ALLOWED_HOSTS = ["testserver"]
+    connection.creation.create_test_db(verbosity=0)
+    seed(args.rows)
+    client = Client()
+    print(
+        f"{'mode':>6} {'fields':>11} {'encoding':>8} {'MB':>8} {'server, s':>9} "
+        f"{'transfer, s':>11} {'client, s':>9} {'total, s':>8}"
+    )
+    with override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+    ):
+        for mode, fetch in (("list", fetch_list), ("export", fetch_export)):
+            for fields in FIELDS:
+                params = {"fields": fields} if fields else {}
+                for encoding in DECODERS:
+                    headers = {"accept-encoding": encoding}
+                    bodies, used, server_time = fetch(client, params, headers)
+                    assert used == encoding, f"{encoding} was not negotiated"
+                    servers, client_time = decode(bodies, encoding, mode)
+                    assert servers == args.rows, f"{servers} servers received"
+                    size = sum(len(body) for body in bodies)
+                    transfer = size * 8 / (args.bandwidth * 1_000_000)
+                    print(
+                        f"{mode:>6} {fields or 'all':>11} {encoding:>8} "
+                        f"{size / 1_000_000:>8.2f} {server_time:>9.2f} "
+                        f"{transfer:>11.2f} {client_time:>9.2f} "
+                        f"{server_time + transfer + client_time:>8.2f}"
+                    )
+
+
+if __name__ == "__main__":
+    main()
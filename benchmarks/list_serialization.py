@@ -0,0 +1,100 @@
+"""
+Микробенчмарк сериализации списка VPS.
+
+Сравнивает два способа построить тело ответа ``{"servers": [...]}``:
+
+- ``serializer``: объекты модели -> VPSSerializer -> JSONRenderer;
+- ``fast``: ``values()`` -> FastJSONRenderer (путь, используемый VPSViewSet.list).
+
+Запуск из корня проекта::
+
+    python -m benchmarks.list_serialization --rows 10000 100000
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.models import VPS  # noqa: E402
+from api.v1.renderers import FastJSONRenderer  # noqa: E402
+from api.v1.serializers import VPSSerializer  # noqa: E402
+
+
+def seed(rows):
+    """
+    Заполняет таблицу VPS указанным количеством серверов.
+    """
+    VPS.objects.all().delete()
+    VPS.objects.bulk_create(
+        (
+            VPS(
+                cpu=2 + i % 79,
+                ram=2 + 2 * (i % 32),
+                hdd=5 + i % 4092,
+                status=VPS.STATUS_CHOICES[i % 3][0],
+            )
+            for i in range(rows)
+        ),
+        batch_size=1000,
+    )
+
+
+def render_serializer():
+    """
+    Строит ответ через объекты модели и VPSSerializer.
+    """
+    data = VPSSerializer(VPS.objects.all(), many=True).data
+    return JSONRenderer().render({"servers": data})
+
+
+def render_fast():
+    """
+    Строит ответ через ``values()`` и FastJSONRenderer.
+    """
+    fields = tuple(VPSSerializer().fields)
+    data = list(VPS.objects.values(*fields))
+    return FastJSONRenderer().render({"servers": data})
+
+
+def measure(func, repeat):
+    """
+    Возвращает лучшее время выполнения функции и её результат.
+    """
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    connection.creation.create_test_db(verbosity=0)
+    print(f"{'rows':>8} {'serializer, s':>14} {'fast, s':>10} {'speedup':>8}")
+    for rows in args.rows:
+        seed(rows)
+        slow_time, slow_body = measure(render_serializer, args.repeat)
+        fast_time, fast_body = measure(render_fast, args.repeat)
+        assert slow_body == fast_body, "Fast path output differs from serializer"
+        print(
+            f"{rows:>8} {slow_time:>14.3f} {fast_time:>10.3f} "
+            f"{slow_time / fast_time:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
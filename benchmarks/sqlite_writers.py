@@ -0,0 +1,136 @@
+"""
+Бенчмарк конкурентной записи в SQLite для профилей БД development и production.
+
+Несколько потоков-писателей имитируют запросы PATCH: в начале и в конце
+каждого «запроса» закрываются устаревшие соединения (как по сигналам
+request_started / request_finished), затем сервер читается по UID
+и меняет статус через VPS.update_status. Каждый профиль запускается
+в отдельном процессе на временном файле БД; для development дополнительно
+показан результат без повторов записи (``VPS_DB_RETRY_SETTINGS["ATTEMPTS"] = 1``).
+
+Для каждого запуска выводятся пропускная способность, задержка p99
+и число запросов, завершившихся ошибкой «database is locked».
+
+Запуск из корня проекта::
+
+    python -m benchmarks.sqlite_writers --writers 8 --duration 5
+"""
+
+import argparse
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+PROFILES = (
+    ("development", 1),
+    ("development", None),
+    ("production", None),
+)
+
+
+def run_profile(args):
+    """
+    Выполняет замер для одного профиля в текущем процессе.
+    Печатает строку результата.
+    """
+    os.environ["VPS_DATABASE_PROFILE"] = args.profile
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
+
+    import django
+    from django.conf import settings
+
+    directory = tempfile.mkdtemp()
+    settings.DATABASES["default"]["NAME"] = Path(directory) / "bench.sqlite3"
+    if args.attempts is not None:
+        settings.VPS_DB_RETRY_SETTINGS["ATTEMPTS"] = args.attempts
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import OperationalError, close_old_connections
+
+    from api.models import VPS
+
+    call_command("migrate", verbosity=0)
+    uids = [
+        vps.uid
+        for vps in VPS.objects.bulk_create(
+            VPS(cpu=2 + i % 79, ram=2 + 2 * (i % 32), hdd=5 + i, status="started")
+            for i in range(args.rows)
+        )
+    ]
+    close_old_connections()
+
+    latencies = []
+    errors = []
+    deadline = time.perf_counter() + args.duration
+
+    def writer():
+        statuses = [status for status, _label in VPS.STATUS_CHOICES]
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            close_old_connections()
+            try:
+                vps = VPS.objects.get(uid=random.choice(uids))
+                vps.update_status(random.choice(statuses))
+            except OperationalError:
+                errors.append(1)
+            else:
+                latencies.append(time.perf_counter() - start)
+            close_old_connections()
+
+    threads = [threading.Thread(target=writer) for _ in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    p99 = statistics.quantiles(latencies, n=100, method="inclusive")[98]
+    label = args.profile + (" (no retry)" if args.attempts == 1 else "")
+    print(
+        f"{label:>24} {len(latencies) / args.duration:>8.0f} "
+        f"{p99 * 1000:>9.1f} {len(errors):>7}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--writers", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=5)
+    parser.add_argument("--rows", type=int, default=1000)
+    parser.add_argument("--profile", help=argparse.SUPPRESS)
+    parser.add_argument("--attempts", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        run_profile(args)
+        return
+
+    print(f"{'profile':>24} {'ops/s':>8} {'p99, ms':>9} {'errors':>7}", flush=True)
+    for profile, attempts in PROFILES:
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.sqlite_writers",
+            "--profile",
+            profile,
+            "--writers",
+            str(args.writers),
+            "--duration",
+            str(args.duration),
+            "--rows",
+            str(args.rows),
+        ]
+        if attempts is not None:
+            command += ["--attempts", str(attempts)]
+        subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
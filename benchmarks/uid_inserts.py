@@ -0,0 +1,118 @@
+"""
+Бенчмарк вставки VPS с UID версии 4 (случайные) и 7 (упорядоченные
+по времени).
+
+Для каждой версии (``VPS_UID_SETTINGS["VERSION"]``) в отдельном процессе
+на временном файле БД профиля production серверы создаются пакетами через
+VPS.objects.bulk_create, как при пакетной выдаче серверов. Выводятся:
+
+- пропускная способность вставки в целом и на последних 10% строк,
+  когда индекс первичного ключа уже не помещается в кэш страниц;
+- размер и заполненность страниц индекса первичного ключа
+  (``sqlite_autoindex_api_vps_1``) и суммарный размер файла БД
+  по данным виртуальной таблицы ``dbstat``.
+
+Запуск из корня проекта::
+
+    python -m benchmarks.uid_inserts --rows 1000000
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+VERSIONS = (4, 7)
+PK_INDEX = "sqlite_autoindex_api_vps_1"
+
+
+def run_version(args):
+    """
+    Выполняет замер для одной версии UID в текущем процессе.
+    Печатает строку результата.
+    """
+    os.environ["VPS_DATABASE_PROFILE"] = "production"
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
+
+    import django
+    from django.conf import settings
+
+    directory = tempfile.mkdtemp()
+    settings.DATABASES["default"]["NAME"] = Path(directory) / "bench.sqlite3"
+    settings.VPS_UID_SETTINGS["VERSION"] = args.version
+    django.setup()
+
+    from django.core.management import call_command
+    from django.db import connection
+
+    from api.models import VPS
+
+    call_command("migrate", verbosity=0)
+    tail_start = args.rows - args.rows // 10
+    tail_time = 0.0
+    start = time.perf_counter()
+    for offset in range(0, args.rows, args.batch):
+        batch_start = time.perf_counter()
+        VPS.objects.bulk_create(
+            VPS(
+                cpu=2 + i % 79, ram=2 + 2 * (i % 32), hdd=5 + i % 4092, status="started"
+            )
+            for i in range(offset, min(offset + args.batch, args.rows))
+        )
+        if offset >= tail_start:
+            tail_time += time.perf_counter() - batch_start
+    total_time = time.perf_counter() - start
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*), SUM(pgsize), SUM(unused) FROM dbstat WHERE name = %s",
+            [PK_INDEX],
+        )
+        pages, size, unused = cursor.fetchone()
+        cursor.execute("SELECT SUM(pgsize) FROM dbstat")
+        (db_size,) = cursor.fetchone()
+    print(
+        f"{'uuid' + str(args.version):>7} {args.rows / total_time:>9.0f} "
+        f"{(args.rows - tail_start) / tail_time:>10.0f} {pages:>9} "
+        f"{size / 1_000_000:>9.1f} {100 * (1 - unused / size):>6.1f} "
+        f"{db_size / 1_000_000:>8.1f}",
+        flush=True,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--version", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.version:
+        run_version(args)
+        return
+
+    print(
+        f"{'uid':>7} {'rows/s':>9} {'tail rows/s':>10} {'pk pages':>9} "
+        f"{'pk MB':>9} {'fill %':>6} {'db MB':>8}",
+        flush=True,
+    )
+    for version in VERSIONS:
+        command = [
+            sys.executable,
+            "-m",
+            "benchmarks.uid_inserts",
+            "--version",
+            str(version),
+            "--rows",
+            str(args.rows),
+            "--batch",
+            str(args.batch),
+        ]
+        subprocess.run(command, check=True)
+
+
+if __name__ == "__main__":
+    main()
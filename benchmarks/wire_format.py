@@ -0,0 +1,125 @@
+"""
+Микробенчмарк форматов обмена API VPS: JSON и MessagePack.
+
+Для двух типичных тел сравнивает размер и время обеих сторон обмена:
+
+- ``list``: ответ ``{"servers": [...]}`` из ``values()`` (путь
+  VPSViewSet.list): сервер - FastJSONRenderer (orjson, если установлен),
+  JSONRenderer DRF или MessagePackRenderer, клиент - ``json.loads`` /
+  ``msgpack.unpackb`` с восстановлением UUID;
+- ``batch``: тело пакетного создания ``[{cpu, ram, hdd, status}, ...]``:
+  клиент - ``json.dumps`` / ``msgpack.packb``, сервер - JSONParser /
+  MessagePackParser.
+
+Требует установленного пакета msgpack. Запуск из корня проекта::
+
+    python -m benchmarks.wire_format --rows 1000 10000
+"""
+
+import argparse
+import io
+import json
+import os
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
+django.setup()
+
+from django.db import connection  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from api.models import VPS  # noqa: E402
+from api.v1.parsers import MessagePackParser  # noqa: E402
+from api.v1.renderers import (  # noqa: E402
+    FastJSONRenderer,
+    MessagePackRenderer,
+    msgpack,
+)
+from api.v1.serializers import VPSSerializer  # noqa: E402
+from benchmarks.list_serialization import measure, seed  # noqa: E402
+
+FORMATS = {
+    "json": {
+        "render": FastJSONRenderer().render,
+        "parse": JSONParser().parse,
+        "loads": json.loads,
+        "dumps": lambda data: json.dumps(data).encode(),
+    },
+    "json-drf": {
+        "render": JSONRenderer().render,
+        "parse": JSONParser().parse,
+        "loads": json.loads,
+        "dumps": lambda data: json.dumps(data).encode(),
+    },
+    "msgpack": {
+        "render": MessagePackRenderer().render,
+        "parse": MessagePackParser().parse,
+        "loads": lambda content: msgpack.unpackb(
+            content, ext_hook=MessagePackParser().ext_hook
+        ),
+        "dumps": MessagePackRenderer().render,
+    },
+}
+
+
+def run_list(codec, repeat):
+    """
+    Ответ списка: сериализация сервером и разбор клиентом.
+
+    :return: Размер тела, время сервера и клиента, секунды
+    """
+    fields = tuple(VPSSerializer().fields)
+    data = {"servers": list(VPS.objects.values(*fields))}
+    server, content = measure(lambda: codec["render"](data), repeat)
+    client, _ = measure(lambda: codec["loads"](content), repeat)
+    return len(content), server, client
+
+
+def run_batch(codec, repeat, rows):
+    """
+    Тело пакетного создания: сериализация клиентом и разбор сервером.
+
+    :return: Размер тела, время сервера и клиента, секунды
+    """
+    data = [
+        {"cpu": 2 + i % 79, "ram": 2 + 2 * (i % 32), "hdd": 5 + i, "status": "started"}
+        for i in range(rows)
+    ]
+    client, content = measure(lambda: codec["dumps"](data), repeat)
+    server, _ = measure(lambda: codec["parse"](io.BytesIO(content)), repeat)
+    return len(content), server, client
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    if msgpack is None:
+        parser.error("msgpack is not installed")
+
+    connection.creation.create_test_db(verbosity=0)
+    print(
+        f"{'body':>6} {'rows':>7} {'format':>8} {'KB':>8} "
+        f"{'server, ms':>10} {'client, ms':>10}"
+    )
+    for rows in args.rows:
+        seed(rows)
+        for body in ("list", "batch"):
+            for name, codec in FORMATS.items():
+                if body == "batch" and name == "json-drf":
+                    continue  # Разбор тела тот же, что у json
+                if body == "list":
+                    size, server, client = run_list(codec, args.repeat)
+                else:
+                    size, server, client = run_batch(codec, args.repeat, rows)
+                print(
+                    f"{body:>6} {rows:>7} {name:>8} {size / 1000:>8.1f} "
+                    f"{server * 1000:>10.2f} {client * 1000:>10.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
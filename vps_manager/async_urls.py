@@ -0,0 +1,19 @@
+"""
+URL configuration for requests served by the ASGI handler.
+
+List, retrieve, create and partial_update of VPS and the change feed are
+routed to the native async views; every other URL falls through to
+``vps_manager.urls``.
+"""
+
+from django.urls import path
+
+from api.v1.async_views import VPSAsyncChangesView, VPSAsyncDetailView, VPSAsyncListView
+from vps_manager.urls import urlpatterns as sync_urlpatterns
+
+urlpatterns = [
+    path("api/v1/vps", VPSAsyncListView.as_view(), name="vps-list"),
+    path("api/v1/vps/changes", VPSAsyncChangesView.as_view(), name="vps-changes"),
+    path("api/v1/vps/<uuid:uid>", VPSAsyncDetailView.as_view(), name="vps-detail"),
+    *sync_urlpatterns,
+]
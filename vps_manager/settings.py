@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -46,6 +47,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "api.middleware.metrics_middleware",
+    "api.middleware.slow_request_middleware",
+    "api.middleware.compression_middleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -53,6 +57,8 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "api.middleware.primary_pinning_middleware",
+    "api.middleware.async_urlconf_middleware",
 ]
 
 ROOT_URLCONF = "vps_manager.urls"
@@ -79,11 +85,63 @@ WSGI_APPLICATION = "vps_manager.wsgi.application"
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
-DATABASES = {
-    "default": {
+# Database profile is selected by the VPS_DATABASE_PROFILE environment variable.
+# "production" switches SQLite to WAL mode, makes writers wait for locks
+# instead of failing and keeps connections open between requests.
+# Persistent connections are meant for WSGI workers; under ASGI
+# set CONN_MAX_AGE to 0, as recommended by the Django documentation.
+
+DATABASE_PROFILES = {
+    "development": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+    },
+    "production": {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": BASE_DIR / "db.sqlite3",
+        "CONN_MAX_AGE": 600,  # Seconds to keep a connection between requests
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {
+            "timeout": 5,  # Seconds to wait for a lock held by another writer
+            # Take the write lock at BEGIN, so that a transaction which read
+            # first cannot fail to upgrade its lock without waiting
+            "transaction_mode": "IMMEDIATE",
+            # Executed on every new connection
+            "init_command": (
+                "PRAGMA journal_mode=WAL;"
+                "PRAGMA busy_timeout=5000;"
+                "PRAGMA synchronous=NORMAL;"
+                "PRAGMA cache_size=-65536;"  # 64 MiB page cache
+                "PRAGMA temp_store=MEMORY;"
+            ),
+        },
+    },
+}
+
+DATABASES = {
+    "default": DATABASE_PROFILES[os.environ.get("VPS_DATABASE_PROFILE", "development")],
+}
+
+# Read replicas. Reads are routed to a random replica, writes to "default"
+# (see api.routers.PrimaryReplicaRouter). For a local setup with two SQLite
+# files set VPS_DATABASE_REPLICA to the path of a copy of the primary file.
+# Responses cached right after a write may come from a lagging replica;
+# VPS_CACHE_SETTINGS["TIMEOUT"] bounds how long they are served. Clients
+# pinned to the primary after a write use separate cache entries.
+
+if os.environ.get("VPS_DATABASE_REPLICA"):
+    DATABASES["replica"] = {
+        **DATABASES["default"],
+        "NAME": os.environ["VPS_DATABASE_REPLICA"],
+        "TEST": {"MIRROR": "default"},
     }
+
+DATABASE_ROUTERS = ["api.routers.PrimaryReplicaRouter"]
+
+VPS_DB_ROUTING_SETTINGS = {
+    "REPLICAS": [alias for alias in DATABASES if alias != "default"],
+    "STICKY_SECONDS": 5,  # Reads stay on the primary after a client's write
+    "COOKIE_NAME": "vps_primary",  # Cookie that marks a client's recent write
 }
 
 
@@ -110,6 +168,10 @@ AUTH_PASSWORD_VALIDATORS = [
 # https://docs.djangoproject.com/en/5.1/topics/i18n/
 
 LANGUAGE_CODE = "ru"
+LANGUAGES = [
+    ("ru", "Russian"),
+    ("en", "English"),
+]
 LOCALE_PATHS = [BASE_DIR / "locale"]
 TIME_ZONE = "Europe/Moscow"
 
@@ -143,3 +205,124 @@ VPS_SETTINGS = {
         "MAX": 80,
     },  # Number CPU cores
 }
+
+# Batch VPS creation settings
+VPS_BATCH_SETTINGS = {
+    "MAX_SIZE": 10000,  # Max number of servers in one batch request
+    "INSERT_SIZE": 500,  # Number of rows per bulk INSERT statement
+}
+
+# VPS export settings
+VPS_EXPORT_SETTINGS = {
+    "CHUNK_SIZE": 2000,  # Number of rows read from the database per query
+}
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+# With several worker processes use a shared backend (Redis, Memcached),
+# otherwise the VPS response cache is not invalidated across workers.
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "OPTIONS": {
+            "MAX_ENTRIES": 1000,
+        },
+    }
+}
+
+# VPS response cache settings
+VPS_CACHE_SETTINGS = {
+    "ALIAS": "default",  # CACHES alias used for VPS API responses
+    "TIMEOUT": 300,  # Response lifetime in seconds
+}
+
+# VPS async views settings
+VPS_ASYNC_SETTINGS = {
+    # URLconf used for requests served by the ASGI handler; None disables
+    # the async VPS views and serves ASGI requests through VPSViewSet
+    "URLCONF": "vps_manager.async_urls",
+}
+
+# Retries of writes that failed because the database is locked by another
+# writer. Backoff doubles after every attempt, with random jitter.
+VPS_DB_RETRY_SETTINGS = {
+    "ATTEMPTS": 5,  # Total number of attempts
+    "BACKOFF": 0.05,  # Delay before the first retry, seconds
+    "MAX_BACKOFF": 1.0,  # Upper bound of a single delay, seconds
+}
+
+# OpenAPI schema settings. The schema is generated once per process for every
+# language in LANGUAGES; with DIRECTORY set, the files written there by the
+# generate_openapi_schema command at build time are served instead.
+VPS_SCHEMA_SETTINGS = {
+    "DIRECTORY": None,  # Directory with pregenerated schema files
+}
+
+# Request metrics exposed on /metrics in the Prometheus text format.
+# With several worker processes set DIRECTORY to a directory shared by the
+# workers (cleared on deploy): every worker writes a snapshot of its metrics
+# there at most every DUMP_INTERVAL seconds and /metrics sums all snapshots.
+VPS_METRICS_SETTINGS = {
+    "ENABLED": True,
+    "DIRECTORY": None,  # Directory with per-process snapshots
+    "DUMP_INTERVAL": 5,  # Seconds between snapshots of one process
+}
+
+# Opt-in diagnostic mode: requests slower than THRESHOLD are saved with the
+# SQL they ran and the query plan of the slowest statement (admin
+# "Slow requests"); the oldest samples beyond MAX_SAMPLES are deleted.
+VPS_SLOW_REQUEST_SETTINGS = {
+    "ENABLED": False,
+    "THRESHOLD": 0.5,  # Seconds
+    "MAX_SAMPLES": 200,  # Size of the ring buffer of samples
+    "MAX_QUERIES": 100,  # SQL statements kept per sample
+}
+
+# Change feed /api/v1/vps/changes: long-poll and Server-Sent Events.
+# Writes committed by the same process wake waiting clients at once; writes
+# of other worker processes are picked up by polling every POLL_INTERVAL.
+VPS_CHANGES_SETTINGS = {
+    "LIMIT": 1000,  # Max number of changes per response
+    "MAX_WAIT": 30,  # Max long-poll wait, seconds
+    "POLL_INTERVAL": 0.5,  # Seconds between reads of the change log
+    "HEARTBEAT": 15,  # Seconds between keep-alive comments of an event stream
+    "STREAM_TIMEOUT": 300,  # Seconds before an event stream is closed
+}
+
+# Response compression negotiated from Accept-Encoding (compression_middleware).
+# ENCODINGS is the server preference for equal client weights; "br" needs
+# the optional brotli package and is skipped without it.
+VPS_COMPRESSION_SETTINGS = {
+    "ENCODINGS": ["br", "gzip"],
+    "MIN_SIZE": 1024,  # Responses smaller than this many bytes are not compressed
+    "GZIP_LEVEL": 6,
+    "BROTLI_QUALITY": 4,
+    # Only API responses are compressed. HTML pages (admin, API docs) carry
+    # CSRF tokens and are left uncompressed to avoid BREACH-style attacks.
+    "MEDIA_TYPES": [
+        "application/json",
+        "application/msgpack",
+        "application/x-ndjson",
+        "text/csv",
+    ],
+}
+
+# VPS admin changelist. Without filters, or filtered by status only, the number
+# of servers is read from the VPSStats summary; other filters and searches
+# count at most COUNT_LIMIT rows and page through that many.
+VPS_ADMIN_SETTINGS = {
+    "COUNT_LIMIT": 10000,
+}
+
+# Primary keys of new servers: 4 - random uuid4, 7 - time-ordered UUIDv7
+# (RFC 9562) that keeps bulk inserts at the right edge of the primary-key index
+# and lists new servers in creation order. Both versions can share the table.
+VPS_UID_SETTINGS = {
+    "VERSION": 4,
+}
+
+# VPS import (manage.py import_vps)
+VPS_IMPORT_SETTINGS = {
+    "BATCH_SIZE": 5000,  # Records validated and saved per transaction
+}
@@ -14,3 +14,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "vps_manager.settings")
 
 application = get_wsgi_application()
+
+# The OpenAPI schema is generated at startup, not by the first docs request;
+# the app registry has to be ready before the API modules are imported
+from api.v1.docs import schema_documents  # noqa: E402
+
+schema_documents.get_documents()